@@ -0,0 +1,84 @@
+'''
+Created on 2026-10-19
+
+compare the record and the columnar row payload of a DataFrame
+by encode time and bytes
+
+usage: python benchmarks/columnar_payload.py [--rows 100000] [--cols 20]
+'''
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import justpy as jp  # noqa: E402
+
+
+def create_frame(rows: int, cols: int) -> pd.DataFrame:
+    """
+    create a frame with float, int, string and datetime columns including NaN and inf values
+    """
+    rng = np.random.default_rng(42)
+    data = {}
+    for i in range(cols):
+        kind = i % 4
+        if kind == 0:
+            values = rng.normal(size=rows)
+            values[::97] = np.nan
+            values[::991] = np.inf
+        elif kind == 1:
+            values = rng.integers(0, 1_000_000, size=rows)
+        elif kind == 2:
+            values = [f"value {v}" for v in rng.integers(0, 1000, size=rows)]
+        else:
+            values = pd.date_range("2020-01-01", periods=rows, freq="min")
+        data[f"column_{i:02d}"] = values
+    return pd.DataFrame(data)
+
+
+def measure(name: str, encode, repeat: int):
+    """
+    measure the encode time of the given function and the bytes of its JSON payload
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        payload = encode()
+    encode_time = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    text = json.dumps(payload, separators=(",", ":"))
+    dump_time = time.perf_counter() - start
+    print(f"{name:10} encode {encode_time * 1000:8.1f} ms  json {dump_time * 1000:8.1f} ms  {len(text):>12,} bytes")
+    return len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    df = create_frame(args.rows, args.cols)
+    print(f"frame: {args.rows:,} rows x {args.cols} columns")
+
+    def records():
+        grid = jp.AgGrid()
+        grid.load_pandas_frame(df)
+        return grid.convert_object_to_dict()["def"]["rowData"]
+
+    def columnar():
+        grid = jp.AgGrid()
+        grid.load_pandas_frame(df, columnar=True)
+        return grid.convert_object_to_dict()["row_columns"]
+
+    record_bytes = measure("records", records, args.repeat)
+    columnar_bytes = measure("columnar", columnar, args.repeat)
+    print(f"columnar payload is {columnar_bytes / record_bytes:.1%} of the record payload")
+
+
+if __name__ == "__main__":
+    main()
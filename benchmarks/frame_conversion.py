@@ -0,0 +1,91 @@
+'''
+Created on 2026-10-19
+
+compare the vectorized FrameConverter with the replace/where/to_dict conversion
+the pandas integrations used before on wide frames
+
+usage: python benchmarks/frame_conversion.py [--rows 10000] [--cols 200]
+'''
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from justpy.frameconverter import FrameConverter  # noqa: E402
+
+
+def create_frame(rows: int, cols: int) -> pd.DataFrame:
+    """
+    create a wide frame with float, int, string, datetime and categorical columns
+    """
+    rng = np.random.default_rng(42)
+    data = {}
+    for i in range(cols):
+        kind = i % 5
+        if kind == 0:
+            values = rng.normal(size=rows)
+            values[::97] = np.nan
+            values[::991] = np.inf
+        elif kind == 1:
+            values = rng.integers(0, 1_000_000, size=rows)
+        elif kind == 2:
+            values = [f"value {v}" for v in rng.integers(0, 1000, size=rows)]
+        elif kind == 3:
+            values = pd.date_range("2020-01-01", periods=rows, freq="min")
+        else:
+            values = pd.Categorical(rng.choice(["red", "green", "blue"], size=rows))
+        data[f"column_{i:03d}"] = values
+    return pd.DataFrame(data)
+
+
+def legacy_records(df: pd.DataFrame) -> list:
+    """
+    the conversion the pandas integrations did before FrameConverter
+    """
+    lod = (
+        df.replace([np.inf, -np.inf], [sys.float_info.max, -sys.float_info.max])
+        .where(pd.notnull(df), None)
+        .to_dict("records")
+    )
+    for row_dict in lod:
+        for key, value in row_dict.items():
+            if isinstance(value, pd.Timestamp):
+                row_dict[key] = str(value)
+    return lod
+
+
+def measure(name: str, convert, df: pd.DataFrame, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = convert(df)
+    elapsed = (time.perf_counter() - start) / repeat
+    try:
+        json.dumps(result, allow_nan=False)
+        valid = "valid JSON"
+    except ValueError as ex:
+        valid = f"invalid JSON: {ex}"
+    print(f"{name:12} {elapsed * 1000:8.1f} ms  {valid}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--cols", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    df = create_frame(args.rows, args.cols)
+    print(f"frame: {args.rows:,} rows x {args.cols} columns")
+    legacy = measure("legacy", legacy_records, df, args.repeat)
+    records = measure("records", FrameConverter.records, df, args.repeat)
+    measure("columns", FrameConverter.columns, df, args.repeat)
+    print(f"records are converted {legacy / records:.1f} times faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+'''
+Created on 2026-10-19
+
+compare creating charts from hjson option templates with and without
+the parsed template cache
+
+usage: python benchmarks/hjson_templates.py [--charts 500]
+'''
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import justpy as jp  # noqa: E402
+from justpy.hjsoncache import HjsonCache  # noqa: E402
+
+
+def measure(name: str, create, charts: int) -> float:
+    start = time.perf_counter()
+    for _ in range(charts):
+        create()
+    elapsed = time.perf_counter() - start
+    print(f"{name:10} {elapsed * 1000:8.1f} ms for {charts} charts")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--charts", type=int, default=500)
+    args = parser.parse_args()
+    data = [("apples", 3), ("pears", 5), ("plums", 2)]
+
+    def parse_every_time():
+        HjsonCache.clear()
+        jp.PieSemiCircle(data)
+
+    legacy = measure("parse", parse_every_time, args.charts)
+    cached = measure("cached", lambda: jp.PieSemiCircle(data), args.charts)
+    print(f"charts are created {legacy / cached:.1f} times faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+'''
+Created on 2026-10-19
+
+compare creating components from html with the original parser and
+the compiled html template
+
+usage: python benchmarks/parse_html.py [--pages 200]
+'''
+import argparse
+import inspect
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import justpy as jp  # noqa: E402
+
+html_string = """
+<div class="m-4">
+  <ul>
+""" + "\n".join(
+    f'    <li class="p-2 text-lg" name="item"><a href="#{i}">item {i}</a> <span>detail {i}</span></li>' for i in range(20)
+) + """
+  </ul>
+  <button class="p-2" @click="self.text = 'clicked'">Click</button>
+</div>
+"""
+
+
+def measure(name: str, create, pages: int) -> float:
+    start = time.perf_counter()
+    for _ in range(pages):
+        create()
+    elapsed = time.perf_counter() - start
+    print(f"{name:10} {elapsed * 1000:8.1f} ms for {pages} pages")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    def parse_every_time():
+        # what parse_html did for every call before the templates were compiled
+        jp.justPY_parser(html_string, inspect.stack()[0][0], create_commands=True)
+
+    legacy = measure("parser", parse_every_time, args.pages)
+    compiled = measure("compiled", lambda: jp.parse_html(html_string), args.pages)
+    print(f"components are created {legacy / compiled:.1f} times faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+'''
+Created on 2026-10-19
+
+compare rendering a large page to html with the former string concatenation
+and the single pass renderer and measure the peak memory of streaming it
+
+usage: python benchmarks/to_html.py [--rows 2000] [--columns 50]
+'''
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import justpy as jp  # noqa: E402
+
+
+def concatenated_html(c, indent=0, indent_step=0, format=True) -> str:
+    # what Div.to_html did before the renderer - convert_object_to_dict converts the whole subtree
+    block_indent = " " * indent
+    ws = "\n" if format else ""
+    s = f"{block_indent}<{c.html_tag} "
+    d = c.convert_object_to_dict()
+    for attr, value in d["attrs"].items():
+        if value:
+            s = f'{s}{attr}="{value}" '
+    if c.classes:
+        s = f'{s}class="{c.classes}">{ws}'
+    else:
+        s = f"{s}>{ws}"
+    s = f"{s}{getattr(c, 'text', '')}{ws}"
+    for child in c.components:
+        s = f"{s}{concatenated_html(child, indent + indent_step, indent_step, format)}"
+    s = f"{s}{block_indent}</{c.html_tag}>{ws}"
+    return s
+
+
+def measure(name: str, render) -> float:
+    start = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - start
+    print(f"{name:14} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--columns", type=int, default=50)
+    args = parser.parse_args()
+    root = jp.Div(classes="report")
+    for i in range(args.rows):
+        row = jp.Div(classes="flex", a=root)
+        for j in range(args.columns):
+            jp.Span(text=f"cell {i} {j}", a=row)
+    print(f"{args.rows * (args.columns + 1) + 1} components")
+    concatenated = measure("concatenated", lambda: concatenated_html(root, format=False))
+    rendered = measure("renderer", lambda: root.to_html(format=False))
+    print(f"to_html is {concatenated / rendered:.1f} times faster")
+    tracemalloc.start()
+    size = sum(len(chunk) for chunk in root.iter_html(format=False))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"streamed {size / 1e6:.1f} MB of html with a peak of {peak / 1e3:.0f} kB")
+
+
+if __name__ == "__main__":
+    main()
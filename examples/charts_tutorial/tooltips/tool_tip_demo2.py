@@ -98,7 +98,7 @@ async def shared_tooltip_formatter(self, msg):
     jp.Span(text=f'Year: {msg.x}', classes='text-lg', a=tooltip_div)
     for point in msg.points:
         point_div = jp.Div(a=tooltip_div)
-        jp.Span(text=f'&#x25CF; {point.series_name}', classes='bg-white', style=f'color: {point.color}', a=point_div)
+        jp.Span(text=f'&#x25CF; {point.series_name}', html_entity=True, classes='bg-white', style=f'color: {point.color}', a=point_div)
         jp.Span(text=f'Number of employees: {"{:,}".format(point.y)}', a=point_div)
     return await self.tooltip_update(tooltip_div.to_html(), msg.websocket)
 
@@ -107,7 +107,7 @@ async def split_tooltip_formatter(self, msg):
     tooltip_array = [f'The x value is {msg.x}']
     for point in msg.points:
         point_div = jp.Div()
-        jp.Span(text='&#x25CF;', classes='bg-white', style=f'color: {point.color}', a=point_div)
+        jp.Span(text='&#x25CF;', html_entity=True, classes='bg-white', style=f'color: {point.color}', a=point_div)
         jp.Span(text=f'{point.series_name}', a=point_div)
         jp.Span(text=f'Year: {point.x}', a=point_div)
         jp.Span(text=f'Number of employees: {"{:,}".format(point.y)}', a=point_div)
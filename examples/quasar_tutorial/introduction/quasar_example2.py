@@ -91,7 +91,7 @@ html_string = """
 
 def quasar_example2():
     wp = jp.QuasarPage()
-    c = jp.parse_html(html_string, a=wp)
+    c = jp.parse_html(html_string, a=wp, create_commands=True)
     for i in c.commands:
         print(i)
     return wp
@@ -39,7 +39,6 @@ def message_demo():
     send_button = jp.Button(a=d, click=send_message, classes=button_classes)
     send_button.add(button_icon, button_text)
     outer_div.add(shared_div)
-    shared_div.add_page(wp)
     send_button.message = message
     return wp
 
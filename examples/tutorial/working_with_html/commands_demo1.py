@@ -9,7 +9,7 @@ def commands_demo1():
         <p class="m-2 p-2 text-blue-500 text-xl">Paragraph 2</p>
         <p class="m-2 p-2 text-green-500 text-xl">Paragraph 3</p>
         </div>
-        """, a=wp)
+        """, a=wp, create_commands=True)
     for i in c.commands:
         print(i)
         jp.Div(text=i, classes='font-mono ml-2', a=wp)
@@ -20,7 +20,7 @@ def commands_demo1():
             <p class="m-2 p-2 text-blue-500 text-xl">Paragraph 2</p>
             <p class="m-2 p-2 text-green-500 text-xl">Paragraph 3</p>
             </div>
-            """, a=wp, command_prefix='justpy.')
+            """, a=wp, create_commands=True, command_prefix='justpy.')
     for i in c.commands:
         print(i)
         jp.Div(text=i, classes='font-mono ml-2', a=wp)
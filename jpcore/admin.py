@@ -0,0 +1,169 @@
+'''
+Created on 2026-10-19
+
+protected admin routes for live justpy server processes
+'''
+import hmac
+import logging
+import typing
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+import jpcore.jpconfig as jpconfig
+from jpcore.memory import MemoryAccounting
+from jpcore.metrics import Metrics
+from jpcore.payload import PayloadAnalyzer
+from jpcore.profiler import SamplingProfiler
+
+
+class JustpyAdmin:
+    """
+    admin endpoints - only available if ADMIN is set and protected by ADMIN_TOKEN
+    """
+
+    route_prefix = "/zzz_justpy_admin"
+    max_profile_seconds = 60
+
+    def __init__(self, token: str):
+        """
+        constructor
+
+        Args:
+            token(str): the token requests need to present
+        """
+        self.token = token
+
+    def is_authorized(self, request: Request) -> bool:
+        """
+        check the token of the given request - either given as X-Justpy-Admin-Token header
+        or as Bearer token in the Authorization header
+        """
+        token = request.headers.get("x-justpy-admin-token")
+        if token is None:
+            authorization = request.headers.get("authorization", "")
+            if authorization.startswith("Bearer "):
+                token = authorization[len("Bearer "):]
+        if not token:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def protect(self, endpoint: typing.Callable) -> typing.Callable:
+        """
+        wrap the given endpoint with the token check
+        """
+
+        async def protected_endpoint(request: Request) -> Response:
+            if not self.is_authorized(request):
+                return PlainTextResponse("Forbidden", 403)
+            return await endpoint(request)
+
+        protected_endpoint.__name__ = endpoint.__name__
+        return protected_endpoint
+
+    def add_routes(self, app):
+        """
+        add the admin routes to the given app
+        """
+        for path, endpoint in [
+            ("/profile", self.profile),
+            ("/memory", self.memory),
+            ("/metrics", self.metrics),
+            ("/payload", self.payload),
+        ]:
+            app.router.add_route(
+                f"{self.route_prefix}{path}",
+                self.protect(endpoint),
+                methods=["GET"],
+                name=f"admin_{endpoint.__name__}",
+                include_in_schema=False,
+            )
+
+    @classmethod
+    def setup(cls, app) -> typing.Optional["JustpyAdmin"]:
+        """
+        add the admin routes to the given app if configured
+        """
+        if not jpconfig.ADMIN:
+            return None
+        if not jpconfig.ADMIN_TOKEN:
+            logging.warning("ADMIN is set but ADMIN_TOKEN is empty - admin routes disabled")
+            return None
+        admin = JustpyAdmin(jpconfig.ADMIN_TOKEN)
+        admin.add_routes(app)
+        return admin
+
+    async def profile(self, request: Request) -> Response:
+        """
+        profile the server process for the given number of seconds
+
+        query parameters:
+            seconds: the duration of the profile - default 10
+            format: collapsed (default), json or pstats
+            interval: the sampling interval in ms - default 5
+        """
+        try:
+            seconds = float(request.query_params.get("seconds", 10))
+            interval_ms = float(request.query_params.get("interval", 5))
+        except ValueError:
+            return PlainTextResponse("seconds and interval need to be numbers", 400)
+        seconds = min(max(seconds, 0.0), self.max_profile_seconds)
+        profile_format = request.query_params.get("format", "collapsed")
+        if profile_format == "pstats":
+            data = await SamplingProfiler.profile_pstats(seconds)
+            if data is None:
+                return PlainTextResponse("a profile is already running", 409)
+            return Response(
+                data,
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": 'attachment; filename="justpy.pstats"'},
+            )
+        if profile_format not in ["collapsed", "json"]:
+            return PlainTextResponse(f"invalid format {profile_format}", 400)
+        profiler = await SamplingProfiler.profile(seconds, interval_ms=max(interval_ms, 1))
+        if profiler is None:
+            return PlainTextResponse("a profile is already running", 409)
+        if profile_format == "json":
+            return JSONResponse(profiler.as_summary())
+        return PlainTextResponse(profiler.as_collapsed())
+
+    async def memory(self, request: Request) -> Response:
+        """
+        report the memory held per page, session and component class
+
+        query parameters:
+            top: the number of component classes to report - default 20
+            pages: 0 to leave out the report of each page
+        """
+        try:
+            top = int(request.query_params.get("top", 20))
+        except ValueError:
+            return PlainTextResponse("top needs to be an integer", 400)
+        pages = request.query_params.get("pages", "1") not in ["0", "false"]
+        return JSONResponse(MemoryAccounting.report(top=top, pages=pages))
+
+    async def metrics(self, request: Request) -> Response:
+        """
+        get a snapshot of all metrics
+        """
+        return JSONResponse(Metrics.snapshot())
+
+    async def payload(self, request: Request) -> Response:
+        """
+        get the payload size reports of the last build of each page
+
+        query parameters:
+            page_id: only report the given page
+        """
+        if not PayloadAnalyzer.enabled:
+            return PlainTextResponse("payload analytics is not enabled - set PAYLOAD_ANALYTICS", 404)
+        page_id = request.query_params.get("page_id")
+        if page_id is None:
+            return JSONResponse(list(PayloadAnalyzer.reports.values()))
+        try:
+            report = PayloadAnalyzer.reports.get(int(page_id))
+        except ValueError:
+            return PlainTextResponse("page_id needs to be an integer", 400)
+        if report is None:
+            return PlainTextResponse(f"no report for page {page_id}", 404)
+        return JSONResponse(report)
@@ -0,0 +1,234 @@
+'''
+Created on 2026-10-19
+
+single pass html rendering of components and their built dicts e.g. for server side rendering and export
+'''
+import contextvars
+import html
+import typing
+
+# True while converting a single component for rendering - containers then leave out their children
+# which the renderer visits itself so that each component is converted once
+shallow_build = contextvars.ContextVar("shallow_build", default=False)
+
+
+class HtmlRenderer:
+    """
+    renders html components or their dicts as built by build_list to html
+
+    the output matches what the html_component of the frontend renders so that the
+    Vue app can hydrate over it - components of other vue types like Quasar components
+    or charts are rendered as empty placeholders the frontend replaces when it mounts
+    unless placeholders is False e.g. for an export with to_html
+
+    the html is generated as chunks in document order with an explicit stack so that
+    the time is linear and the memory only grows with the depth of the tree
+    """
+
+    chunk_size = 65536
+
+    void_elements = frozenset(
+        [
+            "area",
+            "base",
+            "br",
+            "col",
+            "embed",
+            "hr",
+            "img",
+            "input",
+            "link",
+            "meta",
+            "param",
+            "source",
+            "track",
+            "wbr",
+        ]
+    )
+
+    def __init__(self, indent_step: int = 0, format: bool = False, placeholders: bool = True):
+        """
+        constructor
+
+        Args:
+            indent_step(int): the number of blanks each level of children is indented by
+            format(bool): if True each tag and text is put on its own line
+            placeholders(bool): if True components that are not html components are rendered as
+                empty placeholders - otherwise as their own tag with attributes and children if they have one
+        """
+        self.indent_step = indent_step
+        self.format = format
+        self.placeholders = placeholders
+
+    @staticmethod
+    def attribute(name: str, value) -> str:
+        """
+        get the html for the given attribute - attributes that are unset, False or empty are omitted
+
+        Args:
+            name(str): the name of the attribute
+            value: the value of the attribute
+
+        Returns:
+            str: the attribute with a leading blank or an empty string
+        """
+        if value is None or value is False or value == "":
+            return ""
+        if value is True:
+            return f" {name}"
+        return f' {name}="{html.escape(str(value))}"'
+
+    def start_tag(self, d: dict) -> str:
+        """
+        get the start tag for the given component dict including its attributes, classes and style
+        """
+        parts = [f"<{d['html_tag']}"]
+        attrs = d.get("attrs") or {}
+        for name, value in attrs.items():
+            parts.append(self.attribute(name, value))
+        parts.append(self.attribute("class", d.get("classes")))
+        parts.append(self.attribute("style", d.get("style")))
+        parts.append(">")
+        return "".join(parts)
+
+    def placeholder(self, d: dict) -> str:
+        vue_type = html.escape(str(d.get("vue_type")))
+        return f'<div data-vue-type="{vue_type}"></div>'
+
+    def iter_nodes(
+        self,
+        nodes: typing.Iterable,
+        convert: typing.Callable[[typing.Any], dict],
+        children: typing.Callable[[typing.Any, dict], typing.Iterable],
+        indent: int = 0,
+    ) -> typing.Iterator[str]:
+        """
+        render the given nodes and their children
+
+        Args:
+            nodes: the nodes to render
+            convert: function returning the component dict of a node
+            children: function returning the child nodes of a node and its dict
+            indent(int): the number of blanks the nodes are indented by
+
+        Returns:
+            Iterator[str]: the chunks of the html in document order
+        """
+        ws = "\n" if self.format else ""
+        # iterators over the children still to render with the end tag of their parent
+        stack = [(iter(nodes), "", indent)]
+        while stack:
+            node_iter, end_tag, level_indent = stack[-1]
+            node = next(node_iter, None)
+            if node is None:
+                stack.pop()
+                if end_tag:
+                    yield end_tag
+                continue
+            d = convert(node)
+            if not d.get("show", True):
+                continue
+            block_indent = " " * level_indent
+            if d.get("vue_type") != "html_component" and (self.placeholders or not d.get("html_tag")):
+                # components without a tag of their own e.g. grids are always placeholders
+                yield f"{block_indent}{self.placeholder(d)}{ws}"
+                continue
+            tag = d["html_tag"]
+            start_tag = self.start_tag(d)
+            if tag in self.void_elements:
+                yield f"{block_indent}{start_tag}{ws}"
+                continue
+            if d.get("inner_html"):
+                # inner_html is trusted html that replaces text and children as in the frontend
+                yield f"{block_indent}{start_tag}{d['inner_html']}</{tag}>{ws}"
+                continue
+            if tag == "textarea":
+                text = (d.get("attrs") or {}).get("value")
+            else:
+                text = d.get("text")
+            if text:
+                yield f"{block_indent}{start_tag}{ws}{html.escape(str(text), quote=False)}{ws}"
+            else:
+                yield f"{block_indent}{start_tag}{ws}"
+            stack.append((iter(children(node, d)), f"{block_indent}</{tag}>{ws}", level_indent + self.indent_step))
+
+    def iter_html(self, dicts: typing.Iterable[dict], indent: int = 0) -> typing.Iterator[str]:
+        """
+        render the given component dicts and their children
+
+        Args:
+            dicts: the component dicts as returned by build_list
+            indent(int): the number of blanks the components are indented by
+
+        Returns:
+            Iterator[str]: the chunks of the html in document order
+        """
+        return self.iter_nodes(dicts, lambda d: d, lambda _node, d: d.get("object_props") or (), indent)
+
+    @staticmethod
+    def convert_component(component) -> dict:
+        token = shallow_build.set(True)
+        try:
+            return component.convert_object_to_dict()
+        finally:
+            shallow_build.reset(token)
+
+    @staticmethod
+    def component_children(component, d: dict) -> typing.Iterator:
+        # react as in build_list before the children are converted
+        for child in getattr(component, "components", ()):
+            child.react(component.data)
+            yield child
+
+    def iter_components(self, components: typing.Iterable, indent: int = 0) -> typing.Iterator[str]:
+        """
+        render the given components and their children converting each component once
+
+        Args:
+            components: the components to render
+            indent(int): the number of blanks the components are indented by
+
+        Returns:
+            Iterator[str]: the chunks of the html in document order
+        """
+        return self.iter_nodes(components, self.convert_component, self.component_children, indent)
+
+    def iter_root(self, chunks: typing.Iterable[str], indent: int = 0) -> typing.Iterator[str]:
+        """
+        wrap the given chunks in the root div of the frontend app
+        """
+        ws = "\n" if self.format else ""
+        block_indent = " " * indent
+        yield f"{block_indent}<div>{ws}"
+        yield from chunks
+        yield f"{block_indent}</div>{ws}"
+
+    @classmethod
+    def buffered(cls, chunks: typing.Iterable[str], chunk_size: int = None) -> typing.Iterator[str]:
+        """
+        join the given chunks to chunks of at least chunk_size characters e.g. to be sent by a StreamingResponse
+        """
+        chunk_size = chunk_size or cls.chunk_size
+        buffer = []
+        size = 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer)
+
+    def render_page(self, page_dict: typing.List[dict]) -> str:
+        """
+        render the given page dict wrapped in the root div of the frontend app
+
+        Args:
+            page_dict(list): the component dicts of the page as returned by WebPage.build_list
+
+        Returns:
+            str: the html to place in the components container of the page template
+        """
+        return "".join(self.iter_root(self.iter_html(page_dict)))
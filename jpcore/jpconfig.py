@@ -5,6 +5,8 @@ Created on 16.11.2022
 '''
 # Justpy global configuration variables (deprecated as of 0.11)
 # importing justpy_config does not set the variables if Compatbility.version is set
+ADMIN=None
+ADMIN_TOKEN=None
 AGGRID=None
 AGGRID_ENTERPRISE=None
 BOKEH=None
@@ -23,6 +25,8 @@ LATENCY=None
 LOGGING_LEVEL=None
 MEMORY_DEBUG=None
 NO_INTERNET=None
+PAYLOAD_ANALYTICS=None
+SSR=None
 PLOTLY=None
 PORT=None
 SECRET_KEY=None
@@ -37,8 +41,13 @@ STATIC_ROUTE=None
 QUASAR=None
 QUASAR_VERSION=None
 TAILWIND=None
+TRACE_FILE=None
+TRACING=None
 UVICORN_LOGGING_LEVEL=None
 VEGA=None
 VERBOSE=None
+WATCHDOG=None
+WATCHDOG_INTERVAL=None
+WATCHDOG_THRESHOLD=None
 EXT_LIST=None
 
@@ -30,9 +30,13 @@ from starlette.responses import HTMLResponse, JSONResponse,PlainTextResponse, Re
 from starlette.templating import Jinja2Templates
 
 from jpcore.component import Component
+from jpcore.htmlrenderer import HtmlRenderer
+from jpcore.pagecache import PageCache
 import jpcore.jpconfig as jpconfig
 from jpcore.justpy_config import  JpConfig
 from jpcore.template import Context
+from jpcore.tracing import Tracing
+from jpcore.watchdog import Watchdog
 from jpcore.webpage import WebPage
 from itsdangerous import Signer
 
@@ -125,6 +129,23 @@ async def handle_event(
         "%s %s %s", "In event handler:", com_type.WEBSOCKET.name, str(data_dict)
     )
     event_data = data_dict["event_data"]
+    with Tracing.span(
+        "event",
+        event_type=event_data.get("event_type"),
+        page_id=event_data.get("page_id"),
+        com_type=com_type.name,
+    ):
+        return await _handle_event(event_data, com_type, page_event)
+
+
+async def _handle_event(
+        event_data: dict,
+        com_type: CommunicationType,
+        page_event: bool
+) -> typing.Optional[dict]:
+    """
+    handle the given event data - see handle_event
+    """
     page_id = event_data["page_id"]
     try:
         p = WebPage.instances[page_id]
@@ -139,6 +160,9 @@ async def handle_event(
     if event_data["event_type"] == "page_update":
         build_list = p.build_list()
         return {"type": "page_update", "data": build_list}
+    if p.event_policy is not None and not p.event_policy.allows(event_data):
+        logging.debug(f"{event_data['event_type']} event of page {page_id} not allowed by its event policy")
+        return
 
     if page_event:
         c = p
@@ -152,17 +176,24 @@ async def handle_event(
                 f"component with id {component_id} doesn't exist (anymore ...) it might have been deleted before the event handling was triggered"
             )
 
+    component_class = c.__class__.__name__ if c is not None else None
     try:
         if c is not None:
-            before_result = await c.run_event_function("before", event_data, True)
+            with Tracing.span("event.before", component_class=component_class):
+                before_result = await c.run_event_function("before", event_data, True)
     except:
         pass
     try:
         if c is not None:
             if hasattr(c, "on_" + event_data["event_type"]):
-                event_result = await c.run_event_function(
-                    event_data["event_type"], event_data, True
-                )
+                with Tracing.span(
+                    "event.handler",
+                    component_class=component_class,
+                    event_type=event_data["event_type"],
+                ):
+                    event_result = await c.run_event_function(
+                        event_data["event_type"], event_data, True
+                    )
             else:
                 event_result = None
                 logging.debug(f"{c} has no {event_data['event_type']} event handler")
@@ -182,18 +213,23 @@ async def handle_event(
             "\u001b[47;1m\033[93mError in event handler:\033[0m",
         )
         logging.info("%s", traceback.format_exc())
+    # the handlers may have changed the page
+    p.changed()
 
     # If page is not to be updated, the event_function should return anything but None
     if event_result is None:
         if com_type is CommunicationType.WEBSOCKET:  # WebSockets communication
             if jpconfig.LATENCY:
                 await asyncio.sleep(jpconfig.LATENCY / 1000)
-            await p.update()
+            with Tracing.span("page.update", page_id=p.page_id):
+                await p.update()
         elif com_type is CommunicationType.AJAX:  # Ajax communication
-            build_list = p.build_list()
+            with Tracing.span("page.build", page_id=p.page_id):
+                build_list = p.build_list()
     try:
         if c is not None:
-            after_result = await c.run_event_function("after", event_data, True)
+            with Tracing.span("event.after", component_class=component_class):
+                after_result = await c.run_event_function("after", event_data, True)
     except:
         pass
     if com_type is CommunicationType.AJAX and event_result is None:
@@ -230,6 +266,8 @@ class JustpyApp(FastAPI):
     def __init__(self,**kwargs):
         # https://www.starlette.io/applications/
         FastAPI.__init__(self,**kwargs)
+        # route name -> PageCache of the routes added with a cache
+        self.page_caches: typing.Dict[str, PageCache] = {}
         # @Todo - legacy for SetRoute 
         JustpyApp.app=self
     
@@ -247,7 +285,8 @@ class JustpyApp(FastAPI):
             path: str,
             wpfunc: Jp_Route_Callback,
             name: typing.Optional[str] = None,
-            methods: typing.Optional[typing.List[str]] = None
+            methods: typing.Optional[typing.List[str]] = None,
+            cache: typing.Union[bool, PageCache, None] = None
     ) -> typing.Callable:
         """
         add a route for the given Webpage returning func
@@ -257,10 +296,16 @@ class JustpyApp(FastAPI):
             wpfunc(typing.Callable): a Webpage returning func
             name(str): the name of the route
             methods:
+            cache(bool|PageCache): if set the pages of the route are cached - True uses a PageCache with the defaults,
+                a SharedPage serves one page to all sessions
         """
-        endpoint=self.response(wpfunc)
         if name is None:
             name=wpfunc.__name__
+        if cache is True:
+            cache=PageCache()
+        if cache:
+            self.page_caches[name]=cache
+        endpoint=self.response(wpfunc, cache=cache or None, route=path)
         self.router.add_route(path, endpoint, methods=methods, name=name, include_in_schema=False)
         return endpoint
     
@@ -268,7 +313,8 @@ class JustpyApp(FastAPI):
             self,
             path: str,
             name: typing.Optional[str] = None,
-            methods: typing.Optional[typing.List[str]] = None
+            methods: typing.Optional[typing.List[str]] = None,
+            cache: typing.Union[bool, PageCache, None] = None
     ) -> typing.Callable:  # pragma: nocover
         """ 
         justpy route decorator
@@ -279,6 +325,7 @@ class JustpyApp(FastAPI):
             path: the path to use as route
             name: the name of the route
             methods:
+            cache: if set the pages of the route are cached - see add_jproute
         """
         
         def routeResponse(func: typing.Callable) -> typing.Callable:
@@ -292,13 +339,18 @@ class JustpyApp(FastAPI):
                 Callable: an endpoint that has been routed
             
             """
-            endpoint = self.add_jproute(path=path, name=name, wpfunc=func, methods=methods)
+            endpoint = self.add_jproute(path=path, name=name, wpfunc=func, methods=methods, cache=cache)
             self.route(path)
             return endpoint
         
         return routeResponse
     
-    def response(self, func: Jp_Route_Callback) -> typing.Callable:
+    def response(
+            self,
+            func: Jp_Route_Callback,
+            cache: typing.Optional[PageCache] = None,
+            route: typing.Optional[str] = None
+    ) -> typing.Callable:
         """
         response decorator converts a function to a response
         
@@ -307,10 +359,15 @@ class JustpyApp(FastAPI):
         
         Args:
             func(typing.Callable): the function (returning a WebPage) to convert to a response
+            cache(PageCache): the cache of the pages of the route if any
+            route(str): the path template of the route - used instead of the concrete paths to label
+                metrics so that the number of series is bounded - the name of func if None
 
         Returns:
 
         """
+        route = route or func.__name__
+
         async def funcResponse(request: Request) -> Response:
             """
             decorator function to apply the function to the request and
@@ -323,14 +380,19 @@ class JustpyApp(FastAPI):
                 Response: a Response applying the justpy infrastructure
             
             """
-            new_cookie = self.handle_session_cookie(request)
-            wp_or_response = await self.get_page_for_func(request, func)
-            if isinstance(wp_or_response, WebPage):
-                wp = wp_or_response
-                response = self.get_response_for_load_page(request, wp)
-                response = self.set_cookie(request, response, wp, new_cookie)
-            else:
-                response = wp_or_response
+            request.state.route = route
+            with Tracing.span("route", path=request.url.path, func=func.__name__):
+                new_cookie = self.handle_session_cookie(request)
+                if cache is None:
+                    wp, response = await self.get_page_response(request, func)
+                else:
+                    wp, response = await cache.response(
+                        request,
+                        lambda: self.get_page_response(request, func),
+                        lambda page: self.get_response_for_load_page(request, page),
+                    )
+                if wp is not None:
+                    response = self.set_cookie(request, response, wp, new_cookie)
             if jpconfig.LATENCY:
                 await asyncio.sleep(jpconfig.LATENCY / 1000)
             return response
@@ -339,6 +401,46 @@ class JustpyApp(FastAPI):
         # parameter in the funcResponse later when applied 
         return funcResponse
 
+    async def get_page_response(
+            self,
+            request: Request,
+            func: Jp_Route_Callback
+    ) -> typing.Tuple[typing.Optional[WebPage], Response]:
+        """
+        call the given func and render the WebPage it returns
+
+        Args:
+            request: the request to pass to the given function
+            func: the function
+
+        Returns:
+            tuple: the WebPage or None if the function returned a Response and the Response
+        """
+        with Tracing.span("route.page_func", func=func.__name__):
+            wp_or_response = await self.get_page_for_func(request, func)
+        if not isinstance(wp_or_response, WebPage):
+            return None, wp_or_response
+        wp = wp_or_response
+        wp.route_path = request.url.path
+        wp.route = getattr(request.state, "route", None)
+        wp.session_id = getattr(request.state, "session_id", None)
+        return wp, self.get_response_for_load_page(request, wp)
+
+    def invalidate_page_cache(self, name: typing.Optional[str] = None, path: typing.Optional[str] = None, **kwargs) -> int:
+        """
+        drop cached pages
+
+        Args:
+            name(str): the name of the route - all cached routes if None
+            path(str): the path of the pages to drop - all pages of the route if None
+            kwargs: query_params and session_id as for PageCache.invalidate
+
+        Returns:
+            int: the number of pages dropped
+        """
+        caches = self.page_caches.values() if name is None else [self.page_caches[name]]
+        return sum(cache.invalidate(path, **kwargs) for cache in caches)
+
     async def get_page_for_func(
             self,
             request: Request,
@@ -359,16 +461,18 @@ class JustpyApp(FastAPI):
         func_to_run = func
         func_parameters = len(inspect.signature(func_to_run).parameters)
         assert (func_parameters < 2), f"Function {func_to_run.__name__} cannot have more than one parameter"
-        if inspect.iscoroutinefunction(func_to_run):
-            if func_parameters == 1:
-                load_page = await func_to_run(request)
-            else:
-                load_page = await func_to_run()
-        else:
-            if func_parameters == 1:
-                load_page = func_to_run(request)
+        route = getattr(request.state, "route", None) if request is not None else None
+        with Watchdog.watch("page", func_to_run, route=route):
+            if inspect.iscoroutinefunction(func_to_run):
+                if func_parameters == 1:
+                    load_page = await func_to_run(request)
+                else:
+                    load_page = await func_to_run()
             else:
-                load_page = func_to_run()
+                if func_parameters == 1:
+                    load_page = func_to_run(request)
+                else:
+                    load_page = func_to_run()
         return load_page
 
     def get_response_for_load_page(self, request: Request, load_page: WebPage) -> Response:
@@ -409,7 +513,12 @@ class JustpyApp(FastAPI):
         if load_page.use_cache:
             page_dict = load_page.cache
         else:
-            page_dict = load_page.build_list()
+            with Tracing.span("page.build", page_id=load_page.page_id):
+                page_dict = load_page.build_list()
+        ssr_html = ""
+        if load_page.ssr:
+            with Tracing.span("page.ssr", page_id=load_page.page_id):
+                ssr_html = HtmlRenderer().render_page(page_dict)
         template_options["tailwind"] = load_page.tailwind
         context = {
             "request": request,
@@ -419,13 +528,15 @@ class JustpyApp(FastAPI):
             "options": template_options,
             "page_options": page_options,
             "html": load_page.html,
+            "ssr_html": ssr_html,
             "frontend_engine_type": jpconfig.FRONTEND_ENGINE_TYPE,
             "frontend_engine_libs": jpconfig.FRONTEND_ENGINE_LIBS
         }
         # wrap the context in a context object to make it available
         context_obj = Context(context)
         context["context_obj"] = context_obj
-        response = templates.TemplateResponse(load_page.template_file, context)
+        with Tracing.span("page.render", page_id=load_page.page_id):
+            response = templates.TemplateResponse(load_page.template_file, context)
         return response
     
     def handle_session_cookie(self, request) -> typing.Union[bool, Response]:
@@ -92,6 +92,16 @@ class JpConfig(Config):
             jpconfig.AGGRID_ENTERPRISE= config("AGGRID_ENTERPRISE", cast=bool, default=False)
             jpconfig.NO_INTERNET= config("NO_INTERNET", cast=bool, default=True)
             jpconfig.FRONTEND_ENGINE_TYPE = config("FRONTEND_ENGINE_TYPE", cast=str, default="vue")
+            # one of jsonl, opentelemetry - empty for no tracing
+            jpconfig.TRACING = config("TRACING", cast=str, default="")
+            jpconfig.TRACE_FILE = config("TRACE_FILE", cast=str, default="justpy_trace.jsonl")
+            jpconfig.WATCHDOG = config("WATCHDOG", cast=bool, default=False)
+            jpconfig.WATCHDOG_THRESHOLD = config("WATCHDOG_THRESHOLD", cast=int, default=200)
+            jpconfig.WATCHDOG_INTERVAL = config("WATCHDOG_INTERVAL", cast=int, default=50)
+            jpconfig.ADMIN = config("ADMIN", cast=bool, default=False)
+            jpconfig.ADMIN_TOKEN = config("ADMIN_TOKEN", cast=str, default="")
+            jpconfig.PAYLOAD_ANALYTICS = config("PAYLOAD_ANALYTICS", cast=bool, default=False)
+            jpconfig.SSR = config("SSR", cast=bool, default=False)
 
 
 if Compatibility.version is None:
@@ -0,0 +1,180 @@
+'''
+Created on 2026-10-19
+
+memory accounting per page, session and component class
+'''
+import collections
+import os
+import sys
+import time
+import typing
+
+from jpcore.component import Component
+from jpcore.webpage import WebPage
+
+
+class MemoryAccounting:
+    """
+    structured report of the memory held by pages and components
+    """
+
+    @staticmethod
+    def children(component) -> list:
+        """
+        get the direct child components of the given component or page
+        """
+        children = list(getattr(component, "components", None) or [])
+        scoped_slots = getattr(component, "scoped_slots", None)
+        if scoped_slots:
+            children.extend(scoped_slots.values())
+        return children
+
+    @classmethod
+    def walk(cls, root) -> typing.Iterator:
+        """
+        iterate over all components below the given component or page
+        """
+        seen = set()
+        stack = cls.children(root)
+        while stack:
+            component = stack.pop()
+            if id(component) in seen:
+                continue
+            seen.add(id(component))
+            yield component
+            stack.extend(cls.children(component))
+
+    @staticmethod
+    def approximate_size(component) -> int:
+        """
+        get the approximate number of bytes retained by the given component itself
+        not counting its child components
+        """
+        size = sys.getsizeof(component)
+        attrs = getattr(component, "__dict__", None)
+        if attrs is None:
+            return size
+        seen = {id(component)}
+        stack = [attrs]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen or isinstance(obj, (Component, WebPage)):
+                continue
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+        return size
+
+    @classmethod
+    def page_report(cls, wp: WebPage, now: float = None) -> dict:
+        """
+        get the report for the given page
+        """
+        if now is None:
+            now = time.time()
+        component_count = 0
+        size = cls.approximate_size(wp)
+        for component in cls.walk(wp):
+            component_count += 1
+            size += cls.approximate_size(component)
+        return {
+            "page_id": wp.page_id,
+            "class": wp.__class__.__name__,
+            "route": wp.route_path,
+            "session_id": wp.session_id,
+            "components": component_count,
+            "approximate_bytes": size,
+            "age_seconds": round(now - wp.created, 1),
+            "sockets": len(WebPage.sockets.get(wp.page_id, {})),
+        }
+
+    @classmethod
+    def reachable_ids(cls) -> set:
+        """
+        get the ids of all components reachable from live pages
+        """
+        ids = set()
+        for wp in list(WebPage.instances.values()):
+            for component in cls.walk(wp):
+                ids.add(id(component))
+        return ids
+
+    @classmethod
+    def find_leaked_components(cls) -> list:
+        """
+        get the components registered in Component.instances that are
+        not reachable from any live page
+        """
+        reachable = cls.reachable_ids()
+        return [
+            component
+            for component in list(Component.instances.values())
+            if id(component) not in reachable
+        ]
+
+    @classmethod
+    def report(cls, top: int = 20, pages: bool = True) -> dict:
+        """
+        get the memory report
+
+        Args:
+            top(int): the number of component classes to report
+            pages(bool): if True include the report of each page
+        """
+        now = time.time()
+        page_reports = [cls.page_report(wp, now) for wp in list(WebPage.instances.values())]
+        sessions = collections.Counter(
+            page_report["session_id"] for page_report in page_reports if page_report["session_id"]
+        )
+        class_counts = collections.Counter()
+        reachable = set()
+        for wp in list(WebPage.instances.values()):
+            for component in cls.walk(wp):
+                if id(component) not in reachable:
+                    reachable.add(id(component))
+                    class_counts[component.__class__.__name__] += 1
+        leaked = [c for c in list(Component.instances.values()) if id(c) not in reachable]
+        for component in leaked:
+            class_counts[component.__class__.__name__] += 1
+        report = {
+            "pages": len(page_reports),
+            "components": len(reachable) + len(leaked),
+            "registered_components": len(Component.instances),
+            "sockets": sum(len(sockets) for sockets in WebPage.sockets.values()),
+            "sessions": {session_id: page_count for session_id, page_count in sessions.most_common()},
+            "top_component_classes": [
+                {"class": class_name, "instances": count}
+                for class_name, count in class_counts.most_common(top)
+            ],
+            "leaked_components": [
+                {"id": component.id, "class": component.__class__.__name__}
+                for component in leaked
+            ],
+        }
+        try:
+            import psutil
+
+            report["rss_bytes"] = psutil.Process(os.getpid()).memory_info().rss
+        except ImportError:
+            pass
+        if pages:
+            report["page_reports"] = sorted(page_reports, key=lambda r: r["approximate_bytes"], reverse=True)
+        return report
+
+    @classmethod
+    def summary(cls) -> str:
+        """
+        get a one line summary of the memory report
+        """
+        report = cls.report(top=5, pages=False)
+        top_classes = ", ".join(f"{c['class']}: {c['instances']}" for c in report["top_component_classes"])
+        return (
+            f"pages: {report['pages']}, sessions: {len(report['sessions'])}, sockets: {report['sockets']}, "
+            f"components: {report['components']} ({report['registered_components']} registered), "
+            f"leaked: {len(report['leaked_components'])}, rss: {report.get('rss_bytes', 0):,}, "
+            f"top classes: {top_classes}"
+        )
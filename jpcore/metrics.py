@@ -0,0 +1,121 @@
+'''
+Created on 2026-10-19
+
+process wide metrics registry
+'''
+import threading
+import typing
+
+
+class Observation:
+    """
+    aggregate of observed values e.g. durations
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+        self.last = None
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.last = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count if self.count else None,
+            "max": self.max,
+            "last": self.last,
+        }
+
+
+class Metrics:
+    """
+    counters, gauges and observations by name and labels
+    """
+
+    lock = threading.Lock()
+    counters: typing.Dict[str, typing.Dict[tuple, float]] = {}
+    gauges: typing.Dict[str, typing.Dict[tuple, float]] = {}
+    observations: typing.Dict[str, typing.Dict[tuple, Observation]] = {}
+
+    @staticmethod
+    def labels_key(labels: dict) -> tuple:
+        return tuple(sorted(labels.items()))
+
+    @classmethod
+    def increment(cls, name: str, value: float = 1, **labels):
+        """
+        increment the counter with the given name and labels
+
+        Args:
+            name(str): the name of the counter
+            value(float): the value to add
+            labels: the labels of the counter
+        """
+        key = cls.labels_key(labels)
+        with cls.lock:
+            counter = cls.counters.setdefault(name, {})
+            counter[key] = counter.get(key, 0) + value
+
+    @classmethod
+    def set_gauge(cls, name: str, value: float, **labels):
+        """
+        set the gauge with the given name and labels
+        """
+        key = cls.labels_key(labels)
+        with cls.lock:
+            cls.gauges.setdefault(name, {})[key] = value
+
+    @classmethod
+    def observe(cls, name: str, value: float, **labels):
+        """
+        add the given value to the observation with the given name and labels
+        """
+        key = cls.labels_key(labels)
+        with cls.lock:
+            observation = cls.observations.setdefault(name, {}).get(key)
+            if observation is None:
+                observation = Observation()
+                cls.observations[name][key] = observation
+            observation.add(value)
+
+    @classmethod
+    def get_counter(cls, name: str, **labels) -> float:
+        return cls.counters.get(name, {}).get(cls.labels_key(labels), 0)
+
+    @classmethod
+    def get_observation(cls, name: str, **labels) -> typing.Optional[Observation]:
+        return cls.observations.get(name, {}).get(cls.labels_key(labels))
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """
+        get a json compatible snapshot of all metrics
+        """
+        with cls.lock:
+            return {
+                "counters": cls._as_list(cls.counters, lambda v: v),
+                "gauges": cls._as_list(cls.gauges, lambda v: v),
+                "observations": cls._as_list(cls.observations, lambda v: v.as_dict()),
+            }
+
+    @staticmethod
+    def _as_list(metrics: dict, convert: typing.Callable) -> dict:
+        return {
+            name: [{"labels": dict(key), "value": convert(value)} for key, value in values.items()]
+            for name, values in metrics.items()
+        }
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.counters = {}
+            cls.gauges = {}
+            cls.observations = {}
@@ -0,0 +1,244 @@
+'''
+Created on 2026-10-19
+
+route level cache of built pages and their rendered html
+'''
+import asyncio
+import collections
+import math
+import time
+import typing
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from jpcore.metrics import Metrics
+from jpcore.webpage import WebPage
+
+
+class PageCacheEntry:
+    """
+    a cached page with the response rendered for its current version
+    """
+
+    def __init__(self, page: WebPage, response: Response, expires: float):
+        self.page = page
+        self.expires = expires
+        self.set_response(response)
+
+    def set_response(self, response: Response):
+        self.body = response.body
+        self.status_code = response.status_code
+        self.media_type = response.media_type
+        self.version = self.page.version
+
+    def response(self, render_response: typing.Callable[[WebPage], Response]) -> Response:
+        """
+        get a new response with the cached body - rendered again if the page has changed since,
+        cookies are set per request
+        """
+        if self.version != self.page.version:
+            self.set_response(render_response(self.page))
+        return Response(self.body, status_code=self.status_code, media_type=self.media_type)
+
+
+class PageCache:
+    """
+    caches the rendered pages of a route by path, query parameters and optionally session
+
+    all visitors of a cached page share the same WebPage - use it for read mostly
+    pages whose content does not depend on the visitor
+
+    the page function is only called on a miss - the rendered html is reused until
+    the version of the page changes e.g. by an event or an update
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 128, vary_on_session: bool = False):
+        """
+        constructor
+
+        Args:
+            ttl(float): seconds a page is served from the cache
+            max_entries(int): maximum number of cached pages - the least recently used are dropped
+            vary_on_session(bool): if True each session gets its own page
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.vary_on_session = vary_on_session
+        self.entries: typing.Dict[tuple, PageCacheEntry] = collections.OrderedDict()
+        # key -> future of a page being built
+        self.building: typing.Dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, request: Request) -> tuple:
+        session_id = getattr(request.state, "session_id", None) if self.vary_on_session else None
+        return request.url.path, tuple(sorted(request.query_params.multi_items())), session_id
+
+    def get(self, key: tuple) -> typing.Optional[PageCacheEntry]:
+        """
+        get the cached entry for the given key if it has not expired
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self.remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, page: WebPage, response: Response) -> PageCacheEntry:
+        """
+        cache the given page and its rendered response
+        """
+        if key in self.entries:
+            self.remove(key)
+        # the page must survive the disconnects of its visitors while it is cached
+        page.delete_flag = False
+        entry = PageCacheEntry(page, response, time.monotonic() + self.ttl)
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self.remove(next(iter(self.entries)))
+        return entry
+
+    def remove(self, key: tuple):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        page = entry.page
+        page.delete_flag = True
+        # pages with open websockets are deleted when the last one disconnects
+        if not WebPage.sockets.get(page.page_id) and page.page_id in WebPage.instances:
+            page.delete_components()
+            page.remove_page()
+
+    def invalidate(self, path: str = None, query_params: dict = None, session_id: str = None) -> int:
+        """
+        drop the cached pages matching the given path, query parameters and session
+
+        Args:
+            path(str): the path of the pages to drop - all pages if None
+            query_params(dict): only drop the page with exactly these query parameters
+            session_id(str): only drop the pages of this session
+
+        Returns:
+            int: the number of pages dropped
+        """
+        query = tuple(sorted(query_params.items())) if query_params is not None else None
+        keys = [
+            key
+            for key in self.entries
+            if (path is None or key[0] == path)
+            and (query is None or key[1] == query)
+            and (session_id is None or key[2] == session_id)
+        ]
+        for key in keys:
+            self.remove(key)
+        return len(keys)
+
+    async def response(
+        self,
+        request: Request,
+        create_response: typing.Callable[[], typing.Awaitable],
+        render_response: typing.Callable[[WebPage], Response],
+    ) -> typing.Tuple[typing.Optional[WebPage], Response]:
+        """
+        get the page and response for the given request from the cache or by calling create_response
+
+        Args:
+            request(Request): the request
+            create_response: coroutine function returning the page and its response - the page is None if the
+                page function returned a response which is not cached
+            render_response: function rendering the response of a cached page
+
+        Returns:
+            tuple: the page and the response to send
+        """
+        key = self.key(request)
+        # label the metrics with the route template - concrete paths would create a series per path
+        route = getattr(request.state, "route", None) or key[0]
+        entry = self.get(key)
+        while entry is None and key in self.building:
+            # None if the build was cancelled or its page is not cached - another waiter may have built it meanwhile
+            entry = await asyncio.shield(self.building[key]) or self.get(key)
+        if entry is not None:
+            self.hits += 1
+            Metrics.increment("page_cache_hits", route=route)
+            return entry.page, entry.response(render_response)
+        self.misses += 1
+        Metrics.increment("page_cache_misses", route=route)
+        building = asyncio.get_running_loop().create_future()
+        self.building[key] = building
+        try:
+            page, response = await create_response()
+            if page is not None and response.status_code == 200:
+                entry = self.put(key, page, response)
+            building.set_result(entry)
+        except Exception as ex:
+            building.set_exception(ex)
+            # only the waiters need the exception
+            building.exception()
+            raise
+        finally:
+            if not building.done():
+                # e.g. the request has been cancelled - the waiters must not hang
+                building.set_result(None)
+            self.building.pop(key, None)
+        return page, response
+
+
+class SharedPage(PageCache):
+    """
+    serves a single WebPage to all sessions of a route - the websockets of all viewers
+    are registered under that page so each update is built and serialized once
+
+    the events of the viewers are only handled if allows returns True - the internal events
+    components use to request data for a single viewer are always handled
+    """
+
+    # events the components send to load data for a single viewer without changing the shared
+    # component e.g. AgGrid rows and QSelect options - QTable requests, QTree lazy loading and
+    # chart zooming change the shared component and need to be listed in allowed_events
+    internal_events = frozenset(["getRows", "resyncRows", "filter", "virtual-scroll"])
+
+    def __init__(
+        self,
+        allowed_events: typing.Optional[typing.Iterable[str]] = (),
+        ttl: float = math.inf,
+        max_entries: int = 16,
+    ):
+        """
+        constructor
+
+        Args:
+            allowed_events: the event types the viewers may trigger besides the internal events - all if None, none by default
+            ttl(float): seconds until the page is built again - never by default
+            max_entries(int): maximum number of shared pages e.g. for routes with path parameters
+        """
+        super().__init__(ttl=ttl, max_entries=max_entries, vary_on_session=False)
+        self.allowed_events = None if allowed_events is None else set(allowed_events)
+
+    def key(self, request: Request) -> tuple:
+        return request.url.path, (), None
+
+    def put(self, key: tuple, page: WebPage, response: Response) -> PageCacheEntry:
+        page.event_policy = self
+        # the page belongs to no session
+        page.session_id = None
+        return super().put(key, page, response)
+
+    def allows(self, event_data: dict) -> bool:
+        """
+        check whether a viewer may trigger the given event - override e.g. for session based policies
+
+        Args:
+            event_data(dict): the data of the event including event_type, page and session_id
+
+        Returns:
+            bool: True if the event is to be handled
+        """
+        event_type = event_data.get("event_type")
+        if event_type in self.internal_events:
+            return True
+        return self.allowed_events is None or event_type in self.allowed_events
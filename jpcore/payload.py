@@ -0,0 +1,157 @@
+'''
+Created on 2026-10-19
+
+payload size analytics - serialized bytes per component and unchanged subtrees
+'''
+import hashlib
+import json
+import typing
+
+from jpcore.metrics import Metrics
+
+
+class PayloadAnalyzer:
+    """
+    attributes the serialized bytes of page builds to components and flags
+    subtrees that are sent again unchanged
+    """
+
+    enabled = False
+    top = 20
+    # page_id -> report of the last build
+    reports: typing.Dict[int, dict] = {}
+    # page_id -> key -> hash of the subtree sent last
+    sent_hashes: typing.Dict[int, typing.Dict[str, str]] = {}
+
+    @staticmethod
+    def dumps(d) -> str:
+        # same encoding as starlette's WebSocket.send_json
+        return json.dumps(d, separators=(",", ":"), ensure_ascii=False, default=str)
+
+    @staticmethod
+    def node_class(d: dict) -> str:
+        return d.get("class_name") or d.get("vue_type") or "unknown"
+
+    @classmethod
+    def analyze_node(cls, d: dict, path: str, nodes: list) -> typing.Tuple[int, str]:
+        """
+        analyze the given component dict and its children
+
+        Returns:
+            tuple: the serialized bytes and hash of the subtree
+        """
+        children = d.get("object_props") or []
+        scoped_slots = d.get("scoped_slots") or {}
+        shallow = d
+        if children or scoped_slots:
+            shallow = dict(d)
+            if children:
+                shallow["object_props"] = []
+            if scoped_slots:
+                shallow["scoped_slots"] = {}
+        text = cls.dumps(shallow)
+        own_bytes = len(text.encode("utf-8"))
+        subtree_bytes = own_bytes
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16)
+        child_items = [(f"{path}/{i}", child) for i, child in enumerate(children)]
+        child_items.extend((f"{path}/{slot}", child) for slot, child in scoped_slots.items())
+        for child_path, child in child_items:
+            if isinstance(child, dict):
+                child_bytes, child_hash = cls.analyze_node(child, child_path, nodes)
+                subtree_bytes += child_bytes
+                digest.update(child_hash.encode("ascii"))
+        subtree_hash = digest.hexdigest()
+        component_id = d.get("id")
+        nodes.append(
+            {
+                "key": str(component_id) if component_id is not None else f"path:{path}",
+                "id": component_id,
+                "class": cls.node_class(d),
+                "bytes": own_bytes,
+                "subtree_bytes": subtree_bytes,
+                "hash": subtree_hash,
+                "path": path,
+            }
+        )
+        return subtree_bytes, subtree_hash
+
+    @classmethod
+    def analyze(cls, wp, build_list: list) -> dict:
+        """
+        analyze the given build list of the given page
+
+        Args:
+            wp(WebPage): the page that was built
+            build_list(list): the list of component dicts of the page
+        """
+        nodes = []
+        total_bytes = 0
+        for i, d in enumerate(build_list):
+            subtree_bytes, _subtree_hash = cls.analyze_node(d, str(i), nodes)
+            total_bytes += subtree_bytes
+        previous_hashes = cls.sent_hashes.get(wp.page_id, {})
+        unchanged = []
+        unchanged_paths = set()
+        # nodes are in post order - sort by depth so that parents come before children
+        for node in sorted(nodes, key=lambda n: n["path"].count("/")):
+            if previous_hashes.get(node["key"]) != node["hash"]:
+                continue
+            parts = node["path"].split("/")
+            if any("/".join(parts[:i]) in unchanged_paths for i in range(1, len(parts))):
+                # only report the topmost unchanged subtree
+                continue
+            unchanged_paths.add(node["path"])
+            unchanged.append(node)
+        cls.sent_hashes[wp.page_id] = {node["key"]: node["hash"] for node in nodes}
+        unchanged_bytes = sum(node["subtree_bytes"] for node in unchanged)
+        classes = {}
+        for node in nodes:
+            class_stats = classes.setdefault(node["class"], {"class": node["class"], "bytes": 0, "count": 0})
+            class_stats["bytes"] += node["bytes"]
+            class_stats["count"] += 1
+
+        def share(node_bytes: int) -> float:
+            return round(node_bytes / total_bytes, 4) if total_bytes else 0.0
+
+        def public(node: dict) -> dict:
+            return {**{k: v for k, v in node.items() if k not in ["hash", "path"]}, "share": share(node["bytes"])}
+
+        previous = cls.reports.get(wp.page_id)
+        report = {
+            "page_id": wp.page_id,
+            "route": getattr(wp, "route_path", None),
+            "builds": previous["builds"] + 1 if previous else 1,
+            "total_bytes": total_bytes,
+            "unchanged_bytes": unchanged_bytes,
+            "components": [public(n) for n in sorted(nodes, key=lambda n: n["bytes"], reverse=True)[: cls.top]],
+            "classes": sorted(classes.values(), key=lambda c: c["bytes"], reverse=True)[: cls.top],
+            "unchanged": [
+                {"key": n["key"], "id": n["id"], "class": n["class"], "subtree_bytes": n["subtree_bytes"]}
+                for n in sorted(unchanged, key=lambda n: n["subtree_bytes"], reverse=True)[: cls.top]
+            ],
+        }
+        cls.reports[wp.page_id] = report
+        Metrics.observe("page_build_bytes", total_bytes)
+        Metrics.increment("page_build_unchanged_bytes", unchanged_bytes)
+        for class_stats in classes.values():
+            Metrics.increment("component_bytes", class_stats["bytes"], component_class=class_stats["class"])
+        return report
+
+    @classmethod
+    def overlay_report(cls, page_id: int, top: int = 5) -> typing.Optional[dict]:
+        """
+        get a short version of the report of the given page for the dev overlay
+        """
+        report = cls.reports.get(page_id)
+        if report is None:
+            return None
+        return {
+            "total_bytes": report["total_bytes"],
+            "unchanged_bytes": report["unchanged_bytes"],
+            "components": report["components"][:top],
+        }
+
+    @classmethod
+    def remove_page(cls, page_id: int):
+        cls.reports.pop(page_id, None)
+        cls.sent_hashes.pop(page_id, None)
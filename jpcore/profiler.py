@@ -0,0 +1,168 @@
+'''
+Created on 2026-10-19
+
+statistical profiler for live justpy server processes
+'''
+import asyncio
+import collections
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import typing
+
+# functions marking the justpy stage a sample belongs to - the innermost match wins
+stage_functions = {
+    "funcResponse": "route",
+    "get_page_for_func": "route",
+    "get_response_for_load_page": "route",
+    "handle_event": "event",
+    "_handle_event": "event",
+    "run_event_function": "event",
+    "build_list": "build",
+    "convert_object_to_dict": "build",
+    "send_json": "send",
+}
+justpy_dirs = tuple(
+    os.path.dirname(os.path.abspath(path)) + os.sep
+    for path in [__file__, os.path.join(os.path.dirname(__file__), "..", "justpy", "justpy.py")]
+)
+
+
+class SamplingProfiler:
+    """
+    samples the stack of the event loop thread from a separate thread
+
+    nothing runs while no profile is being taken
+    """
+
+    lock = threading.Lock()
+
+    def __init__(self, thread_id: int = None, interval_ms: float = 5):
+        """
+        constructor
+
+        Args:
+            thread_id(int): the thread to sample - default: the calling thread
+            interval_ms(float): the sampling interval
+        """
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval_ms = interval_ms
+        self.stacks = collections.Counter()
+        self.stage_samples = collections.Counter()
+        self.sample_count = 0
+        self.running = False
+        self.thread = None
+
+    @staticmethod
+    def frame_name(frame) -> str:
+        code = frame.f_code
+        name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return name.replace(";", ":").replace(" ", "_")
+
+    @staticmethod
+    def stage_of(frames: list) -> str:
+        """
+        get the justpy stage of the given frames (outermost first)
+        """
+        stage = "other"
+        for frame in frames:
+            code = frame.f_code
+            frame_stage = stage_functions.get(code.co_name)
+            if frame_stage is not None and code.co_filename.startswith(justpy_dirs):
+                stage = frame_stage
+        return stage
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+        stage = self.stage_of(frames)
+        names = [f"justpy:{stage}"] + [self.frame_name(f) for f in frames]
+        self.stacks[";".join(names)] += 1
+        self.stage_samples[stage] += 1
+        self.sample_count += 1
+
+    def run(self):
+        interval = self.interval_ms / 1000
+        while self.running:
+            self.sample()
+            time.sleep(interval)
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="justpy-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+
+    def as_collapsed(self) -> str:
+        """
+        get the samples in the collapsed stack format used by flamegraph.pl and speedscope
+        """
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n"
+
+    def as_summary(self) -> dict:
+        return {
+            "samples": self.sample_count,
+            "interval_ms": self.interval_ms,
+            "stages": dict(self.stage_samples.most_common()),
+        }
+
+    @classmethod
+    async def profile(cls, seconds: float, interval_ms: float = 5) -> typing.Optional["SamplingProfiler"]:
+        """
+        sample the calling event loop thread for the given number of seconds
+
+        Returns:
+            SamplingProfiler: the profiler with the samples or None if another profile is running
+        """
+        if not cls.lock.acquire(blocking=False):
+            return None
+        try:
+            profiler = SamplingProfiler(interval_ms=interval_ms)
+            profiler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.stop()
+            return profiler
+        finally:
+            cls.lock.release()
+
+    @classmethod
+    async def profile_pstats(cls, seconds: float) -> typing.Optional[bytes]:
+        """
+        run cProfile on the calling event loop thread for the given number of seconds
+
+        Returns:
+            bytes: the marshalled pstats data or None if another profile is running
+        """
+        if not cls.lock.acquire(blocking=False):
+            return None
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profile.disable()
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "justpy.pstats")
+                pstats.Stats(profile).dump_stats(path)
+                with open(path, "rb") as f:
+                    return f.read()
+        finally:
+            cls.lock.release()
@@ -0,0 +1,277 @@
+'''
+Created on 2026-10-19
+
+pluggable tracing hooks for page builds, event handling and socket sends
+'''
+import contextvars
+import json
+import logging
+import threading
+import time
+import typing
+import uuid
+
+try:
+    from opentelemetry import trace as otel_trace
+
+    _has_opentelemetry = True
+except:
+    _has_opentelemetry = False
+
+# the span that is currently active - asyncio tasks copy the context on creation
+# so a span opened in on_receive is the parent of the spans of handle_event and update()
+_current_span = contextvars.ContextVar("justpy_current_span", default=None)
+
+
+class NoopSpan:
+    """
+    span that does nothing - used by the default tracer
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+class Span:
+    """
+    a named and timed unit of work
+    """
+
+    def __init__(self, tracer: "RecordingTracer", name: str, attributes: dict):
+        """
+        constructor
+
+        Args:
+            tracer(RecordingTracer): the tracer to hand the span to when it ends
+            name(str): the name of the span e.g. event.handler
+            attributes(dict): additional attributes of the span
+        """
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = None
+        self.trace_id = None
+        self.start_time = None
+        self.end_time = None
+        self.error = None
+        self._token = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if isinstance(parent, Span):
+            self.parent_id = parent.span_id
+            self.trace_id = parent.trace_id
+        else:
+            self.trace_id = uuid.uuid4().hex
+        self._token = _current_span.set(self)
+        self.start_time = time.time()
+        self._start_counter = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.duration_ms = (time.perf_counter() - self._start_counter) * 1000
+        self.end_time = self.start_time + self.duration_ms / 1000
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        _current_span.reset(self._token)
+        self.tracer.export(self)
+        return False
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def as_dict(self) -> dict:
+        """
+        get a json compatible dict of this span
+        """
+        d = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+        if self.error:
+            d["error"] = self.error
+        return d
+
+
+class Tracer:
+    """
+    tracer base class - the default does not record anything
+    """
+
+    noop_span = NoopSpan()
+
+    def span(self, name: str, attributes: dict):
+        """
+        get a context manager for a span with the given name
+
+        Args:
+            name(str): the name of the span
+            attributes(dict): the attributes of the span
+        """
+        return Tracer.noop_span
+
+    def close(self):
+        pass
+
+
+class SpanExporter:
+    """
+    receives finished spans
+    """
+
+    def export(self, span: Span):
+        pass
+
+    def close(self):
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """
+    keeps finished spans in a list e.g. for tests
+    """
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    writes finished spans as JSON lines to a local file
+    """
+
+    def __init__(self, file_path: str):
+        """
+        constructor
+
+        Args:
+            file_path(str): the path of the file to append the spans to
+        """
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.file = open(file_path, "a", encoding="utf-8")
+
+    def export(self, span: Span):
+        line = json.dumps(span.as_dict(), default=str)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class RecordingTracer(Tracer):
+    """
+    tracer that records spans and hands them to an exporter
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    def span(self, name: str, attributes: dict):
+        return Span(self, name, attributes)
+
+    def export(self, span: Span):
+        try:
+            self.exporter.export(span)
+        except Exception as ex:
+            logging.warning(f"could not export span {span.name}: {ex}")
+
+    def close(self):
+        self.exporter.close()
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    bridge to OpenTelemetry - spans are handed to the globally configured tracer provider
+    """
+
+    def __init__(self, instrumentation_name: str = "justpy"):
+        assert _has_opentelemetry, "opentelemetry not installed"
+        self.otel_tracer = otel_trace.get_tracer(instrumentation_name)
+
+    def span(self, name: str, attributes: dict):
+        # OpenTelemetry only accepts primitive attribute values
+        otel_attributes = {
+            k: v if isinstance(v, (str, bool, int, float)) else str(v)
+            for k, v in attributes.items()
+            if v is not None
+        }
+        return self.otel_tracer.start_as_current_span(name, attributes=otel_attributes)
+
+
+class Tracing:
+    """
+    access to the active tracer
+    """
+
+    tracer: Tracer = Tracer()
+
+    @classmethod
+    def set_tracer(cls, tracer: typing.Optional[Tracer]) -> Tracer:
+        """
+        set the active tracer - None resets to the no-op default
+
+        Returns:
+            Tracer: the previously active tracer
+        """
+        previous = cls.tracer
+        cls.tracer = tracer if tracer is not None else Tracer()
+        return previous
+
+    @classmethod
+    def configure(cls, exporter: str, trace_file: str = "justpy_trace.jsonl"):
+        """
+        configure tracing from the given settings
+
+        Args:
+            exporter(str): "jsonl", "opentelemetry" or empty for no tracing
+            trace_file(str): the file to write JSON lines to
+        """
+        if not exporter:
+            cls.set_tracer(None)
+        elif exporter == "jsonl":
+            cls.set_tracer(RecordingTracer(JsonLinesExporter(trace_file)))
+        elif exporter == "opentelemetry":
+            if _has_opentelemetry:
+                cls.set_tracer(OpenTelemetryTracer())
+            else:
+                logging.warning("opentelemetry not installed - tracing disabled")
+        else:
+            raise ValueError(f"invalid tracing exporter {exporter}")
+
+    @classmethod
+    def span(cls, name: str, **attributes):
+        """
+        get a context manager for a span of the active tracer
+
+        Args:
+            name(str): the name of the span
+            attributes: the attributes of the span
+        """
+        return cls.tracer.span(name, attributes)
+
+    @classmethod
+    def current_span(cls) -> typing.Optional[Span]:
+        """
+        get the span recorded by the justpy tracer that is currently active (if any)
+        """
+        return _current_span.get()
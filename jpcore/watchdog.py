@@ -0,0 +1,207 @@
+'''
+Created on 2026-10-19
+
+event loop lag monitor and slow handler watchdog
+'''
+import asyncio
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+import typing
+
+from jpcore.metrics import Metrics
+
+
+class WatchedCall:
+    """
+    a handler or page function call that is being watched
+    """
+
+    def __init__(self, watchdog: "Watchdog", kind: str, func: typing.Callable, context: dict):
+        """
+        constructor
+
+        Args:
+            watchdog(Watchdog): the watchdog to report to
+            kind(str): event or page
+            func(Callable): the user function called
+            context(dict): component_class, event_type and route of the call
+        """
+        self.watchdog = watchdog
+        self.kind = kind
+        self.func = func
+        # bound methods and functions both give access to the code object
+        self.code = getattr(getattr(func, "__func__", func), "__code__", None)
+        self.context = context
+        self.stack = None
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.watchdog.in_flight[id(self)] = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.watchdog.in_flight.pop(id(self), None)
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        self.watchdog.finished(self, duration_ms)
+        return False
+
+
+class NoopWatchedCall:
+    """
+    used when no watchdog is running
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+class Watchdog:
+    """
+    measures the lag of the event loop continuously and reports handlers
+    and page functions that run longer than a threshold
+
+    a heartbeat task on the loop is checked from a separate thread so that
+    the stack of the code blocking the loop can be captured while it blocks
+    """
+
+    instance: typing.Optional["Watchdog"] = None
+    noop_call = NoopWatchedCall()
+
+    def __init__(self, threshold_ms: float = 200, interval_ms: float = 50, history: int = 100):
+        """
+        constructor
+
+        Args:
+            threshold_ms(float): calls and loop stalls longer than this are reported
+            interval_ms(float): the interval of the loop heartbeat
+            history(int): the number of slow calls to keep
+        """
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.in_flight: typing.Dict[int, WatchedCall] = {}
+        self.slow_calls = collections.deque(maxlen=history)
+        self.heartbeat = time.perf_counter()
+        self.loop_thread_id = None
+        self.running = False
+        self.task = None
+        self.thread = None
+
+    @classmethod
+    def watch(cls, kind: str, func: typing.Callable, **context):
+        """
+        get a context manager watching the call of the given function
+
+        Args:
+            kind(str): event or page
+            func(Callable): the function that is called
+            context: component_class, event_type and route of the call
+        """
+        watchdog = cls.instance
+        if watchdog is None:
+            return cls.noop_call
+        return WatchedCall(watchdog, kind, func, context)
+
+    @classmethod
+    def start(cls, loop: asyncio.AbstractEventLoop, threshold_ms: float = 200, interval_ms: float = 50) -> "Watchdog":
+        """
+        start a watchdog for the given loop - must be called from the loop thread
+        """
+        if cls.instance is not None:
+            cls.instance.stop()
+        watchdog = Watchdog(threshold_ms=threshold_ms, interval_ms=interval_ms)
+        watchdog.loop_thread_id = threading.get_ident()
+        watchdog.running = True
+        watchdog.task = loop.create_task(watchdog.measure_lag())
+        watchdog.thread = threading.Thread(target=watchdog.check_blocked, name="justpy-watchdog", daemon=True)
+        watchdog.thread.start()
+        cls.instance = watchdog
+        return watchdog
+
+    def stop(self):
+        self.running = False
+        if self.task is not None:
+            self.task.cancel()
+        if Watchdog.instance is self:
+            Watchdog.instance = None
+
+    async def measure_lag(self):
+        """
+        heartbeat task measuring how late the loop wakes up
+        """
+        interval = self.interval_ms / 1000
+        while self.running:
+            before = time.perf_counter()
+            self.heartbeat = before
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            self.heartbeat = now
+            lag_ms = max(0.0, (now - before - interval) * 1000)
+            Metrics.set_gauge("loop_lag_ms", lag_ms)
+            Metrics.observe("loop_lag_ms", lag_ms)
+            if lag_ms > self.threshold_ms:
+                Metrics.increment("loop_stalls")
+                logging.warning(f"event loop lagged {lag_ms:.0f} ms")
+
+    def check_blocked(self):
+        """
+        thread checking the heartbeat - captures the stack of the loop thread
+        if the loop has been blocked for longer than the threshold
+        """
+        interval = self.interval_ms / 1000
+        while self.running:
+            time.sleep(interval)
+            blocked_ms = (time.perf_counter() - self.heartbeat) * 1000
+            if blocked_ms > self.threshold_ms + self.interval_ms:
+                self.capture_stack()
+
+    def capture_stack(self):
+        """
+        capture the stack of the loop thread and attach it to the
+        in flight call whose function is on that stack
+        """
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return
+        calls_by_code = {call.code: call for call in list(self.in_flight.values()) if call.code is not None}
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            call = calls_by_code.get(frame.f_code)
+            if call is not None:
+                if call.stack is None:
+                    # the stack from the user function down to the blocking code
+                    call.stack = "".join(traceback.format_stack(frames[0], limit=len(frames)))
+                return
+            frame = frame.f_back
+
+    def finished(self, call: WatchedCall, duration_ms: float):
+        """
+        the given call has finished after the given duration
+        """
+        labels = {"kind": call.kind, **{k: v for k, v in call.context.items() if v is not None}}
+        Metrics.observe("handler_duration_ms", duration_ms, kind=call.kind)
+        if duration_ms <= self.threshold_ms:
+            return
+        Metrics.increment("slow_handlers", **labels)
+        record = {
+            "kind": call.kind,
+            "function": getattr(call.func, "__qualname__", str(call.func)),
+            "duration_ms": round(duration_ms, 1),
+            "time": time.time(),
+            **call.context,
+            "stack": call.stack,
+        }
+        self.slow_calls.append(record)
+        context_text = ", ".join(f"{k}: {v}" for k, v in call.context.items())
+        msg = f"slow {call.kind} function {record['function']} took {duration_ms:.0f} ms ({context_text})"
+        if call.stack:
+            msg = f"{msg} blocking code:\n{call.stack}"
+        logging.warning(msg)
@@ -7,11 +7,78 @@ import typing
 
 from addict import Dict
 import asyncio
+import contextvars
 import inspect
+import json
+import logging
+import time
 from types import MethodType
 
 from starlette.websockets import WebSocket
 
+from jpcore.htmlrenderer import HtmlRenderer
+from jpcore.payload import PayloadAnalyzer
+from jpcore.tracing import Tracing
+from jpcore.watchdog import Watchdog
+
+# True while building an update that is sent to all websockets of a page
+# components may then send changes relative to what they sent before
+incremental_build = contextvars.ContextVar("incremental_build", default=False)
+# the page whose websockets the build is sent to - components may keep what they sent per page
+build_page = contextvars.ContextVar("build_page", default=None)
+
+
+class ComponentIds:
+    """
+    the ids of the components of a container for membership checks without scanning the components
+
+    add_component and remove_component keep the ids up to date - they are rebuilt if the components
+    have been replaced or changed their length otherwise e.g. by components.clear()
+    """
+
+    def __init__(self):
+        self.components = None
+        self.length = 0
+        self.ids = set()
+
+    def get(self, components: list) -> set:
+        """
+        get the ids of the given components
+
+        Args:
+            components(list): the components of the container
+
+        Returns:
+            set: the ids of the components
+        """
+        if components is not self.components or len(components) != self.length:
+            self.components = components
+            self.length = len(components)
+            self.ids = {id(component) for component in components}
+        return self.ids
+
+    def added(self, components: list, component):
+        """
+        record that the given component has been added to the given components
+        """
+        if components is self.components and len(components) == self.length + 1:
+            self.length += 1
+            self.ids.add(id(component))
+
+    def removed(self, components: list, component, contained: bool):
+        """
+        record that the given component has been removed from the given components
+
+        Args:
+            components(list): the components of the container
+            component: the removed component
+            contained(bool): True if the component is still contained e.g. since it had been added twice
+        """
+        if components is self.components and len(components) == self.length - 1:
+            self.length -= 1
+            if not contained:
+                self.ids.discard(id(component))
+
 
 class WebPage:
     """
@@ -21,9 +88,16 @@ class WebPage:
     instances: typing.Dict[int, 'WebPage'] = {}
     sockets: typing.Dict[int, typing.Dict[int, WebSocket]] = {}
     next_page_id = 0
+    # topic -> ids of the pages with components subscribed to the topic
+    topic_pages: typing.Dict[str, typing.Set[int]] = {}
+    # pages with components changed by publish that still need to be sent
+    dirty_pages: typing.Dict[int, 'WebPage'] = {}
+    publish_task = None
     use_websockets = True
     delete_flag = True
     tailwind = True
+    # if True the html components are rendered into the initial response and the frontend hydrates them
+    ssr = False
     debug = False
     highcharts_theme = None
     # One of ['avocado', 'dark-blue', 'dark-green', 'dark-unica', 'gray',
@@ -49,10 +123,17 @@ class WebPage:
         self.template_file = "tailwind.html"
         self.title = "JustPy"
         self.display_url = None
+        self.route_path = None  # path of the request the page was created for
+        self.route = None  # path template of the route the page was created for e.g. /items/{item_id}
+        self.session_id = None  # session of the request the page was created for
+        self.event_policy = None  # if set decides which events of the visitors are handled
+        self.version = 0  # increased whenever the page may have changed e.g. to invalidate its cached html
+        self.created = time.time()
         self.redirect = None
         self.open = None
         self.favicon = None
         self.components = []  # list of direct children components on page
+        self.component_ids = ComponentIds()
         self.cookies = {}
         self.css = ""
         self.head_html = ""
@@ -67,6 +148,8 @@ class WebPage:
             False  # Set to True for Quasar dark mode (use for other dark modes also)
         )
         self.data = {}
+        self.subscriptions = {}  # topic -> {id(component): (component, func)}
+        self.dirty_components = {}  # components to send after a publish
         WebPage.instances[self.page_id] = self
         for k, v in kwargs.items():
             self.__setattr__(k, v)
@@ -82,20 +165,151 @@ class WebPage:
             self.components.append(child)
         else:
             self.components.insert(position, child)
+        self.component_ids.added(self.components, child)
+        add_parent = getattr(child, "add_parent", None)
+        if add_parent is not None:
+            add_parent(self)
         return self
 
     async def on_disconnect(self, websocket=None):
-        if self.delete_flag:
+        # pages shared by several websockets are deleted when the last one disconnects
+        if self.delete_flag and not WebPage.sockets.get(self.page_id):
             self.delete_components()
             self.remove_page()
 
+    def changed(self):
+        """
+        record that the page may have changed
+        """
+        self.version += 1
+
     def remove_page(self):
         WebPage.instances.pop(self.page_id)
+        PayloadAnalyzer.remove_page(self.page_id)
+        for topic in list(self.subscriptions):
+            self.unsubscribe(topic)
+        WebPage.dirty_pages.pop(self.page_id, None)
+        self.dirty_components = {}
+
+    def subscribe(self, topic: str, component, func: typing.Callable = None):
+        """
+        subscribe the given component of this page to the given topic
+
+        Args:
+            topic(str): the name of the topic
+            component: the component - it needs an id to be updated in the browser
+            func(Callable): called with the component and the payload of each publish,
+                the component is not sent to the browser if it returns True
+        """
+        self.subscriptions.setdefault(topic, {})[id(component)] = (component, func)
+        WebPage.topic_pages.setdefault(topic, set()).add(self.page_id)
+
+    def unsubscribe(self, topic: str, component=None):
+        """
+        unsubscribe the given component or all components of this page from the given topic
+        """
+        subscriptions = self.subscriptions.get(topic)
+        if subscriptions is None:
+            return
+        if component is None:
+            subscriptions.clear()
+        else:
+            subscriptions.pop(id(component), None)
+        if not subscriptions:
+            del self.subscriptions[topic]
+            page_ids = WebPage.topic_pages.get(topic)
+            if page_ids is not None:
+                page_ids.discard(self.page_id)
+                if not page_ids:
+                    del WebPage.topic_pages[topic]
+
+    @classmethod
+    async def publish(cls, topic: str, payload=None) -> int:
+        """
+        publish the given payload to all components subscribed to the given topic on any page
+
+        the subscribed components are sent to the browsers after the current event loop
+        iteration - one components_update message per page for all topics published meanwhile
+
+        Args:
+            topic(str): the name of the topic
+            payload: the payload passed to the functions of the subscriptions
+
+        Returns:
+            int: the number of subscriptions
+        """
+        count = 0
+        for page_id in list(cls.topic_pages.get(topic, ())):
+            page = cls.instances.get(page_id)
+            if page is None:
+                continue
+            for component, func in list(page.subscriptions.get(topic, {}).values()):
+                count += 1
+                skip = None
+                if func is not None:
+                    skip = func(component, payload)
+                    if inspect.isawaitable(skip):
+                        skip = await skip
+                if not skip:
+                    page.dirty_components[id(component)] = component
+                    cls.dirty_pages[page_id] = page
+        if cls.dirty_pages and (cls.publish_task is None or cls.publish_task.done()):
+            cls.publish_task = asyncio.get_running_loop().create_task(cls.flush_published())
+        return count
+
+    @classmethod
+    async def flush_published(cls):
+        """
+        send the components changed by publish - each page gets a single components_update
+        message for all of its websockets
+
+        the components are serialized per page since their dicts may depend on the page
+        e.g. the row transactions of an AgGrid
+        """
+        pages, cls.dirty_pages = cls.dirty_pages, {}
+        messages = []
+        for page in pages.values():
+            components, page.dirty_components = page.dirty_components, {}
+            websocket_dict = cls.sockets.get(page.page_id)
+            if not websocket_dict:
+                continue
+            data = page.build_components(components.values())
+            messages.append((page, list(websocket_dict.values()), {"type": "components_update", "data": data}))
+        await asyncio.gather(
+            *[page.broadcast_json(websockets, dict_to_send) for page, websockets, dict_to_send in messages],
+            return_exceptions=True,
+        )
+
+    def unsubscribe_removed(self, components: typing.Iterable):
+        """
+        unsubscribe the given components removed from this page and their descendants
+        unless they are still on this page via another container
+
+        Args:
+            components(Iterable): the removed components
+        """
+        if not self.subscriptions:
+            return
+        removed = set()
+        stack = list(components)
+        while stack:
+            component = stack.pop()
+            if id(component) in removed:
+                continue
+            removed.add(id(component))
+            stack.extend(getattr(component, "components", []))
+        for topic, subscriptions in list(self.subscriptions.items()):
+            for key, (component, _func) in list(subscriptions.items()):
+                if key in removed and self.page_id not in component.get_pages():
+                    self.unsubscribe(topic, component)
 
     def delete_components(self):
-        for c in self.components:
+        components, self.components = self.components, []
+        for c in components:
+            getattr(c, "parents", {}).pop(id(self), None)
+        self.unsubscribe_removed(components)
+        for c in components:
             c.delete()
-        self.components = []
 
     def add(self, *args):
         for component in args:
@@ -115,6 +329,11 @@ class WebPage:
             self.components.remove(component)
         except:
             raise Exception("Component cannot be removed because it was not in Webpage")
+        contained = component in self.components
+        self.component_ids.removed(self.components, component, contained)
+        if not contained:
+            getattr(component, "parents", {}).pop(id(self), None)
+            self.unsubscribe_removed([component])
         return self
 
     def remove(self, component):
@@ -199,11 +418,17 @@ class WebPage:
         Args:
             websocket(): The websocket to use (if any)
         """
+        self.changed()
         try:
             websocket_dict = WebPage.sockets[self.page_id]
         except:
             return self
-        page_build = self.build_list()
+        token = incremental_build.set(websocket is None)
+        try:
+            with Tracing.span("page.build", page_id=self.page_id):
+                page_build = self.build_list()
+        finally:
+            incremental_build.reset(token)
         dict_to_send = {
             "type": "page_update",
             "data": page_build,
@@ -215,45 +440,180 @@ class WebPage:
                 "favicon": self.favicon,
             },
         }
+        if self.debug and PayloadAnalyzer.enabled:
+            dict_to_send["payload_report"] = PayloadAnalyzer.overlay_report(self.page_id)
+
+        if websocket:
+            WebPage.loop.create_task(self.send_json(websocket, dict_to_send))
+        else:
+            await self.broadcast_json(list(websocket_dict.values()), dict_to_send)
+        return self
+
+    async def update_components(self, components: typing.Iterable, websocket=None):
+        """
+        update just the given components of this page with a single components_update message
 
+        Args:
+            components(Iterable): the components to update - they need an id, components
+                contained in other given components are sent as part of those
+            websocket(): the websocket to use - all websockets of the page if None
+        """
+        self.changed()
+        websocket_dict = WebPage.sockets.get(self.page_id)
+        if not websocket_dict:
+            return self
+        dict_to_send = {"type": "components_update", "data": self.build_components(components, websocket is None)}
         if websocket:
-            WebPage.loop.create_task(websocket.send_json(dict_to_send))
+            await self.send_json(websocket, dict_to_send)
         else:
-            websockets = list(websocket_dict.values())
-            # https://stackoverflow.com/questions/54987361/python-asyncio-handling-exceptions-in-gather-documentation-unclear
-            _results = await asyncio.gather(
-                *[websocket.send_json(dict_to_send) for websocket in websockets],
-                return_exceptions=True,
-            )
-            pass
+            await self.broadcast_json(list(websocket_dict.values()), dict_to_send)
         return self
 
+    def build_components(self, components: typing.Iterable, incremental: bool = True) -> list:
+        """
+        serialize the given components skipping the ones contained in other given components
+
+        Args:
+            components(Iterable): the components to serialize
+            incremental(bool): if True the components may send changes relative to what they sent before
+
+        Returns:
+            list: the dicts of the components
+        """
+        selected = {}
+        for component in components:
+            if not getattr(component, "id", None):
+                logging.warning(f"{component.__class__.__name__} without id can not be updated on page {self.page_id}")
+                continue
+            selected[id(component)] = component
+        data = []
+        token = incremental_build.set(incremental)
+        page_token = build_page.set(self)
+        try:
+            for component in selected.values():
+                if self.has_selected_ancestor(component, selected):
+                    continue
+                with Tracing.span("component.serialize", component_class=component.__class__.__name__):
+                    data.append(component.convert_object_to_dict())
+        finally:
+            build_page.reset(page_token)
+            incremental_build.reset(token)
+        return data
+
+    @staticmethod
+    def has_selected_ancestor(component, selected: dict) -> bool:
+        """
+        check whether one of the containers of the given component is in selected
+        """
+        visited = set()
+        containers = list(getattr(component, "parents", {}).values())
+        while containers:
+            container = containers.pop()
+            if id(container) in visited:
+                continue
+            if id(container) in selected:
+                return True
+            visited.add(id(container))
+            containers.extend(getattr(container, "parents", {}).values())
+        return False
+
+    async def broadcast_json(self, websockets: list, dict_to_send: dict):
+        """
+        send the given dict to all given websockets - the dict is serialized only once
+
+        Args:
+            websockets(list): the websockets to send to
+            dict_to_send(dict): the message to send
+        """
+        try:
+            # same encoding as starlette's send_json
+            text = json.dumps(dict_to_send, separators=(",", ":"), ensure_ascii=False)
+        except (TypeError, ValueError) as ex:
+            # sending failed silently for each websocket before
+            logging.warning(f"page {self.page_id}: message could not be serialized: {ex}")
+            return
+        msg_type = dict_to_send.get("type")
+        # https://stackoverflow.com/questions/54987361/python-asyncio-handling-exceptions-in-gather-documentation-unclear
+        await asyncio.gather(
+            *[self.send_text(websocket, text, msg_type) for websocket in websockets],
+            return_exceptions=True,
+        )
+
+    async def send_text(self, websocket, text: str, msg_type: str = None):
+        """
+        send the given already serialized message to the given websocket of this page
+        """
+        # e.g. streamed points or a component update change what the page shows
+        self.changed()
+        with Tracing.span(
+            "socket.send",
+            page_id=self.page_id,
+            websocket_id=getattr(websocket, "id", None),
+            msg_type=msg_type,
+        ):
+            await websocket.send_text(text)
+
+    async def send_json(self, websocket, dict_to_send: dict):
+        """
+        send the given dict to the given websocket of this page
+
+        Args:
+            websocket: the websocket to send to
+            dict_to_send(dict): the message to send
+        """
+        self.changed()
+        with Tracing.span(
+            "socket.send",
+            page_id=self.page_id,
+            websocket_id=getattr(websocket, "id", None),
+            msg_type=dict_to_send.get("type"),
+        ):
+            await websocket.send_json(dict_to_send)
+
     async def delayed_update(self, delay):
         await asyncio.sleep(delay)
         return await self.update()
 
+    def iter_html(self, indent=0, indent_step=0, format=True, chunk_size=None):
+        """
+        render the components of the page to html in a single pass
+
+        Args:
+            indent(int): the number of blanks the page is indented by
+            indent_step(int): the number of blanks each level of children is indented by
+            format(bool): if True each tag and text is put on its own line
+            chunk_size(int): the minimum number of characters per chunk
+
+        Returns:
+            Iterator[str]: the chunks of the html e.g. for a StreamingResponse
+        """
+        renderer = HtmlRenderer(indent_step=indent_step, format=format, placeholders=False)
+        chunks = renderer.iter_root(renderer.iter_components(self.components, indent + indent_step), indent)
+        return renderer.buffered(chunks, chunk_size)
+
     def to_html(self, indent=0, indent_step=0, format=True):
-        block_indent = " " * indent
-        if format:
-            ws = "\n"
-        else:
-            ws = ""
-        s = f"{block_indent}<div>{ws}"
-        for c in self.components:
-            s = f"{s}{c.to_html(indent + indent_step, indent_step, format)}"
-        s = f"{s}{block_indent}</div>{ws}"
-        return s
+        renderer = HtmlRenderer(indent_step=indent_step, format=format, placeholders=False)
+        return "".join(renderer.iter_root(renderer.iter_components(self.components, indent + indent_step), indent))
 
     def react(self):
         pass
 
     def build_list(self):
         object_list = []
-        self.react()
-        for i, obj in enumerate(self.components):
-            obj.react(self.data)
-            d = obj.convert_object_to_dict()
-            object_list.append(d)
+        with Tracing.span("page.react", page_id=self.page_id):
+            self.react()
+        token = build_page.set(self)
+        try:
+            for i, obj in enumerate(self.components):
+                with Tracing.span("component.react", component_class=obj.__class__.__name__):
+                    obj.react(self.data)
+                with Tracing.span("component.serialize", component_class=obj.__class__.__name__):
+                    d = obj.convert_object_to_dict()
+                object_list.append(d)
+        finally:
+            build_page.reset(token)
+        if PayloadAnalyzer.enabled:
+            PayloadAnalyzer.analyze(self, object_list)
         return object_list
 
     def on(self, event_type, func):
@@ -293,10 +653,17 @@ class WebPage:
             function_data = Dict(event_data)
         else:
             function_data = event_data
-        if inspect.iscoroutinefunction(event_function):
-            event_result = await event_function(function_data)
-        else:
-            event_result = event_function(function_data)
+        with Watchdog.watch(
+            "event",
+            event_function,
+            component_class=self.__class__.__name__,
+            event_type=event_type,
+            route=self.route,
+        ):
+            if inspect.iscoroutinefunction(event_function):
+                event_result = await event_function(function_data)
+            else:
+                event_result = event_function(function_data)
         return event_result
 
     def add_event(self, event):
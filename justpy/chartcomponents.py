@@ -1,8 +1,13 @@
+import asyncio
+import collections
+
 import hjson
 
 from .htmlcomponents import *
 from addict import Dict
 import itertools
+from .downsample import Downsampler
+from .hjsoncache import HjsonCache
 from urllib.parse import quote
 
 
@@ -96,6 +101,18 @@ class HighCharts(JustpyBaseComponent):
         self.tooltip_debounce = 100  # Default is 100 ms
         self.update_animation = True  # Whether to animate changes when chart is updated
         self.update_create = False  # Whether to create new chart on update, if false current chart is updated
+        self.stream_interval = 0.25  # Seconds between the flushes of streamed points
+        self.stream_animation = False  # Whether to animate the points added by a flush
+        self.stream_window = 10000  # Default number of points kept per streamed series
+        self.stream_buffers = {}  # series index -> ring buffer of the flushed points
+        self.stream_pending = {}  # series index -> points appended since the last flush
+        self.stream_appended = {}  # series index -> number of points appended to the stream
+        self.stream_flushed = {}  # series index -> number of points appended up to the last flush
+        self.stream_task = None
+        self.downsample = None  # "lttb" or "minmax" to send large series downsampled to the chart width
+        self.points_per_pixel = 1  # Number of points per pixel of the chart width when downsampling
+        self.visible_range = None  # (min, max) of the zoomed x axis - the full resolution data of this range is downsampled
+        self.downsamplers = {}  # series index -> (series data, Downsampler)
         kwargs["temp"] = False  # Force an id to be assigned to chart
         super().__init__(**kwargs)
         for k, v in kwargs.items():
@@ -126,6 +143,9 @@ class HighCharts(JustpyBaseComponent):
             self.options = Dict(self.options)
         if "series" not in self.options:
             self.options.series = []
+        if self.downsample and "zoom_x" not in self.events:
+            # zooming shows the full resolution data of the visible range
+            self.on("zoom_x", self.handle_zoom)
         for com in ["a", "add_to"]:
             if com in kwargs.keys():
                 kwargs[com].add_component(self)
@@ -196,12 +216,189 @@ class HighCharts(JustpyBaseComponent):
         pass
 
     def load_json(self, options_string):
-        self.options = Dict(hjson.loads(options_string.encode("ascii", "ignore")))
+        self.options = Dict(HjsonCache.get(options_string))
         return self.options
 
+    def target_points(self) -> int:
+        """
+        the number of points of a downsampled series derived from the chart width
+        """
+        width = self.options.chart.width if "chart" in self.options else None
+        if not isinstance(width, (int, float)):
+            # the default width of a chart
+            width = 600
+        return max(int(width * self.points_per_pixel), 3)
+
+    def downsampler(self, series_idx: int):
+        """
+        get the downsampler of the given series - recreated when the data of the series changed
+        """
+        series = self.options.series[series_idx]
+        data = series.get("data")
+        cached = self.downsamplers.get(series_idx)
+        if cached is not None and cached[0] is data and cached[1] == len(data):
+            return cached[2]
+        downsampler = None
+        if isinstance(data, list):
+            downsampler = Downsampler.from_series(
+                data, series.get("pointStart", 0) or 0, series.get("pointInterval", 1) or 1
+            )
+        self.downsamplers[series_idx] = (data, len(data) if data is not None else 0, downsampler)
+        return downsampler
+
+    def downsampled_options(self):
+        """
+        get the options with the data of large series downsampled to the chart width
+        """
+        n = self.target_points()
+        x_min, x_max = self.visible_range if self.visible_range else (None, None)
+        series_list = []
+        for index, series in enumerate(self.options.series):
+            data = series.get("data")
+            if not isinstance(data, list) or len(data) <= n:
+                series_list.append(series)
+                continue
+            downsampler = self.downsampler(index)
+            if downsampler is None:
+                series_list.append(series)
+                continue
+            series = series.copy()
+            series.data = downsampler.points(n, self.downsample, x_min, x_max)
+            series.pop("pointStart", None)
+            series.pop("pointInterval", None)
+            series_list.append(series)
+        options = self.options.copy()
+        options.series = series_list
+        return options
+
+    async def handle_zoom(self, msg):
+        """
+        send the downsampled full resolution data of the zoomed x range
+        or of the whole series after the zoom was reset
+        """
+        if isinstance(msg.min, (int, float)) and isinstance(msg.max, (int, float)):
+            self.visible_range = (msg.min, msg.max)
+        else:
+            self.visible_range = None
+        options = self.downsampled_options()
+        update_dict = {
+            "series": [
+                {"data": series.data} if series is not self.options.series[index] else {}
+                for index, series in enumerate(options.series)
+            ]
+        }
+        return await self.chart_update(update_dict, msg.websocket)
+
+    def stream_buffer(self, series_idx: int):
+        """
+        get the ring buffer of the given series - created from the current data of the series
+        """
+        buffer = self.stream_buffers.get(series_idx)
+        if buffer is None:
+            data = self.options.series[series_idx].get("data", [])
+            buffer = collections.deque(data, maxlen=self.stream_window)
+            self.stream_buffers[series_idx] = buffer
+            self.stream_pending[series_idx] = collections.deque(maxlen=self.stream_window)
+            self.stream_appended[series_idx] = len(buffer)
+            self.stream_flushed[series_idx] = len(buffer)
+        return buffer
+
+    def window(self, n: int, series_idx: int = None):
+        """
+        keep only the last n points of the given series or of all series - the
+        browser shifts the oldest points out when streamed points are added
+
+        Args:
+            n(int): the number of points to keep
+            series_idx(int): the index of the series - None for all series
+        """
+        indices = range(len(self.options.series)) if series_idx is None else [series_idx]
+        for index in indices:
+            self.stream_buffer(index)
+            buffer = collections.deque(self.stream_buffers[index], maxlen=n)
+            self.stream_buffers[index] = buffer
+            self.stream_pending[index] = collections.deque(self.stream_pending[index], maxlen=n)
+
+    def append(self, series_idx: int, points: list):
+        """
+        append points to the given series - the points are buffered and sent to
+        the browser as one batch every stream_interval seconds
+
+        Args:
+            series_idx(int): the index of the series
+            points(list): the points to add e.g. [y1, y2] or [[x1, y1], [x2, y2]]
+        """
+        self.stream_buffer(series_idx)
+        # bounded by the window - points that would be shifted out right away are dropped
+        self.stream_pending[series_idx].extend(points)
+        self.stream_appended[series_idx] += len(points)
+        if self.stream_task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # no event loop - the points are sent by the next flush
+                return
+            self.stream_task = loop.create_task(self.delayed_flush())
+
+    async def delayed_flush(self):
+        await asyncio.sleep(self.stream_interval)
+        self.stream_task = None
+        await self.flush()
+
+    async def flush(self, page=None):
+        """
+        send the points appended since the last flush to the pages of the chart
+
+        Args:
+            page(WebPage): the page to send to - default: all pages the chart has been added to
+        """
+        series_list = []
+        for index, pending in self.stream_pending.items():
+            if not pending:
+                continue
+            buffer = self.stream_buffers[index]
+            buffer.extend(pending)
+            self.stream_flushed[index] = self.stream_appended[index]
+            series_list.append(
+                {
+                    "index": index,
+                    "points": list(pending),
+                    "end": self.stream_appended[index],
+                    "window": buffer.maxlen,
+                }
+            )
+            pending.clear()
+        if not series_list:
+            return
+        dict_to_send = {
+            "type": "chart_stream",
+            "id": self.id,
+            "data": {"series": series_list, "animation": self.stream_animation},
+        }
+        pages = [page] if page is not None else list(self.get_pages().values())
+        for wp in pages:
+            for websocket in list(WebPage.sockets.get(wp.page_id, {}).values()):
+                try:
+                    await wp.send_json(websocket, dict_to_send)
+                except Exception as ex:
+                    logging.warning(f"could not stream points of {self}: {ex}")
+
+    def streamed_options(self, options):
+        """
+        get the given options with the data of the streamed series taken from their ring buffers
+        """
+        if not self.stream_buffers:
+            return options
+        options = options.copy()
+        options.series = list(options.series)
+        for index, buffer in self.stream_buffers.items():
+            series = options.series[index].copy()
+            series.data = list(buffer)
+            options.series[index] = series
+        return options
+
     def load_json_from_file(self, file_name):
-        with open(file_name, "r") as f:
-            self.options = Dict(hjson.loads(f.read().encode("ascii", "ignore")))
+        self.options = Dict(HjsonCache.get_file(file_name))
         return self.options
 
     def convert_object_to_dict(self):
@@ -215,7 +412,8 @@ class HighCharts(JustpyBaseComponent):
         d["classes"] = self.classes
         d["style"] = self.style
         d["event_propagation"] = self.event_propagation
-        d["def"] = self.options
+        # the data of streamed series is only copied from the ring buffers when the whole chart is sent
+        d["def"] = self.streamed_options(self.downsampled_options() if self.downsample else self.options)
         d["events"] = self.events
         d["tooltip_fixed"] = self.tooltip_fixed
         d["tooltip_x"] = self.tooltip_x
@@ -223,6 +421,8 @@ class HighCharts(JustpyBaseComponent):
         d["tooltip_debounce"] = self.tooltip_debounce
         d["update_animation"] = self.update_animation
         d["update_create"] = self.update_create
+        # number of streamed points included in the series data
+        d["stream_counts"] = self.stream_flushed
         return d
 
 
@@ -0,0 +1,64 @@
+'''
+Created on 2026-10-19
+
+columnar transport of pandas DataFrames - the column names plus one array per column
+instead of one dict per row that repeats every column name
+'''
+from .frameconverter import FrameConverter
+
+try:
+    from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_integer_dtype
+
+    _has_pandas = True
+except:
+    _has_pandas = False
+
+
+class Columnar:
+    """
+    encode DataFrames in the columnar format
+    {"columns": [...], "dtypes": [...], "values": [[...], ...], "length": n}
+    which the browser turns back into a list of row objects
+    """
+
+    @staticmethod
+    def dtype_name(series) -> str:
+        """
+        get the name of the JSON type of the given series
+        """
+        if is_bool_dtype(series):
+            return "boolean"
+        if is_integer_dtype(series):
+            return "integer"
+        if is_float_dtype(series):
+            return "number"
+        if is_datetime64_any_dtype(series):
+            return "datetime"
+        return "object"
+
+    @classmethod
+    def from_frame(cls, df) -> dict:
+        """
+        encode the given DataFrame
+
+        Args:
+            df: the pandas DataFrame to encode
+
+        Returns:
+            dict: the columnar payload
+        """
+        assert _has_pandas, f"Pandas not installed, cannot encode frame"
+        return {
+            "columns": [str(col) for col in df.columns],
+            "dtypes": [cls.dtype_name(df.iloc[:, i]) for i in range(len(df.columns))],
+            "values": FrameConverter.columns(df),
+            "length": len(df),
+        }
+
+    @staticmethod
+    def to_records(columnar: dict) -> list:
+        """
+        decode the given columnar payload to a list of dicts - the same as the browser does
+        """
+        columns = columnar["columns"]
+        return [dict(zip(columns, row)) for row in zip(*columnar["values"])]
@@ -0,0 +1,156 @@
+'''
+Created on 2026-10-19
+
+downsampling of large chart series with the largest triangle three buckets (LTTB)
+and the min/max bucket algorithms
+'''
+try:
+    import numpy as np
+
+    _has_numpy = True
+except:
+    _has_numpy = False
+
+
+class Downsampler:
+    """
+    full resolution x and y values of a chart series that can be downsampled
+    to a given number of points, optionally for a visible x range only
+    """
+
+    methods = ["lttb", "minmax"]
+
+    def __init__(self, x, y):
+        """
+        constructor
+
+        Args:
+            x: the x values as numpy array
+            y: the y values as numpy array - NaN for null values
+        """
+        self.x = x
+        self.y = y
+        self.is_sorted = bool(len(x) < 2 or np.all(x[1:] >= x[:-1]))
+
+    @classmethod
+    def from_series(cls, data: list, point_start: float = 0, point_interval: float = 1) -> "Downsampler":
+        """
+        create a downsampler for the data of a series - a list of y values or of [x, y] pairs
+
+        Returns:
+            Downsampler: the downsampler or None if the data has another format
+        """
+        if not _has_numpy or not data:
+            return None
+        first = data[0]
+        try:
+            if isinstance(first, (list, tuple)):
+                if len(first) != 2:
+                    return None
+                values = np.array(data, dtype=float)
+                if values.ndim != 2 or values.shape[1] != 2:
+                    return None
+                return cls(values[:, 0], values[:, 1])
+            if first is None or isinstance(first, (int, float)):
+                y = np.array(data, dtype=float)
+                if y.ndim != 1:
+                    return None
+                x = point_start + point_interval * np.arange(len(y), dtype=float)
+                return cls(x, y)
+        except (TypeError, ValueError):
+            # e.g. string x values or dict points
+            return None
+        return None
+
+    @staticmethod
+    def lttb_indices(x, y, n: int):
+        """
+        select n points with the largest triangle three buckets algorithm - the first and
+        last point are kept, from each bucket in between the point forming the largest
+        triangle with the point selected from the previous bucket and the average
+        of the next bucket is selected
+
+        Returns:
+            numpy array: the indices of the selected points
+        """
+        size = len(x)
+        if n >= size or n < 3:
+            return np.arange(size)
+        edges = np.linspace(1, size - 1, n - 1).astype(int)
+        # averages of all buckets at once
+        sums_x = np.add.reduceat(x[1 : size - 1], edges[:-1] - 1)
+        sums_y = np.add.reduceat(y[1 : size - 1], edges[:-1] - 1)
+        counts = np.diff(edges)
+        avg_x = np.append(sums_x / counts, x[-1])
+        avg_y = np.append(sums_y / counts, y[-1])
+        indices = np.empty(n, dtype=int)
+        indices[0] = 0
+        indices[-1] = size - 1
+        a = 0
+        for i in range(n - 2):
+            start, end = edges[i], edges[i + 1]
+            # twice the area of the triangles - vectorized over the bucket
+            areas = np.abs(
+                (x[a] - avg_x[i + 1]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a])
+            )
+            a = start + int(np.argmax(areas))
+            indices[i + 1] = a
+        return indices
+
+    @staticmethod
+    def min_max_indices(y, n: int):
+        """
+        select the minimum and the maximum of n // 2 buckets - keeps all peaks
+
+        Returns:
+            numpy array: the sorted indices of the selected points
+        """
+        size = len(y)
+        buckets = max(n // 2, 1)
+        if n >= size:
+            return np.arange(size)
+        bucket_size = -(-size // buckets)
+        padded = np.full(buckets * bucket_size, np.nan)
+        padded[:size] = y
+        rows = padded.reshape(buckets, bucket_size)
+        offsets = np.arange(buckets) * bucket_size
+        mins = offsets + np.argmin(np.where(np.isnan(rows), np.inf, rows), axis=1)
+        maxs = offsets + np.argmax(np.where(np.isnan(rows), -np.inf, rows), axis=1)
+        indices = np.unique(np.concatenate([mins, maxs]))
+        return indices[indices < size]
+
+    def points(self, n: int, method: str = "lttb", x_min: float = None, x_max: float = None) -> list:
+        """
+        get about n points of the series as JSON compatible [x, y] pairs
+
+        Args:
+            n(int): the number of points
+            method(str): lttb or minmax
+            x_min(float): the start of the visible x range
+            x_max(float): the end of the visible x range
+
+        Returns:
+            list: the [x, y] pairs with None for null y values
+        """
+        x, y = self.x, self.y
+        if x_min is not None and x_max is not None:
+            if self.is_sorted:
+                # include a point on either side so that lines reach the borders
+                start = max(int(np.searchsorted(x, x_min, side="left")) - 1, 0)
+                end = int(np.searchsorted(x, x_max, side="right")) + 1
+                x, y = x[start:end], y[start:end]
+            else:
+                mask = (x >= x_min) & (x <= x_max)
+                x, y = x[mask], y[mask]
+        if method == "minmax":
+            indices = self.min_max_indices(y, n)
+        else:
+            # LTTB needs numbers - null values are left out
+            valid = ~np.isnan(y)
+            if not valid.all():
+                x, y = x[valid], y[valid]
+            indices = self.lttb_indices(x, y, n)
+        xs = x[indices].tolist()
+        ys = y[indices]
+        ys = np.where(np.isnan(ys), None, ys).tolist()
+        return [list(pair) for pair in zip(xs, ys)]
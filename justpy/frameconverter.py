@@ -0,0 +1,134 @@
+'''
+Created on 2026-10-19
+
+vectorized conversion of pandas DataFrames to JSON compatible python values
+shared by all pandas integrations
+'''
+import datetime
+import math
+import sys
+
+try:
+    import numpy as np
+    import pandas as pd
+    from pandas.api.types import (
+        infer_dtype,
+        is_bool_dtype,
+        is_datetime64_any_dtype,
+        is_float_dtype,
+        is_integer_dtype,
+        is_timedelta64_dtype,
+    )
+
+    _has_pandas = True
+except:
+    _has_pandas = False
+
+
+class FrameConverter:
+    """
+    convert DataFrame columns to lists of JSON compatible values:
+    NaN, NaT and None become None, inf becomes the largest float
+    and timestamps become strings in the str(Timestamp) format
+    """
+
+    # infer_dtype results of object columns that need no conversion besides nulls
+    plain_object_types = {"string", "empty", "boolean", "integer", "bytes"}
+
+    @staticmethod
+    def json_value(value):
+        """
+        convert a single value of an object column
+        """
+        if isinstance(value, float):
+            if math.isinf(value):
+                return sys.float_info.max if value > 0 else -sys.float_info.max
+            return value
+        if isinstance(value, (pd.Timestamp, datetime.date, datetime.time)):
+            return str(value)
+        if isinstance(value, np.generic):
+            return FrameConverter.json_value(value.item())
+        return value
+
+    @classmethod
+    def float_values(cls, values) -> list:
+        """
+        convert a float numpy array
+        """
+        values = np.clip(values, -sys.float_info.max, sys.float_info.max)
+        result = values.tolist()
+        for i in np.flatnonzero(np.isnan(values)):
+            result[i] = None
+        return result
+
+    @staticmethod
+    def datetime_values(series) -> list:
+        if series.dt.tz is not None:
+            return series.astype(object).map(str).tolist()
+        # same format as str(Timestamp) but vectorized
+        has_fraction = bool((series.dt.microsecond.fillna(0) != 0).any())
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if has_fraction else "%Y-%m-%d %H:%M:%S"
+        return series.dt.strftime(fmt).tolist()
+
+    @classmethod
+    def column_values(cls, series) -> list:
+        """
+        get the JSON compatible values of the given series
+
+        Args:
+            series: the pandas Series to convert
+
+        Returns:
+            list: the converted values
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = cls.column_values(pd.Series(series.cat.categories))
+            # code -1 is a missing value and picks the trailing None
+            lookup = np.array(categories + [None], dtype=object)
+            return lookup[series.cat.codes.to_numpy()].tolist()
+        if is_float_dtype(series):
+            return cls.float_values(series.to_numpy(dtype=float))
+        if is_bool_dtype(series) or is_integer_dtype(series):
+            if series.hasnans:
+                # nullable extension types
+                return series.astype(object).where(series.notna(), None).tolist()
+            return series.tolist()
+        nulls = series.isna().to_numpy()
+        if is_datetime64_any_dtype(series):
+            result = cls.datetime_values(series)
+        elif is_timedelta64_dtype(series):
+            result = series.astype(str).tolist()
+        else:
+            result = series.tolist()
+            if infer_dtype(series, skipna=True) not in cls.plain_object_types:
+                result = [cls.json_value(value) for value in result]
+        for i in np.flatnonzero(nulls):
+            result[i] = None
+        return result
+
+    @classmethod
+    def columns(cls, df) -> list:
+        """
+        get the converted values of all columns of the given frame
+        """
+        assert _has_pandas, f"Pandas not installed, cannot convert frame"
+        return [cls.column_values(df.iloc[:, i]) for i in range(len(df.columns))]
+
+    @classmethod
+    def records(cls, df) -> list:
+        """
+        convert the given frame to a list of dicts - like df.to_dict("records")
+        """
+        names = list(df.columns)
+        if not names:
+            return [{} for _ in range(len(df))]
+        return [dict(zip(names, row)) for row in zip(*cls.columns(df))]
+
+    @classmethod
+    def rows(cls, df) -> list:
+        """
+        convert the given frame to a list of lists - like df.to_numpy().tolist()
+        """
+        if len(df.columns) == 0:
+            return [[] for _ in range(len(df))]
+        return [list(row) for row in zip(*cls.columns(df))]
@@ -1,8 +1,16 @@
+import collections
 import datetime
+import json
+import operator
+import threading
+import typing
 
 import hjson
 
 from .htmlcomponents import *
+from .columnar import Columnar
+from .frameconverter import FrameConverter
+from .hjsoncache import HjsonCache
 from addict import Dict
 
 try:
@@ -16,6 +24,347 @@ except:
     _has_pandas = False
 
 
+class GridDatasource:
+    """
+    rows of a pandas DataFrame or list of dicts served block by block
+    to an AgGrid with the infinite or serverSide row model
+
+    sorted and filtered views and converted row blocks are cached
+    with LRU eviction
+    """
+
+    comparisons = {
+        "equals": operator.eq,
+        "notEqual": operator.ne,
+        "lessThan": operator.lt,
+        "lessThanOrEqual": operator.le,
+        "greaterThan": operator.gt,
+        "greaterThanOrEqual": operator.ge,
+    }
+    # the operators handled besides the comparisons - other operators e.g. of custom filters do not filter
+    operators = frozenset(["blank", "notBlank", "inRange", "contains", "notContains", "startsWith", "endsWith"]) | frozenset(comparisons)
+
+    def __init__(self, data, max_blocks: int = 50, max_views: int = 4, row_converter=None):
+        """
+        constructor
+
+        Args:
+            data: a pandas DataFrame or a list of dicts
+            max_blocks(int): the number of row blocks to keep in the cache
+            max_views(int): the number of sorted/filtered views to keep in the cache
+            row_converter: optional function to convert rows; signature: (rowIndex, colIndex, colKey, cellValue) -> newValue
+        """
+        self.data = data
+        self.is_frame = _has_pandas and isinstance(data, pd.DataFrame)
+        self.max_blocks = max_blocks
+        self.max_views = max_views
+        self.row_converter = row_converter
+        self.blocks = collections.OrderedDict()
+        self.views = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.data)
+
+    def invalidate(self):
+        """
+        clear the caches e.g. after the data has been modified
+        """
+        with self.lock:
+            self.blocks.clear()
+            self.views.clear()
+
+    @staticmethod
+    def model_key(sort_model, filter_model) -> str:
+        return json.dumps([sort_model or [], filter_model or {}], sort_keys=True, default=str)
+
+    @staticmethod
+    def cache_get(cache: collections.OrderedDict, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def cache_put(cache: collections.OrderedDict, key, value, max_size: int):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def conditions(model: dict) -> typing.Tuple[str, list]:
+        """
+        get the operator and the list of conditions of the given column filter model
+        """
+        if "conditions" in model:
+            return model.get("operator", "AND"), model["conditions"]
+        if "condition1" in model:
+            conditions = [model["condition1"]]
+            if model.get("condition2"):
+                conditions.append(model["condition2"])
+            return model.get("operator", "AND"), conditions
+        return "AND", [model]
+
+    def condition_mask(self, series, filter_type: str, condition: dict):
+        """
+        get the boolean mask of the given column series for the given filter condition
+        """
+        op = condition.get("type", "equals")
+        if filter_type == "set":
+            values = [str(v) for v in condition.get("values", []) if v is not None]
+            mask = series.astype(str).isin(values)
+            if None in condition.get("values", []):
+                mask = mask | series.isna()
+            return mask
+        if op not in self.operators:
+            return pd.Series(True, index=series.index)
+        if op == "blank":
+            return series.isna() | (series.astype(str) == "")
+        if op == "notBlank":
+            return ~(series.isna() | (series.astype(str) == ""))
+        if filter_type == "number" or filter_type == "date":
+            if filter_type == "number":
+                values = pd.to_numeric(series, errors="coerce")
+                low, high = condition.get("filter"), condition.get("filterTo")
+            else:
+                values = pd.to_datetime(series, errors="coerce")
+                low, high = pd.to_datetime(condition.get("dateFrom")), pd.to_datetime(condition.get("dateTo"))
+            if op == "inRange":
+                return (values > low) & (values < high)
+            return self.comparisons[op](values, low).fillna(False).astype(bool)
+        values = series.fillna("").astype(str).str.lower()
+        text = str(condition.get("filter", "")).lower()
+        if op == "contains":
+            return values.str.contains(text, regex=False)
+        if op == "notContains":
+            return ~values.str.contains(text, regex=False)
+        if op == "startsWith":
+            return values.str.startswith(text)
+        if op == "endsWith":
+            return values.str.endswith(text)
+        return self.comparisons[op](values, text)
+
+    def condition_matches(self, value, filter_type: str, condition: dict) -> bool:
+        """
+        check whether the given cell value matches the given filter condition
+        """
+        op = condition.get("type", "equals")
+        if filter_type == "set":
+            values = condition.get("values", [])
+            return value in values or str(value) in [str(v) for v in values if v is not None]
+        if op not in self.operators:
+            return True
+        is_blank = value is None or value == ""
+        if op == "blank":
+            return is_blank
+        if op == "notBlank":
+            return not is_blank
+        if filter_type == "number" or filter_type == "date":
+            if is_blank:
+                return False
+            if filter_type == "number":
+                low, high = condition.get("filter"), condition.get("filterTo")
+            else:
+                value = str(value)
+                low, high = condition.get("dateFrom"), condition.get("dateTo")
+                low = str(low)[: len(value)] if low else low
+                high = str(high)[: len(value)] if high else high
+            try:
+                if op == "inRange":
+                    return low < value < high
+                return self.comparisons[op](value, low)
+            except TypeError:
+                return False
+        value = "" if value is None else str(value).lower()
+        text = str(condition.get("filter", "")).lower()
+        if op == "contains":
+            return text in value
+        if op == "notContains":
+            return text not in value
+        if op == "startsWith":
+            return value.startswith(text)
+        if op == "endsWith":
+            return value.endswith(text)
+        return self.comparisons[op](value, text)
+
+    def frame_view(self, sort_model: list, filter_model: dict):
+        """
+        get the positions of the rows of the DataFrame for the given sort and filter model
+        """
+        df = self.data
+        positions = np.arange(len(df))
+        if filter_model:
+            mask = np.ones(len(df), dtype=bool)
+            for col_id, model in filter_model.items():
+                bool_op, conditions = self.conditions(model)
+                filter_type = model.get("filterType", "text")
+                masks = [self.condition_mask(df[col_id], filter_type, c).to_numpy(dtype=bool) for c in conditions]
+                combined = np.logical_or.reduce(masks) if bool_op == "OR" else np.logical_and.reduce(masks)
+                mask &= combined
+            positions = positions[mask]
+        if sort_model:
+            columns = [s["colId"] for s in sort_model]
+            view = df[columns].iloc[positions].reset_index(drop=True)
+            order = view.sort_values(
+                by=columns,
+                ascending=[s.get("sort", "asc") == "asc" for s in sort_model],
+                kind="mergesort",
+                na_position="last",
+            ).index.to_numpy()
+            positions = positions[order]
+        return positions
+
+    def lod_view(self, sort_model: list, filter_model: dict) -> list:
+        """
+        get the positions of the rows of the list of dicts for the given sort and filter model
+        """
+        rows = self.data
+        positions = range(len(rows))
+        if filter_model:
+            for col_id, model in filter_model.items():
+                bool_op, conditions = self.conditions(model)
+                filter_type = model.get("filterType", "text")
+                combine = any if bool_op == "OR" else all
+                positions = [
+                    i
+                    for i in positions
+                    if combine(self.condition_matches(rows[i].get(col_id), filter_type, c) for c in conditions)
+                ]
+        positions = list(positions)
+        # stable sorts from the least to the most significant column, None last
+        for sort in reversed(sort_model or []):
+            col_id = sort["colId"]
+            descending = sort.get("sort", "asc") == "desc"
+            present = [i for i in positions if rows[i].get(col_id) is not None]
+            missing = [i for i in positions if rows[i].get(col_id) is None]
+            present.sort(key=lambda i: rows[i][col_id], reverse=descending)
+            positions = present + missing
+        return positions
+
+    def get_view(self, sort_model: list, filter_model: dict):
+        key = self.model_key(sort_model, filter_model)
+        view = self.cache_get(self.views, key)
+        if view is None:
+            if self.is_frame:
+                view = self.frame_view(sort_model, filter_model)
+            else:
+                view = self.lod_view(sort_model, filter_model)
+            self.cache_put(self.views, key, view, self.max_views)
+        return view
+
+    def convert_rows(self, positions) -> list:
+        """
+        get the JSON compatible rows at the given positions
+        """
+        if self.is_frame:
+            rows = FrameConverter.records(self.data.iloc[positions])
+            if not callable(self.row_converter):
+                return rows
+        else:
+            rows = [dict(self.data[i]) for i in positions]
+        for position, row_dict in zip(positions, rows):
+            for col_idx, (col_key, val) in enumerate(row_dict.items()):
+                if callable(self.row_converter):
+                    val = self.row_converter(int(position), col_idx, col_key, val)
+                    row_dict[col_key] = val
+                if _has_pandas and isinstance(val, Timestamp):
+                    row_dict[col_key] = str(val)
+        return rows
+
+    def get_rows(self, start_row: int, end_row: int, sort_model: list = None, filter_model: dict = None) -> typing.Tuple[list, int]:
+        """
+        get the block of rows for the given request
+
+        Args:
+            start_row(int): the index of the first row of the block
+            end_row(int): the index after the last row of the block
+            sort_model(list): the AgGrid sort model e.g. [{"colId": "age", "sort": "desc"}]
+            filter_model(dict): the AgGrid filter model keyed by column id
+
+        Returns:
+            tuple: the rows of the block and the number of rows of the filtered view
+        """
+        with self.lock:
+            key = (self.model_key(sort_model, filter_model), start_row, end_row)
+            cached = self.cache_get(self.blocks, key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            view = self.get_view(sort_model, filter_model)
+            result = self.convert_rows(view[start_row:end_row]), len(view)
+            self.cache_put(self.blocks, key, result, self.max_blocks)
+            return result
+
+
+class GridRowCache:
+    """
+    the converted rowData of an AgGrid
+
+    rows are only converted again if they have been replaced or modified
+    since the last serialization
+    """
+
+    def __init__(self):
+        self.converter = None
+        # list of (source row, snapshot of the source row, converted row)
+        self.entries = []
+        self.conversions = 0
+
+    @staticmethod
+    def convert_row(row_idx: int, row_dict: dict, converter) -> dict:
+        """
+        convert the given row - returns the row itself if nothing needs to be converted
+        """
+        converted = row_dict
+        for col_idx, (col_key, val) in enumerate(row_dict.items()):
+            new_val = val
+            if converter is not None:
+                new_val = converter(row_idx, col_idx, col_key, val)
+            if _has_pandas and isinstance(new_val, Timestamp):
+                new_val = str(new_val)
+            if new_val is not val:
+                if converted is row_dict:
+                    converted = dict(row_dict)
+                converted[col_key] = new_val
+        return converted
+
+    def get_rows(self, rows: list, converter=None) -> list:
+        """
+        get the converted version of the given rows
+
+        Args:
+            rows(list): the rowData of the grid
+            converter: optional function to convert row data; signature: (rowIndex, colIndex, colKey, cellValue) -> newValue
+        """
+        if not callable(converter):
+            converter = None
+        if converter is not self.converter:
+            self.converter = converter
+            self.entries = []
+        entries = self.entries
+        cached_count = len(entries)
+        new_entries = []
+        result = []
+        for row_idx, row_dict in enumerate(rows):
+            if row_idx < cached_count:
+                entry = entries[row_idx]
+                # dict comparison is done in C and checks identity of the values first
+                if entry[0] is row_dict and entry[1] == row_dict:
+                    new_entries.append(entry)
+                    result.append(entry[2])
+                    continue
+            converted = self.convert_row(row_idx, row_dict, converter)
+            self.conversions += 1
+            new_entries.append((row_dict, dict(row_dict), converted))
+            result.append(converted)
+        self.entries = new_entries
+        return result
+
+
 class AgGrid(JustpyBaseComponent):
     """
     
@@ -59,6 +408,17 @@ class AgGrid(JustpyBaseComponent):
         self.theme = "ag-theme-balham"  # one of ag-theme-balham, ag-theme-balham-dark, ag-theme-material
         self.html_columns = []
         self.row_data_converter = None  # optional function to convert row data; signature: (rowIndex, colIndex, colKey, cellValue) -> newValue
+        self.row_model = None  # None for client side rows, "infinite" or "serverSide" to serve row blocks from a GridDatasource
+        self.block_size = 100  # number of rows per block requested by the infinite/serverSide row model
+        self.max_blocks = 50  # number of row blocks cached by the datasource
+        self.datasource = None
+        self.row_cache = GridRowCache()
+        self.row_id_field = None  # field with a unique row id - if set, row changes are sent as transactions
+        # page_id -> row id -> snapshot of the rows last sent to all websockets of the page
+        self.sent_rows = {}
+        self.row_versions = {}  # page_id -> version of the rows last sent to the page
+        self.row_columns = None  # columnar payload of the rows if loaded with columnar=True
+        self.row_columns_version = 0
         kwargs["temp"] = False
         super().__init__(**kwargs)
         for k, v in kwargs.items():
@@ -106,20 +466,20 @@ class AgGrid(JustpyBaseComponent):
         pass
 
     def load_json(self, options_string):
-        self.options = Dict(hjson.loads(options_string.encode("ascii", "ignore")))
+        self.options = Dict(HjsonCache.get(options_string))
         return self.options
 
     def load_json_from_file(self, file_name):
-        with open(file_name, "r") as f:
-            self.options = Dict(hjson.loads(f.read().encode("ascii", "ignore")))
+        self.options = Dict(HjsonCache.get_file(file_name))
         return self.options
 
-    def load_pandas_frame(self, df):
+    def load_pandas_frame(self, df, columnar: bool = False):
         """
         load the given pandas dataframe
         
         Args:
             df: the dataframe to load
+            columnar(bool): if True send the rows as one array per column
         """
         assert _has_pandas, f"Pandas not installed, cannot load frame"
         columnDefs = []
@@ -131,12 +491,18 @@ class AgGrid(JustpyBaseComponent):
             else:
                 col_filter = True  # Use default filter
             columnDefs.append(Dict({"field": i, "filter": col_filter}))
-        # Change NaN and similar to None for JSON compatibility
-        lod = (
-            df.replace([np.inf, -np.inf], [sys.float_info.max, -sys.float_info.max])
-            .where(pd.notnull(df), None)
-            .to_dict("records")
-        )
+        if self.row_model:
+            # the rows are converted block by block when requested
+            self.load_datasource(df, columnDefs)
+            return
+        if columnar:
+            self.options.columnDefs = columnDefs
+            self.options.rowData = []
+            self.row_columns = Columnar.from_frame(df)
+            self.row_columns_version += 1
+            return
+        # NaN, inf and timestamps are converted once at load time for JSON compatibility
+        lod = FrameConverter.records(df)
         self.load_lod(lod=lod,columnDefs=columnDefs)
         
     def load_lod(self,lod:list,columnDefs:list=None):
@@ -160,9 +526,155 @@ class AgGrid(JustpyBaseComponent):
                     else:
                         col_filter = True  # Use default filter
                     columnDefs.append(Dict({'field': key, "filter": col_filter}))
+        self.row_columns = None
+        if self.row_model:
+            self.load_datasource(lod, columnDefs)
+            return
         self.options.columnDefs=columnDefs
         self.options.rowData=lod
 
+    def load_datasource(self, data, columnDefs: list):
+        """
+        serve the rows of the given data block by block instead of sending
+        them with the grid options - needs the row_model to be set and websockets
+
+        Args:
+            data: a pandas DataFrame or a list of dicts
+            columnDefs(list): a list of column definitions
+        """
+        if not self.row_model:
+            self.row_model = "infinite"
+        self.options.columnDefs = columnDefs
+        self.options.rowData = []
+        self.datasource = GridDatasource(data, max_blocks=self.max_blocks, row_converter=self.row_data_converter)
+        self.on("getRows", self.handle_get_rows)
+
+    async def handle_get_rows(self, msg):
+        """
+        send the block of rows requested by the datasource of the grid
+        """
+        if not msg.websocket:
+            logging.warning(f"{self} needs websockets to serve row blocks")
+            return True
+        try:
+            rows, last_row = self.datasource.get_rows(
+                int(msg.startRow), int(msg.endRow), msg.sortModel, msg.filterModel
+            )
+            data = {"request_id": msg.request_id, "rows": rows, "last_row": last_row}
+        except Exception as ex:
+            logging.error(f"{self} could not get rows {msg.startRow}-{msg.endRow}: {ex}", exc_info=True)
+            # the browser fails the request instead of waiting for the rows
+            data = {"request_id": msg.request_id, "failed": True}
+        dict_to_send = {"type": "grid_rows", "id": self.id, "data": data}
+        await msg.page.send_json(msg.websocket, dict_to_send)
+        # no page update needed
+        return True
+
+    async def refresh_datasource(self, page):
+        """
+        clear the cached row blocks on the server and in the browser
+        e.g. after the data of the datasource has been modified
+        """
+        self.datasource.invalidate()
+        if self.row_model == "serverSide":
+            await self.run_api("refreshServerSide({purge: true})", page)
+        else:
+            await self.run_api("purgeInfiniteCache()", page)
+
+    def row_id(self, row_dict: dict) -> str:
+        return str(row_dict.get(self.row_id_field))
+
+    def set_sent_rows(self, page_id: int, rows: list):
+        """
+        remember the given rows as sent to the websockets of the given page
+        """
+        # drop the rows sent to pages that are gone
+        for gone_id in [key for key in self.sent_rows if key not in WebPage.instances]:
+            self.sent_rows.pop(gone_id, None)
+            self.row_versions.pop(gone_id, None)
+        self.sent_rows[page_id] = {self.row_id(row_dict): dict(row_dict) for row_dict in rows}
+        self.row_versions[page_id] = self.row_versions.get(page_id, 0) + 1
+
+    def row_transaction(self, page_id: int, rows: list) -> dict:
+        """
+        get the add/update/remove transaction from the rows last sent to the
+        given page to the given rows and remember the given rows as sent
+
+        Args:
+            page_id(int): the id of the page the rows were sent to
+            rows(list): the converted rowData
+
+        Returns:
+            dict: the version and the AgGrid transaction - the version only
+            changes if the transaction is not empty
+        """
+        sent_rows = self.sent_rows.get(page_id) or {}
+        new_rows = {}
+        add = []
+        update = []
+        for row_dict in rows:
+            row_id = self.row_id(row_dict)
+            new_rows[row_id] = dict(row_dict)
+            sent_row = sent_rows.get(row_id)
+            if sent_row is None:
+                add.append(row_dict)
+            elif sent_row != row_dict:
+                update.append(row_dict)
+        remove = [
+            {self.row_id_field: sent_row.get(self.row_id_field)}
+            for row_id, sent_row in sent_rows.items()
+            if row_id not in new_rows
+        ]
+        self.sent_rows[page_id] = new_rows
+        transaction = {}
+        for key, value in [("add", add), ("update", update), ("remove", remove)]:
+            if value:
+                transaction[key] = value
+        if transaction:
+            self.row_versions[page_id] = self.row_versions.get(page_id, 0) + 1
+        return {"version": self.row_versions.get(page_id, 0), "transaction": transaction}
+
+    async def update_rows(self, page):
+        """
+        send the changes of the rowData since the last update as transaction
+        to the browser instead of updating the whole grid - needs row_id_field
+
+        Args:
+            page(WebPage): the page with the grid
+        """
+        if not self.row_id_field or page.page_id not in self.sent_rows:
+            await page.update()
+            return
+        rows = self.row_cache.get_rows(self.options.rowData, self.row_data_converter)
+        row_transaction = self.row_transaction(page.page_id, rows)
+        if not row_transaction["transaction"]:
+            return
+        dict_to_send = {"type": "grid_transaction", "id": self.id, "data": row_transaction}
+        for websocket in list(WebPage.sockets.get(page.page_id, {}).values()):
+            await page.send_json(websocket, dict_to_send)
+
+    async def handle_resync_rows(self, msg):
+        """
+        send all rows to a browser that missed a row transaction or recreated the grid
+        """
+        if not msg.websocket:
+            return True
+        page = msg.page
+        rows = self.row_cache.get_rows(self.options.rowData, self.row_data_converter)
+        if page.page_id in self.sent_rows:
+            # the other websockets of the page miss this version and resync as well
+            self.row_transaction(page.page_id, rows)
+        else:
+            self.set_sent_rows(page.page_id, rows)
+        dict_to_send = {
+            "type": "grid_transaction",
+            "id": self.id,
+            "data": {"version": self.row_versions[page.page_id], "rows": rows},
+        }
+        await page.send_json(msg.websocket, dict_to_send)
+        # no page update needed
+        return True
+
     async def run_api(self, command, page):
         await page.run_javascript(f"""cached_grid_def['{self.grid_id}'].api.{command}""")
 
@@ -191,15 +703,42 @@ class AgGrid(JustpyBaseComponent):
         d["show"] = self.show
         d["classes"] = self.classes + " " + self.theme
         d["style"] = self.style
-        options = self.options.deepcopy()
-        rows = options.get("rowData", [])
-        for row_idx, row_dict in enumerate(rows):
-            for col_idx, (col_key, val) in enumerate(row_dict.items()):
-                if callable(self.row_data_converter):
-                    val = self.row_data_converter(row_idx, col_idx, col_key, val)
-                    row_dict[col_key] = val
-                if _has_pandas and isinstance(val, Timestamp):
-                    row_dict[col_key] = str(val)
+        # shallow copy - the rows are taken from the row cache
+        options = Dict()
+        for key, value in self.options.items():
+            if key != "rowData":
+                options[key] = value
+        if self.row_model:
+            options.rowModelType = self.row_model
+            options.cacheBlockSize = self.block_size
+        elif self.row_columns is not None:
+            # the browser rebuilds the rowData
+            d["row_columns"] = self.row_columns
+            d["row_columns_version"] = self.row_columns_version
+        elif "rowData" in self.options:
+            rows = self.row_cache.get_rows(self.options.rowData, self.row_data_converter)
+            page = build_page.get()
+            page_id = page.page_id if page is not None else None
+            if not self.row_id_field or page is None:
+                # no baseline is kept for conversions outside of a page build e.g. by to_html
+                options.rowData = rows
+            elif page_id not in self.sent_rows:
+                options.rowData = rows
+                self.set_sent_rows(page_id, rows)
+            elif incremental_build.get():
+                row_transaction = self.row_transaction(page_id, rows)
+                if row_transaction["transaction"]:
+                    d["row_transaction"] = row_transaction
+            else:
+                # a single websocket e.g. of a new viewer gets all rows - the other websockets
+                # of the page keep their rows and resync if they miss a changed version
+                options.rowData = rows
+                self.row_transaction(page_id, rows)
+            d["row_version"] = self.row_versions.get(page_id, 0)
+        if self.row_id_field:
+            d["row_id_field"] = self.row_id_field
+            if not self.has_event_function("resyncRows"):
+                self.on("resyncRows", self.handle_resync_rows)
         d["def"] = options
         d["auto_size"] = self.auto_size
         d["events"] = self.events
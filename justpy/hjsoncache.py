@@ -0,0 +1,99 @@
+'''
+Created on 2026-10-19
+
+process wide cache of parsed hjson option templates
+'''
+import collections
+import os
+import threading
+
+import hjson
+
+
+class HjsonCache:
+    """
+    parse each hjson option string or file only once - the parsed templates are shared
+    and must not be modified, each component gets its own structural copy
+    """
+
+    max_templates = 512
+    templates = collections.OrderedDict()
+    # file name -> (modification time, size, parsed template)
+    files = {}
+    lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def parse(options_string: str):
+        return hjson.loads(options_string.encode("ascii", "ignore"))
+
+    @classmethod
+    def clone(cls, value):
+        """
+        copy the dicts and lists of the given template - the other values are immutable
+        """
+        if isinstance(value, dict):
+            return value.__class__((key, cls.clone(item)) for key, item in value.items())
+        if isinstance(value, list):
+            return [cls.clone(item) for item in value]
+        return value
+
+    @classmethod
+    def get(cls, options_string: str):
+        """
+        get the shared parsed template of the given hjson string - read only
+        """
+        with cls.lock:
+            template = cls.templates.get(options_string)
+            if template is not None:
+                cls.templates.move_to_end(options_string)
+                cls.hits += 1
+                return template
+        template = cls.parse(options_string)
+        with cls.lock:
+            cls.misses += 1
+            cls.templates[options_string] = template
+            while len(cls.templates) > cls.max_templates:
+                cls.templates.popitem(last=False)
+        return template
+
+    @classmethod
+    def get_file(cls, file_name: str):
+        """
+        get the shared parsed template of the given hjson file - parsed again when the
+        modification time or the size of the file changed - read only
+        """
+        stat = os.stat(file_name)
+        key = os.path.abspath(file_name)
+        with cls.lock:
+            cached = cls.files.get(key)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                cls.hits += 1
+                return cached[2]
+        with open(file_name, "r") as f:
+            template = cls.parse(f.read())
+        with cls.lock:
+            cls.misses += 1
+            cls.files[key] = (stat.st_mtime_ns, stat.st_size, template)
+        return template
+
+    @classmethod
+    def loads(cls, options_string: str):
+        """
+        get a copy of the parsed hjson string that may be modified
+        """
+        return cls.clone(cls.get(options_string))
+
+    @classmethod
+    def load_file(cls, file_name: str):
+        """
+        get a copy of the parsed hjson file that may be modified
+        """
+        return cls.clone(cls.get_file(file_name))
+
+    @classmethod
+    def clear(cls):
+        with cls.lock:
+            cls.templates.clear()
+            cls.files.clear()
@@ -1,6 +1,6 @@
 from types import MethodType
 from addict import Dict
-import json, copy, inspect, sys, re
+import json, copy, inspect, sys, re, os, collections, threading, time
 from html.parser import HTMLParser, tagfind_tolerant, attrfind_tolerant
 from html.entities import name2codepoint
 from html import unescape
@@ -11,7 +11,10 @@ import logging
 import httpx
 from jpcore.template import PageOptions
 from jpcore.component import Component
-from jpcore.webpage import WebPage as BaseWebPage
+from jpcore.htmlrenderer import HtmlRenderer, shallow_build
+from jpcore.tracing import Tracing
+from jpcore.watchdog import Watchdog
+from jpcore.webpage import WebPage as BaseWebPage, ComponentIds, build_page, incremental_build
 
 # Dictionary for translating from tag to class
 _tag_class_dict = {}
@@ -110,6 +113,7 @@ class JustpyBaseComponent(Component):
         self.event_modifiers = Dict()
         self.transition = None
         self.allowed_events = []
+        self.parents = {}  # id(container) -> containers and pages the component has been added to
 
     def initialize(self, **kwargs):
         for k, v in kwargs.items():
@@ -213,27 +217,57 @@ class JustpyBaseComponent(Component):
 
     async def update(self, socket=None, *, react=None):
         if react:
-            self.react([])
-        component_dict = self.convert_object_to_dict()
+            with Tracing.span("component.react", component_class=self.__class__.__name__):
+                self.react([])
         if socket:
+            page = None
+            for candidate in self.get_pages().values():
+                if socket in WebPage.sockets.get(candidate.page_id, {}).values():
+                    page = candidate
+                    break
+            component_dict = self.build_dict(page, incremental=False)
             await socket.send_json({"type": "component_update", "data": component_dict})
         else:
-            pages_to_update = list(self.pages.values())
+            pages_to_update = list(self.get_pages().values())
             for page in pages_to_update:
+                page.changed()
                 try:
                     websocket_dict = WebPage.sockets[page.page_id]
                 except:
                     continue
+                # built per page since components may send changes relative to what the page got before
+                component_dict = self.build_dict(page, incremental=True)
                 for websocket in list(websocket_dict.values()):
                     try:
                         # WebPage.loop.create_task(websocket.send_json({'type': 'component_update', 'data': component_dict}))
-                        await websocket.send_json(
-                            {"type": "component_update", "data": component_dict}
+                        await page.send_json(
+                            websocket, {"type": "component_update", "data": component_dict}
                         )
                     except:
                         print("Problem with websocket in component update, ignoring")
         return self
 
+    def build_dict(self, page: WebPage = None, incremental: bool = False) -> dict:
+        """
+        convert the component to a dict for the websockets of the given page
+
+        Args:
+            page(WebPage): the page the dict is sent to
+            incremental(bool): if True the dict is sent to all websockets of the page and may
+                carry changes relative to what the page got before
+
+        Returns:
+            dict: the dict of the component
+        """
+        token = incremental_build.set(incremental)
+        page_token = build_page.set(page)
+        try:
+            with Tracing.span("component.serialize", component_class=self.__class__.__name__):
+                return self.convert_object_to_dict()
+        finally:
+            build_page.reset(page_token)
+            incremental_build.reset(token)
+
     def check_transition(self):
         if self.transition and (not self.id):
             cls = JustpyBaseComponent
@@ -247,6 +281,71 @@ class JustpyBaseComponent(Component):
         # So the page itself does not update, return True not None
         return True
 
+    def subscribe(self, topic: str, func=None, page: WebPage = None):
+        """
+        subscribe to the given topic - see WebPage.publish
+
+        Args:
+            topic(str): the name of the topic
+            func(Callable): called with this component and the payload of each publish,
+                the component is not sent to the browser if it returns True
+            page(WebPage): the page to update - all pages the component is on if None
+        """
+        if not self.id:
+            cls = JustpyBaseComponent
+            self.id = cls.next_id
+            cls.next_id += 1
+        pages = [page] if page is not None else list(self.get_pages().values())
+        if not pages:
+            raise Exception(f"{self.__class__.__name__} is not on any page that could be updated")
+        for wp in pages:
+            wp.subscribe(topic, self, func)
+        return self
+
+    def unsubscribe(self, topic: str, page: WebPage = None):
+        pages = [page] if page is not None else list(self.get_pages().values())
+        for wp in pages:
+            wp.unsubscribe(topic, self)
+
+    def add_parent(self, container):
+        self.parents[id(container)] = container
+
+    def remove_parent(self, container):
+        self.parents.pop(id(container), None)
+
+    def get_pages(self) -> dict:
+        """
+        get the pages this component is on - directly or via the containers it has been added to
+
+        Returns:
+            dict: page_id -> WebPage
+        """
+        pages = dict(getattr(self, "pages", {}))
+        visited = {id(self)}
+        children = [self]
+        while children:
+            child = children.pop()
+            parents = getattr(child, "parents", {})
+            for key, container in list(parents.items()):
+                # the child may have been dropped without remove_component e.g. by components.clear()
+                component_ids = getattr(container, "component_ids", None)
+                if component_ids is not None:
+                    contained = id(child) in component_ids.get(container.components)
+                else:
+                    contained = child in container.components
+                if not contained:
+                    del parents[key]
+                    continue
+                if id(container) in visited:
+                    continue
+                visited.add(id(container))
+                if isinstance(container, WebPage):
+                    pages[container.page_id] = container
+                else:
+                    pages.update(getattr(container, "pages", {}))
+                    children.append(container)
+        return pages
+
     def remove_page_from_pages(self, wp: WebPage):
         self.pages.pop(wp.page_id)
 
@@ -285,10 +384,18 @@ class JustpyBaseComponent(Component):
             function_data = Dict(event_data)
         else:
             function_data = event_data
-        if inspect.iscoroutinefunction(event_function):
-            event_result = await event_function(function_data)
-        else:
-            event_result = event_function(function_data)
+        page = event_data.get("page", None)
+        with Watchdog.watch(
+            "event",
+            event_function,
+            component_class=self.__class__.__name__,
+            event_type=event_type,
+            route=getattr(page, "route", None),
+        ):
+            if inspect.iscoroutinefunction(event_function):
+                event_result = await event_function(function_data)
+            else:
+                event_result = event_function(function_data)
         return event_result
 
     @staticmethod
@@ -385,7 +492,7 @@ class HTMLBaseComponent(JustpyBaseComponent):
         self.animation = False
         self.pages = (
             {}
-        )  # Dictionary of pages the component is on. Not managed by framework.
+        )  # Dictionary of pages the component has been added to directly - see get_pages
         self.show = True
         self.set_focus = False
         self.classes = ""
@@ -456,22 +563,25 @@ class HTMLBaseComponent(JustpyBaseComponent):
     def add_scoped_slot(self, slot, c):
         self.scoped_slots[slot] = c
 
+    def iter_html(self, indent=0, indent_step=0, format=True, chunk_size=None):
+        """
+        render the component and its children to html in a single pass
+
+        Args:
+            indent(int): the number of blanks the component is indented by
+            indent_step(int): the number of blanks each level of children is indented by
+            format(bool): if True each tag and text is put on its own line
+            chunk_size(int): the minimum number of characters per chunk
+
+        Returns:
+            Iterator[str]: the chunks of the html e.g. for a StreamingResponse
+        """
+        renderer = HtmlRenderer(indent_step=indent_step, format=format, placeholders=False)
+        return renderer.buffered(renderer.iter_components([self], indent), chunk_size)
+
     def to_html(self, indent=0, indent_step=0, format=True):
-        block_indent = " " * indent
-        if format:
-            ws = "\n"
-        else:
-            ws = ""
-        s = f"{block_indent}<{self.html_tag} "
-        d = self.convert_object_to_dict()
-        for attr, value in d["attrs"].items():
-            if value:
-                s = f'{s}{attr}="{value}" '
-        if self.classes:
-            s = f'{s}class="{self.classes}"/>{ws}'
-        else:
-            s = f"{s}/>{ws}"
-        return s
+        renderer = HtmlRenderer(indent_step=indent_step, format=format, placeholders=False)
+        return "".join(renderer.iter_components([self], indent))
 
     def react(self, data):
         return
@@ -543,10 +653,14 @@ class Div(HTMLBaseComponent):
         self.children = []
         super().__init__(**kwargs)
         self.components = self.children.copy()
+        self.component_ids = ComponentIds()
+        for child in self.components:
+            child.add_parent(self)
 
     def delete(self):
         if self.delete_flag:
             for c in self.components:
+                c.remove_parent(self)
                 c.delete()
             if self.needs_deletion:
                 JustpyBaseComponent.instances.pop(self.id, None)
@@ -570,10 +684,13 @@ class Div(HTMLBaseComponent):
             self.components.append(child)
         else:
             self.components.insert(position, child)
+        self.component_ids.added(self.components, child)
+        child.add_parent(self)
         return self
 
     def delete_components(self):
         for c in self.components:
+            c.remove_parent(self)
             c.delete()
         self.components = []
 
@@ -600,6 +717,10 @@ class Div(HTMLBaseComponent):
             raise Exception(
                 "Component cannot be removed because it is not contained in element"
             )
+        contained = component in self.components
+        self.component_ids.removed(self.components, component, contained)
+        if not contained:
+            component.remove_parent(self)
         return self
 
     def remove(self, component):
@@ -614,35 +735,6 @@ class Div(HTMLBaseComponent):
     def last(self):
         return self.components[-1]
 
-    def to_html(self, indent=0, indent_step=0, format=True):
-        block_indent = " " * indent
-        if format:
-            ws = "\n"
-        else:
-            ws = ""
-        s = f"{block_indent}<{self.html_tag} "
-        d = self.convert_object_to_dict()
-        for attr, value in d["attrs"].items():
-            if value:
-                s = f'{s}{attr}="{value}" '
-        if self.style:
-            s = f'{s}style="{self.style}"'
-        if self.classes:
-            s = f'{s}class="{self.classes}">{ws}'
-        else:
-            s = f"{s}>{ws}"
-        if self.inner_html:
-            s = f"{s}{self.inner_html}</{self.html_tag}>{ws}"
-            return s
-        try:
-            s = f"{s}{self.text}{ws}"
-        except:
-            pass
-        for c in self.components:
-            s = f"{s}{c.to_html(indent + indent_step, indent_step, format)}"
-        s = f"{s}{block_indent}</{self.html_tag}>{ws}"
-        return s
-
     def model_update(self):
         # [wp, 'text'] for example
         # self.text = str(self.model[0].data[self.model[1]])
@@ -650,6 +742,9 @@ class Div(HTMLBaseComponent):
 
     def build_list(self):
         object_list = []
+        if shallow_build.get():
+            # the renderer visits the children itself
+            return object_list
         for i, obj in enumerate(self.components):
             obj.react(self.data)
             d = obj.convert_object_to_dict()
@@ -2451,7 +2546,7 @@ class BasicHTMLParser(HTMLParser):
         self.containers.append(self.root)
         self.endtag_required = True
         self.create_commands = kwargs.get(
-            "create_commands", True
+            "create_commands", False
         )  # If True, create the justpy command list
         self.command_prefix = kwargs.get(
             "command_prefix", "jp."
@@ -2631,6 +2726,309 @@ class BasicHTMLParser(HTMLParser):
         pass
 
 
+try:
+    import aiofiles
+    import aiofiles.os
+
+    _has_aiofiles = True
+except:
+    _has_aiofiles = False
+
+
+class HtmlTemplateNode:
+    """
+    an element of a compiled html template
+    """
+
+    __slots__ = ["tag", "attrs", "compiled_attrs", "text", "children"]
+
+    def __init__(self, tag, attrs=[]):
+        self.tag = tag
+        self.attrs = attrs
+        # (kind, name, value) with kind being "event", "eval" or "value"
+        self.compiled_attrs = []
+        self.text = None
+        self.children = []
+
+
+class HtmlTemplateParser(BasicHTMLParser):
+    """
+    parses html into a tree of HtmlTemplateNode without creating any components
+    """
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.root = HtmlTemplateNode("div")
+        self.containers = [self.root]
+        self.endtag_required = True
+        self.has_events = False
+
+    def handle_starttag(self, tag, attrs):
+        node = HtmlTemplateNode(tag, attrs)
+        for name, value in attrs:
+            name = name.replace("-", "_")
+            if name[0] == "@":
+                self.has_events = True
+                node.compiled_attrs.append(("event", name[1:], value))
+            elif name[0] == ":":
+                node.compiled_attrs.append(("eval", name[1:], compile(value, "<parse_html>", "eval")))
+            else:
+                node.compiled_attrs.append(("value", name, value))
+        self.containers[-1].children.append(node)
+        self.containers.append(node)
+        if tag in BasicHTMLParser.void_elements:
+            self.handle_endtag(tag)
+            self.endtag_required = False
+        else:
+            self.endtag_required = True
+
+    def handle_endtag(self, tag):
+        self.containers.pop()
+
+    def handle_data(self, data):
+        data = data.strip()
+        if data:
+            self.containers[-1].text = data
+
+
+class HtmlTemplate:
+    """
+    html compiled into a component factory - the html is parsed only once and
+    each build creates a fresh component tree
+    """
+
+    max_templates = 256
+    templates = collections.OrderedDict()
+    # file name -> (modification time, size, template, time of the last check)
+    files = collections.OrderedDict()
+    # seconds before the modification time of a cached file is checked again
+    check_interval = 1.0
+    # file name -> future of a file being read by get_file_async
+    loading = {}
+    # compiled bodies of @event oneliners - least recently used first
+    oneliners = collections.OrderedDict()
+    lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    def __init__(self, html_string: str):
+        parser = HtmlTemplateParser()
+        parser.feed(html_string)
+        self.nodes = parser.root.children
+        self.has_events = parser.has_events
+
+    @classmethod
+    def get(cls, html_string: str):
+        """
+        get the compiled template of the given html string
+        """
+        with cls.lock:
+            template = cls.templates.get(html_string)
+            if template is not None:
+                cls.templates.move_to_end(html_string)
+                cls.hits += 1
+                return template
+        template = cls(html_string)
+        with cls.lock:
+            cls.misses += 1
+            cls.templates[html_string] = template
+            while len(cls.templates) > cls.max_templates:
+                cls.templates.popitem(last=False)
+        return template
+
+    @classmethod
+    def cached_file(cls, key: str, now: float):
+        """
+        get the cached template of the given file if it has been checked recently
+        """
+        with cls.lock:
+            cached = cls.files.get(key)
+            if cached is not None and now - cached[3] < cls.check_interval:
+                cls.files.move_to_end(key)
+                cls.hits += 1
+                return cached[2]
+        return None
+
+    @classmethod
+    def unchanged_file(cls, key: str, stat, now: float):
+        """
+        get the cached template of the given file if the file has not been modified since
+        """
+        with cls.lock:
+            cached = cls.files.get(key)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                cls.files[key] = (stat.st_mtime_ns, stat.st_size, cached[2], now)
+                cls.hits += 1
+                return cached[2]
+        return None
+
+    @classmethod
+    def compile_file(cls, key: str, stat, now: float, html_string: str):
+        template = cls(html_string)
+        with cls.lock:
+            cls.misses += 1
+            cls.files[key] = (stat.st_mtime_ns, stat.st_size, template, now)
+            cls.files.move_to_end(key)
+            while len(cls.files) > cls.max_templates:
+                cls.files.popitem(last=False)
+        return template
+
+    @classmethod
+    def get_file(cls, html_file: str):
+        """
+        get the compiled template of the given html file - compiled again when the
+        modification time or the size of the file changed
+        """
+        key = os.path.abspath(html_file)
+        now = time.monotonic()
+        template = cls.cached_file(key, now)
+        if template is not None:
+            return template
+        stat = os.stat(html_file)
+        template = cls.unchanged_file(key, stat, now)
+        if template is None:
+            with open(html_file, encoding="utf-8") as f:
+                template = cls.compile_file(key, stat, now, f.read())
+        return template
+
+    @classmethod
+    async def get_file_async(cls, html_file: str):
+        """
+        get the compiled template of the given html file reading it with aiofiles -
+        concurrent requests for the same file share a single read
+        """
+        key = os.path.abspath(html_file)
+        now = time.monotonic()
+        template = cls.cached_file(key, now)
+        if template is not None:
+            return template
+        loading = cls.loading.get(key)
+        if loading is not None:
+            # a cancelled waiter must not cancel the shared read
+            return await asyncio.shield(loading)
+        loading = asyncio.get_running_loop().create_future()
+        cls.loading[key] = loading
+        try:
+            stat = await aiofiles.os.stat(html_file)
+            template = cls.unchanged_file(key, stat, now)
+            if template is None:
+                async with aiofiles.open(html_file, encoding="utf-8") as f:
+                    html_string = await f.read()
+                template = cls.compile_file(key, stat, now, html_string)
+            if not loading.done():
+                loading.set_result(template)
+        except Exception as ex:
+            if not loading.done():
+                loading.set_exception(ex)
+                # only the waiters need the exception
+                loading.exception()
+            raise
+        finally:
+            if not loading.done():
+                # e.g. the loading task has been cancelled - the waiters must not hang
+                loading.cancel()
+            cls.loading.pop(key, None)
+        return template
+
+    @classmethod
+    def invalidate(cls, html_file: str = None):
+        """
+        forget the compiled template of the given file or of all files
+        """
+        with cls.lock:
+            if html_file is None:
+                cls.files.clear()
+            else:
+                cls.files.pop(os.path.abspath(html_file), None)
+
+    @classmethod
+    def clear(cls):
+        with cls.lock:
+            cls.templates.clear()
+            cls.files.clear()
+            cls.oneliners.clear()
+
+    @classmethod
+    def oneliner(cls, body: str):
+        with cls.lock:
+            code = cls.oneliners.get(body)
+            if code is not None:
+                cls.oneliners.move_to_end(body)
+        if code is None:
+            code = compile(f"def oneliner(self, msg):\n {body}", "<parse_html>", "exec")
+            with cls.lock:
+                cls.oneliners[body] = code
+                while len(cls.oneliners) > cls.max_templates:
+                    cls.oneliners.popitem(last=False)
+        namespace = {}
+        exec(code, globals(), namespace)
+        return namespace["oneliner"]
+
+    def create_component(self, node, container, context, name_dict, dict_attribute):
+        """
+        create the component of the given node and its children - same semantics as
+        BasicHTMLParser.handle_starttag
+        """
+        c = component_by_tag(node.tag, node.attrs)
+        for kind, name, value in node.compiled_attrs:
+            if kind == "event":
+                if context is not None and value in context.f_locals:
+                    c.on(name, context.f_locals[value])
+                elif context is not None and value in context.f_globals:
+                    c.on(name, context.f_globals[value])
+                else:
+                    c.on(name, self.oneliner(value))
+                continue
+            if kind == "eval":
+                value = eval(value)
+            if name == "id":
+                c.id = value
+                continue
+            if value is None:
+                value = True
+            setattr(c, name, value)
+            if name == dict_attribute:
+                if value not in name_dict:
+                    name_dict[value] = c
+                else:
+                    if not isinstance(name_dict[value], (list,)):
+                        name_dict[value] = [name_dict[value]]
+                    name_dict[value].append(c)
+            if name == "class":
+                c.classes = value
+        if node.text is not None:
+            c.text = node.text
+        container.add_component(c)
+        for child in node.children:
+            self.create_component(child, c, context, name_dict, dict_attribute)
+        return c
+
+    def build(self, context=None, **kwargs):
+        """
+        create a fresh component tree
+
+        Args:
+            context: the frame to resolve @event handler names in - only needed if has_events
+            **kwargs: as for parse_html
+
+        Returns:
+            the root component with the name_dict as attribute or its only child
+        """
+        name_dict = Dict()
+        dict_attribute = kwargs.get("dict_attribute", "name")
+        root = Div(name="root")
+        for node in self.nodes:
+            self.create_component(node, root, context, name_dict, dict_attribute)
+        if len(root.components) == 1:
+            result = root.components[0]
+        else:
+            result = root
+        result.name_dict = name_dict
+        result.commands = ""
+        result.initialize(**kwargs)
+        return result
+
+
 def justPY_parser(html_string, context, **kwargs):
     """
     Returns root component of the parser with the name_dict as attribute.
@@ -2649,27 +3047,45 @@ def justPY_parser(html_string, context, **kwargs):
 
 
 def parse_html(html_string, **kwargs):
-    return justPY_parser(html_string, inspect.stack()[1][0], **kwargs)
+    """
+    create the components of the given html string - the html is compiled only once,
+    use create_commands=True to get the python commands that create the components
+    """
+    if kwargs.get("create_commands", False):
+        return justPY_parser(html_string, sys._getframe(1), **kwargs)
+    template = HtmlTemplate.get(html_string)
+    # the caller's frame is only needed to look up @event handlers
+    context = sys._getframe(1) if template.has_events else None
+    return template.build(context, **kwargs)
 
 
 def parse_html_file(html_file, **kwargs):
-    with open(html_file, encoding="utf-8") as f:
-        return justPY_parser(f.read(), inspect.stack()[1][0], **kwargs)
-
-
-try:
-    import aiofiles
+    """
+    create the components of the given html file - the file is compiled again
+    only after it has been modified
+    """
+    if kwargs.get("create_commands", False):
+        with open(html_file, encoding="utf-8") as f:
+            return justPY_parser(f.read(), sys._getframe(1), **kwargs)
+    template = HtmlTemplate.get_file(html_file)
+    context = sys._getframe(1) if template.has_events else None
+    return template.build(context, **kwargs)
 
-    _has_aiofiles = True
-except:
-    _has_aiofiles = False
 
 if _has_aiofiles:
 
     async def parse_html_file_async(html_file, **kwargs):
-        async with aiofiles.open(html_file, encoding="utf-8") as f:
-            s = await f.read()
-        return justPY_parser(s, **kwargs)
+        """
+        create the components of the given html file - the file is read with aiofiles
+        and its compiled template is shared by all pages using it
+        """
+        context = sys._getframe(1)
+        if kwargs.get("create_commands", False):
+            async with aiofiles.open(html_file, encoding="utf-8") as f:
+                s = await f.read()
+            return justPY_parser(s, context, **kwargs)
+        template = await HtmlTemplate.get_file_async(html_file)
+        return template.build(context if template.has_events else None, **kwargs)
 
 else:
 
@@ -20,6 +20,12 @@ from jpcore.justpy_app import CommunicationType, cookie_signer, template_options
     JustpyAjaxEndpoint, Jp_Route_Callback
 import jpcore.jpconfig as jpconfig
 from jpcore.justpy_config import JpConfig
+from jpcore.admin import JustpyAdmin
+from jpcore.memory import MemoryAccounting
+from jpcore.pagecache import PageCache, SharedPage
+from jpcore.payload import PayloadAnalyzer
+from jpcore.tracing import Tracing
+from jpcore.watchdog import Watchdog
 JustPy.LOGGING_LEVEL = jpconfig.LOGGING_LEVEL
 # from .misccomponents import *
 from .pandas import *
@@ -40,6 +46,9 @@ if jpconfig.VERBOSE:
     print(f"Module directory: {current_dir}, Application directory: {os.getcwd()}")
 
 logging.basicConfig(level=jpconfig.LOGGING_LEVEL, format="%(levelname)s %(module)s: %(message)s")
+Tracing.configure(jpconfig.TRACING, jpconfig.TRACE_FILE)
+PayloadAnalyzer.enabled = jpconfig.PAYLOAD_ANALYTICS
+WebPage.ssr = jpconfig.SSR
 
 # modify middleware handling according to deprecation
 # https://github.com/encode/starlette/discussions/1762
@@ -55,6 +64,7 @@ app.mount(jpconfig.STATIC_ROUTE, WhiteListStatic(ext_list=jpconfig.EXT_LIST,dire
 app.mount(
     "/templates", StaticFiles(directory=current_dir + "/templates"), name="templates"
 )
+JustpyAdmin.setup(app)
 
 
 def initial_func(_request) -> WebPage:
@@ -97,6 +107,12 @@ async def justpy_startup():
     WebPage.loop = asyncio.get_event_loop()
     JustPy.loop = WebPage.loop
     JustPy.STATIC_DIRECTORY = jpconfig.STATIC_DIRECTORY
+    if jpconfig.WATCHDOG:
+        Watchdog.start(
+            WebPage.loop,
+            threshold_ms=jpconfig.WATCHDOG_THRESHOLD,
+            interval_ms=jpconfig.WATCHDOG_INTERVAL,
+        )
 
     if startup_func and isinstance(startup_func, typing.Callable):
         if inspect.iscoroutinefunction(startup_func):
@@ -141,6 +157,19 @@ class JustpyEvents(WebSocketEndpoint):
         logging.debug("%s %s", f"Socket {websocket.id} data received:", data)
         data_dict = json.loads(data)
         msg_type = data_dict["type"]
+        # the span is inherited by the handle_event task created below
+        with Tracing.span("websocket.receive", websocket_id=websocket.id, msg_type=msg_type):
+            self.handle_message(websocket, data_dict, msg_type)
+
+    def handle_message(self, websocket: WebSocket, data_dict: dict, msg_type: str):
+        """
+        act on the given message received from the websocket
+
+        Args:
+            websocket: websocket that received the message
+            data_dict(dict): the decoded message
+            msg_type(str): the type of the message
+        """
         # data_dict['event_data']['type'] = msg_type
         if msg_type == "connect":
             # Initial message sent from browser after connection is established
@@ -185,25 +214,16 @@ class JustpyEvents(WebSocketEndpoint):
         except:
             return
         websocket.open = False
-        WebPage.sockets[pid].pop(websocket.id)
-        if not WebPage.sockets[pid]:
-            WebPage.sockets.pop(pid)
-        await WebPage.instances[pid].on_disconnect(
-            websocket
-        )  # Run the specific page disconnect function
+        page_sockets = WebPage.sockets.get(pid, {})
+        page_sockets.pop(websocket.id, None)
+        if not page_sockets:
+            WebPage.sockets.pop(pid, None)
+        # the page may already have been deleted e.g. by a page cache
+        page = WebPage.instances.get(pid)
+        if page is not None:
+            await page.on_disconnect(websocket)  # Run the specific page disconnect function
         if jpconfig.MEMORY_DEBUG:
-            print("************************")
-            print(
-                "Elements: ",
-                len(JustpyBaseComponent.instances),
-                JustpyBaseComponent.instances,
-            )
-            print("WebPages: ", len(WebPage.instances), WebPage.instances)
-            print("Sockets: ", len(WebPage.sockets), WebPage.sockets)
-            import psutil
-            process = psutil.Process(os.getpid())
-            print(f"Memory used: {process.memory_info().rss:,}")
-            print("************************")
+            print(f"Memory: {MemoryAccounting.summary()}")
 
 
 def get_server():
@@ -0,0 +1,153 @@
+'''
+Created on 2026-10-19
+
+search index over the labels of select options shared by all
+components that use the same option list
+'''
+import bisect
+import collections
+import threading
+import typing
+
+
+class OptionIndex:
+    """
+    prefix and substring index over the lower case labels of a list of options
+
+    all labels are joined into a single text so that a substring search is a scan
+    with str.find, matches that start at the beginning of a label are ranked first
+    """
+
+    # least recently used indexes by id of the options list - lists can not be referenced weakly
+    # so the number of shared indexes is bounded and the identity of the list is checked on lookup
+    indexes = collections.OrderedDict()
+    indexes_lock = threading.Lock()
+    max_indexes = 32
+
+    def __init__(self, options: list, option_label: str = "label", max_results: int = 64):
+        """
+        constructor
+
+        Args:
+            options(list): the options - strings or dicts
+            option_label(str): the key of the label of dict options
+            max_results(int): the number of search results to keep in the cache
+        """
+        self.options = options
+        self.option_label = option_label
+        self.max_results = max_results
+        self.labels = [self.label(option).lower().replace("\n", " ") for option in options]
+        self.text = "\n".join(self.labels)
+        # start offset of each label in the text
+        self.offsets = []
+        offset = 0
+        for label in self.labels:
+            self.offsets.append(offset)
+            offset += len(label) + 1
+        self.results = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_options(cls, options: list, option_label: str = "label") -> "OptionIndex":
+        """
+        get the shared index of the given options list - creating it if needed
+        """
+        key = (id(options), option_label)
+        with cls.indexes_lock:
+            index = cls.indexes.get(key)
+            if index is None or index.options is not options:
+                index = cls(options, option_label)
+                cls.indexes[key] = index
+            cls.indexes.move_to_end(key)
+            while len(cls.indexes) > cls.max_indexes:
+                cls.indexes.popitem(last=False)
+        return index
+
+    @classmethod
+    def release(cls, options: list):
+        """
+        remove the indexes of the given options list e.g. after it has been modified
+        """
+        with cls.indexes_lock:
+            for key in [key for key, index in cls.indexes.items() if index.options is options]:
+                del cls.indexes[key]
+
+    def label(self, option) -> str:
+        if isinstance(option, dict):
+            return str(option.get(self.option_label, ""))
+        return str(option)
+
+    def scan(self, term: str) -> list:
+        """
+        find the positions of the options containing the given term - prefix matches first
+        """
+        prefix_matches = []
+        other_matches = []
+        last = -1
+        start = self.text.find(term)
+        while start != -1:
+            i = bisect.bisect_right(self.offsets, start) - 1
+            if i != last:
+                if start == self.offsets[i]:
+                    prefix_matches.append(i)
+                else:
+                    other_matches.append(i)
+                last = i
+            # continue with the next label
+            next_start = self.offsets[i + 1] if i + 1 < len(self.offsets) else len(self.text)
+            start = self.text.find(term, next_start)
+        return prefix_matches + other_matches
+
+    def refine(self, term: str, matches: list) -> list:
+        """
+        filter the matches of a shorter term that is contained in the given term
+        """
+        prefix_matches = []
+        other_matches = []
+        for i in matches:
+            found = self.labels[i].find(term)
+            if found == 0:
+                prefix_matches.append(i)
+            elif found > 0:
+                other_matches.append(i)
+        return prefix_matches + other_matches
+
+    def search(self, term: str) -> list:
+        """
+        get the positions of all options whose label contains the given term
+
+        Args:
+            term(str): the text to search for - case insensitive
+
+        Returns:
+            list: the positions of the matching options, prefix matches first
+        """
+        term = (term or "").lower()
+        if not term:
+            return range(len(self.options))
+        with self.lock:
+            matches = self.results.get(term)
+            if matches is not None:
+                self.results.move_to_end(term)
+                return matches
+            # the user typically extends the previous search term
+            shorter = None
+            for cached_term, cached_matches in self.results.items():
+                if cached_term in term and (shorter is None or len(cached_matches) < len(shorter)):
+                    shorter = cached_matches
+            matches = self.scan(term) if shorter is None else self.refine(term, shorter)
+            self.results[term] = matches
+            while len(self.results) > self.max_results:
+                self.results.popitem(last=False)
+            return matches
+
+    def page(self, term: str, offset: int = 0, limit: int = 50) -> typing.Tuple[list, bool]:
+        """
+        get a page of the options matching the given term
+
+        Returns:
+            tuple: the options of the page and whether there are more matches
+        """
+        matches = self.search(term)
+        positions = matches[offset : offset + limit]
+        return [self.options[i] for i in positions], offset + limit < len(matches)
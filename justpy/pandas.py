@@ -1,6 +1,7 @@
 from .htmlcomponents import *
 from .chartcomponents import *
 from .gridcomponents import *
+from .frameconverter import FrameConverter
 from addict import Dict
 from io import StringIO
 
@@ -29,25 +30,33 @@ if _has_pandas:
         def make_pairs_list(x_data, y_data):
             return list(map(list, itertools.zip_longest(x_data, y_data)))
 
-        def _get_column(self, col_spec):
+        def _get_series(self, col_spec):
             if isinstance(col_spec, int):
-                col = self.df.iloc[:, col_spec]
+                return self.df.iloc[:, col_spec]
             elif isinstance(col_spec, str):
-                col = self.df[col_spec]
-            else:
-                raise TypeError(
-                    "Column specification for plotting must be integer or string"
-                )
-            col = col.replace(
-                [np.inf, -np.inf], [sys.float_info.max, -sys.float_info.max]
+                return self.df[col_spec]
+            raise TypeError(
+                "Column specification for plotting must be integer or string"
             )
-            # Convert nan to None
-            return col.where((pd.notnull(col)), None)
+
+        def _get_column(self, col_spec):
+            col = self._get_series(col_spec)
+            # Convert nan to None, inf to the largest float and timestamps to strings
+            return FrameConverter.column_values(col)
+
+        def _get_x_values(self, col_spec, downsample):
+            col = self._get_series(col_spec)
+            if downsample and pd.api.types.is_datetime64_any_dtype(col):
+                # numeric milliseconds so that the points can be downsampled
+                return col.values.astype("datetime64[ms]").astype("int64").tolist()
+            return FrameConverter.column_values(col)
 
         def plot(self, x, y, **kwargs):
             kind = kwargs.get("kind", "column")
             chart = HighCharts(**kwargs)
-            categories = kwargs.get("categories", True)
+            downsample = kwargs.get("downsample")
+            # downsampled series need numeric x values instead of categories
+            categories = kwargs.get("categories", not downsample)
             o = chart.options
             o.chart.type = kind
             o.chart.zoomType = "xy"
@@ -61,27 +70,29 @@ if _has_pandas:
             if kind not in ["scatter"] and categories:
                 o.xAxis.categories = list(self._get_column(x))
             o.series = []
+            if kind in ["scatter"] or not categories:
+                x_values = self._get_x_values(x, downsample)
+                if downsample and pd.api.types.is_datetime64_any_dtype(self._get_series(x)):
+                    o.xAxis.type = "datetime"
             for col in y:
                 s = Dict()
                 if kind not in ["scatter"] and categories:
                     s.data = list(self._get_column(col))
                 else:
-                    s.data = self.make_pairs_list(
-                        self._get_column(x), self._get_column(col)
-                    )
+                    s.data = self.make_pairs_list(x_values, self._get_column(col))
                 s.name = self.df.columns[col] if isinstance(col, int) else col
                 s.type = kind
                 o.series.append(s)
             return chart
 
-        def ag_grid(self, **kwargs):
+        def ag_grid(self, columnar: bool = False, **kwargs):
             grid = AgGrid(**kwargs)
-            grid.load_pandas_frame(self.df)
+            grid.load_pandas_frame(self.df, columnar=columnar)
             return grid
 
         def table(self, **kwargs):
             headers = list(self.df.columns)
-            table_data = self.df.to_numpy().tolist()
+            table_data = FrameConverter.rows(self.df)
             table_data.insert(0, headers)
             return AutoTable(values=table_data, **kwargs)
 
@@ -2,6 +2,12 @@ import hjson
 
 from .htmlcomponents import *
 from .htmlcomponents import _tag_class_dict, parse_dict
+from .columnar import Columnar
+from .frameconverter import FrameConverter
+from .hjsoncache import HjsonCache
+from .optionindex import OptionIndex
+from .tabledatasource import TableDatasource
+from .treenodeprovider import TreeNodeProvider
 from addict import Dict
 
 quasar_directives = [
@@ -98,12 +104,11 @@ class _QInputBase(Input):
         self.value = update_value
 
     def load_json(self, options_string):
-        self.options = hjson.loads(options_string.encode("ascii", "ignore"))
+        self.options = HjsonCache.loads(options_string)
         return self.options
 
     def load_json_from_file(self, file_name):
-        with open(file_name, "r") as f:
-            self.options = hjson.loads(f.read().encode("ascii", "ignore"))
+        self.options = HjsonCache.load_file(file_name)
         return self.options
 
     def convert_object_to_dict(self):
@@ -315,6 +320,8 @@ class QSelect(_QInputBase):
     ]
 
     def __init__(self, **kwargs):
+        self.option_index = None  # OptionIndex of the options searched on the server
+        self.options_page_size = 50  # number of options sent per filter or scroll request
         super().__init__(**kwargs)
         self.type = "object"
         self.value = kwargs.get("value", None)
@@ -397,9 +404,70 @@ class QSelect(_QInputBase):
             "focus",
             "blur",
             "clear",
+            "virtual-scroll",
         ]
         # self.set_keyword_events(**kwargs)
 
+    def load_server_options(self, options: list, page_size: int = None, option_label: str = None):
+        """
+        search the given options on the server when the user types instead of sending
+        all of them - only the first page_size matches are sent and more are sent when
+        the user scrolls to the end of the list, needs websockets
+
+        the index of the options is shared by all selects that load the same list
+
+        Args:
+            options(list): the options - strings or dicts
+            page_size(int): the number of options to send at once
+            option_label(str): the key of the label of dict options
+        """
+        if page_size:
+            self.options_page_size = page_size
+        if option_label:
+            self.option_label = option_label
+        label_key = getattr(self, "option_label", None)
+        self.option_index = OptionIndex.for_options(options, label_key if isinstance(label_key, str) else "label")
+        self.options, _more = self.option_index.page("", 0, self.options_page_size)
+        self.use_input = True
+        self.on("filter", self.handle_filter)
+        self.on("virtual-scroll", self.handle_options_scroll)
+
+    async def send_options(self, msg, filter_text: str, offset: int):
+        options, more = self.option_index.page(filter_text, offset, self.options_page_size)
+        dict_to_send = {
+            "type": "select_options",
+            "id": self.id,
+            "data": {"filter": filter_text, "offset": offset, "options": options, "more": more},
+        }
+        await msg.page.send_json(msg.websocket, dict_to_send)
+
+    async def handle_filter(self, msg):
+        """
+        send the first page of the options matching the text the user typed
+        """
+        if not msg.websocket:
+            logging.warning(f"{self} needs websockets to filter options on the server")
+            return True
+        await self.send_options(msg, msg.value if isinstance(msg.value, str) else "", 0)
+        # no page update needed
+        return True
+
+    async def handle_options_scroll(self, msg):
+        """
+        send the next page of options when the user scrolled to the end of the list
+        """
+        if not msg.websocket:
+            return True
+        filter_text = msg.value.filter if isinstance(msg.value.filter, str) else ""
+        await self.send_options(msg, filter_text, int(msg.value.offset or 0))
+        return True
+
+    def convert_object_to_dict(self):
+        d = super().convert_object_to_dict()
+        if self.option_index is not None:
+            d["server_options"] = True
+        return d
+
 
 @parse_dict
 class QOptionGroup(_QInputBase):
@@ -2315,6 +2383,10 @@ class QTree(QDiv):
         self.selected = []
         self.tick_strategy = "none"  # none | strict | leaf | leaf-filtered
         self.default_expand_all = False
+        self.node_provider = None  # TreeNodeProvider for the children of lazy nodes
+        self.node_index = {}  # nodes by key in lazy mode
+        self.loaded_nodes = collections.OrderedDict()  # the most recently lazy loaded nodes by key
+        self.max_loaded_nodes = 10000
         super().__init__(**kwargs)
         self.attributes = [
             "tick-strategy",
@@ -2378,14 +2450,119 @@ class QTree(QDiv):
             self.__dict__[key] = value
 
     def load_json(self, options_string):
-        self.nodes = hjson.loads(options_string.encode("ascii", "ignore"))
+        self.nodes = HjsonCache.loads(options_string)
         return self.nodes
 
     def load_json_from_file(self, file_name):
-        with open(file_name, "r") as f:
-            self.nodes = hjson.loads(f.read().encode("ascii", "ignore"))
+        self.nodes = HjsonCache.load_file(file_name)
         return self.nodes
 
+    def load_lazy(
+        self,
+        provider,
+        nodes: list,
+        max_cached_nodes: int = 1000,
+        batched: bool = False,
+        max_loaded_nodes: int = 10000,
+    ):
+        """
+        load the children of nodes with "lazy": True from the given provider when they
+        are expanded - the children are sent to the browser for the expanded nodes only
+        instead of updating the whole tree, lazy loading needs websockets
+
+        the loaded children are not added to the nodes of the tree so that its size stays
+        bounded - after an update of the whole tree the browser loads them again
+
+        Args:
+            provider: a TreeNodeProvider or the provider function for a new one
+            nodes(list): the root nodes
+            max_cached_nodes(int): the number of nodes whose children are cached by a new provider
+            batched(bool): if True the provider function loads the children of several nodes at once
+            max_loaded_nodes(int): the number of loaded nodes kept to pass them to the provider
+        """
+        if isinstance(provider, TreeNodeProvider):
+            self.node_provider = provider
+        else:
+            self.node_provider = TreeNodeProvider(provider, max_nodes=max_cached_nodes, batched=batched)
+        if not getattr(self, "node_key", None):
+            self.node_key = "label"
+        self.nodes = nodes
+        self.node_index = {}
+        self.index_nodes(nodes)
+        self.loaded_nodes = collections.OrderedDict()
+        self.max_loaded_nodes = max_loaded_nodes
+        self.on("lazy-load", self.handle_lazy_load)
+
+    def index_nodes(self, nodes: list):
+        for node in nodes:
+            self.node_index[node.get(self.node_key)] = node
+            self.index_nodes(node.get("children", []))
+
+    def add_loaded_nodes(self, children: list):
+        """
+        remember the given loaded nodes for loading their children - the least recently loaded are dropped
+        """
+        for child in children:
+            key = child.get(self.node_key)
+            self.loaded_nodes[key] = child
+            self.loaded_nodes.move_to_end(key)
+        while len(self.loaded_nodes) > self.max_loaded_nodes:
+            self.loaded_nodes.popitem(last=False)
+
+    def get_node(self, key):
+        node = self.node_index.get(key)
+        return node if node is not None else self.loaded_nodes.get(key)
+
+    async def send_children(
+        self, msg, children: dict, append: bool = False, failed: list = None, finished: list = None
+    ):
+        dict_to_send = {
+            "type": "tree_children",
+            "id": self.id,
+            "data": {
+                "children": [{"key": key, "children": value} for key, value in children.items()],
+                "append": append,
+                # the browser forgets the nodes whose children are complete
+                "finished": finished or [],
+                "failed": failed or [],
+            },
+        }
+        await msg.page.send_json(msg.websocket, dict_to_send)
+
+    async def handle_lazy_load(self, msg):
+        """
+        send the children of the nodes the browser requested - the lazy load
+        events of nodes expanded at the same time arrive as one batch
+        """
+        if not msg.websocket:
+            logging.warning(f"{self} needs websockets to lazy load nodes")
+            return True
+        keys = list(msg.value.node_keys)
+        try:
+            children, pending = await self.node_provider.load(keys, {key: self.get_node(key) for key in keys})
+        except Exception as ex:
+            logging.error(f"{self} could not load the children of {keys}: {ex}")
+            await self.send_children(msg, {}, failed=keys)
+            return True
+        for value in children.values():
+            self.add_loaded_nodes(value)
+        await self.send_children(msg, children, finished=[key for key in children if key not in pending])
+        for key, batches in pending.items():
+            try:
+                async for batch in batches:
+                    if msg.page.page_id not in WebPage.instances:
+                        # nobody waits for the children anymore
+                        await batches.aclose()
+                        return True
+                    self.add_loaded_nodes(batch)
+                    await self.send_children(msg, {key: batch}, append=True)
+            except Exception as ex:
+                logging.error(f"{self} could not load all children of {key}: {ex}")
+            # ends the loading of the node in the browser - also after an error
+            await self.send_children(msg, {key: []}, append=True, finished=[key])
+        # no update of the tree needed
+        return True
+
     def convert_object_to_dict(self):
         d = super().convert_object_to_dict()
         d["default_expand_all"] = self.default_expand_all
@@ -2457,6 +2634,10 @@ class QTable(QDiv):
 
         self.pagination = False
         self.selected = []
+        self.data_columns = None  # columnar payload of the data if loaded with columnar=True
+        self.server_side = False  # if True sort, filter and paginate on the server and only send the current page
+        self.rows_per_page = 10  # initial number of rows per page in server side mode
+        self.datasource = None
         super().__init__(**kwargs)
         self.attributes = [
             "fullscreen",
@@ -2541,15 +2722,21 @@ class QTable(QDiv):
             self.__dict__[key] = value
 
     def load_json(self, options_string):
-        self.nodes = hjson.loads(options_string.encode("ascii", "ignore"))
+        self.nodes = HjsonCache.loads(options_string)
         return self.nodes
 
     def load_json_from_file(self, file_name):
-        with open(file_name, "r") as f:
-            self.nodes = hjson.loads(f.read().encode("ascii", "ignore"))
+        self.nodes = HjsonCache.load_file(file_name)
         return self.nodes
 
-    def load_pandas_frame(self, df):
+    def load_pandas_frame(self, df, columnar: bool = False):
+        """
+        load the given pandas dataframe
+
+        Args:
+            df: the dataframe to load
+            columnar(bool): if True send the data as one array per column
+        """
         self.columns = [
             Dict(
                 {
@@ -2562,7 +2749,90 @@ class QTable(QDiv):
             )
             for col in df.columns
         ]
-        self.data = df.to_dict("records")
+        if self.server_side:
+            # the rows are converted page by page when requested
+            self.load_server_data(df)
+        elif columnar:
+            self.data = []
+            self.data_columns = Columnar.from_frame(df)
+        else:
+            self.data = FrameConverter.records(df)
+            self.data_columns = None
+
+    def load_server_data(self, data):
+        """
+        keep the given data on the server and only send the rows of the current page -
+        sorting, filtering and pagination are done on the server on each request event
+
+        Args:
+            data: a pandas DataFrame or a list of dicts
+        """
+        self.server_side = True
+        self.datasource = TableDatasource(data)
+        if not getattr(self, "columns", None):
+            self.columns = [
+                Dict({"name": col, "align": "center", "label": col, "field": col, "sortable": True})
+                for col in self.datasource.columns
+            ]
+        self.data_columns = None
+        pagination = {"sortBy": None, "descending": False, "page": 1, "rowsPerPage": self.rows_per_page}
+        if isinstance(self.pagination, dict):
+            pagination.update(self.pagination)
+        self.load_page(pagination, getattr(self, "filter", None) or None)
+        self.on("request", self.handle_request)
+
+    def load_page(self, pagination: dict, filter_text: str = None):
+        """
+        set the data to the rows of the page the given pagination points to
+
+        Args:
+            pagination(dict): the Quasar pagination with sortBy, descending, page and rowsPerPage
+            filter_text(str): only include rows that contain this text
+        """
+        pagination = dict(pagination)
+        page = int(pagination.get("page") or 1)
+        rows_per_page = int(pagination.get("rowsPerPage") or 0)
+        self.data, rows_number = self.datasource.get_page(
+            page,
+            rows_per_page,
+            pagination.get("sortBy"),
+            bool(pagination.get("descending")),
+            filter_text,
+        )
+        pagination["rowsNumber"] = rows_number
+        if rows_per_page and page > 1 and (page - 1) * rows_per_page >= rows_number:
+            # e.g. the filter left fewer pages - show the last one
+            pagination["page"] = max(1, -(-rows_number // rows_per_page))
+            self.data, rows_number = self.datasource.get_page(
+                pagination["page"],
+                rows_per_page,
+                pagination.get("sortBy"),
+                bool(pagination.get("descending")),
+                filter_text,
+            )
+        self.pagination = pagination
+
+    async def handle_request(self, msg):
+        """
+        handle the request event Quasar emits in server side mode when the
+        pagination, sorting or filter changes
+        """
+        request = msg.value
+        filter_text = request.filter if request.filter else None
+        self.filter = filter_text or ""
+        self.load_page(request.pagination, filter_text)
+        if msg.websocket:
+            # only the table is sent instead of the whole page
+            await self.update(msg.websocket)
+            return True
+
+    def convert_object_to_dict(self):
+        d = super().convert_object_to_dict()
+        if self.data_columns is not None:
+            # the browser rebuilds the data
+            d["attrs"].pop("data", None)
+            d["columnar_attrs"] = {"data": self.data_columns}
+        return d
 
 
 @parse_dict
@@ -27,5 +27,5 @@ class SetRoute:
         """
         # Create a new route
         app=JustpyApp.app
-        app.add_jproute(path=self.route, wpfunc=wpfunc, name=self.kwargs.get("name", None))
+        app.add_jproute(path=self.route, wpfunc=wpfunc, name=self.kwargs.get("name", None), cache=self.kwargs.get("cache", None))
         return wpfunc
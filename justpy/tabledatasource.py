@@ -0,0 +1,153 @@
+'''
+Created on 2026-10-19
+
+server side pagination, sorting and filtering of table rows
+'''
+import collections
+import threading
+import typing
+
+from .frameconverter import FrameConverter
+
+try:
+    import numpy as np
+    import pandas as pd
+
+    _has_pandas = True
+except:
+    _has_pandas = False
+
+
+class TableDatasource:
+    """
+    pages of a pandas DataFrame or list of dicts for a table in server side mode
+
+    the sort order and the lower case search text of each column are computed once
+    and cached, the matches of the most recent filters are kept in an LRU cache
+    """
+
+    def __init__(self, data, max_filters: int = 8):
+        """
+        constructor
+
+        Args:
+            data: a pandas DataFrame or a list of dicts
+            max_filters(int): the number of filter results to keep in the cache
+        """
+        assert _has_pandas, f"Pandas not installed, cannot serve table pages"
+        if isinstance(data, pd.DataFrame):
+            self.df = data.reset_index(drop=True)
+        else:
+            self.df = pd.DataFrame.from_records(data)
+        self.max_filters = max_filters
+        # column -> positions of the rows in ascending order with nulls last
+        self.sort_orders = {}
+        # column -> number of null values
+        self.null_counts = {}
+        # column -> lower case text of the values
+        self.search_texts = {}
+        # filter text -> boolean numpy array of matching rows
+        self.filter_masks = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def columns(self) -> list:
+        return list(self.df.columns)
+
+    def invalidate(self):
+        """
+        clear the caches e.g. after the data has been modified
+        """
+        with self.lock:
+            self.sort_orders.clear()
+            self.null_counts.clear()
+            self.search_texts.clear()
+            self.filter_masks.clear()
+
+    def sort_order(self, column, descending: bool = False):
+        """
+        get the positions of the rows sorted by the given column - null values are last
+        """
+        order = self.sort_orders.get(column)
+        if order is None:
+            series = self.df[column]
+            order = series.sort_values(kind="mergesort", na_position="last").index.to_numpy()
+            self.sort_orders[column] = order
+            self.null_counts[column] = int(series.isna().sum())
+        if descending:
+            non_null = len(order) - self.null_counts[column]
+            order = np.concatenate([order[:non_null][::-1], order[non_null:]])
+        return order
+
+    def search_text(self, column):
+        texts = self.search_texts.get(column)
+        if texts is None:
+            texts = self.df[column].astype(str).str.lower().where(self.df[column].notna(), "")
+            self.search_texts[column] = texts
+        return texts
+
+    def filter_mask(self, filter_text: str):
+        """
+        get the boolean mask of the rows that contain the given text in any column
+        """
+        term = filter_text.lower()
+        mask = self.filter_masks.get(term)
+        if mask is not None:
+            self.filter_masks.move_to_end(term)
+            return mask
+        # rows that match a longer text also match a shorter part of it
+        candidates = None
+        for cached_term, cached_mask in self.filter_masks.items():
+            if cached_term in term and (candidates is None or cached_mask.sum() < candidates.sum()):
+                candidates = cached_mask
+        if candidates is None:
+            positions = np.arange(len(self.df))
+        else:
+            positions = np.flatnonzero(candidates)
+        mask = np.zeros(len(self.df), dtype=bool)
+        for column in self.df.columns:
+            texts = self.search_text(column)
+            if candidates is not None:
+                texts = texts.iloc[positions]
+            mask[positions] |= texts.str.contains(term, regex=False).to_numpy(dtype=bool)
+        self.filter_masks[term] = mask
+        while len(self.filter_masks) > self.max_filters:
+            self.filter_masks.popitem(last=False)
+        return mask
+
+    def get_page(
+        self,
+        page: int = 1,
+        rows_per_page: int = 10,
+        sort_by: str = None,
+        descending: bool = False,
+        filter_text: str = None,
+    ) -> typing.Tuple[list, int]:
+        """
+        get the rows of the given page
+
+        Args:
+            page(int): the number of the page starting at 1
+            rows_per_page(int): the number of rows per page - 0 for all rows
+            sort_by(str): the column to sort by
+            descending(bool): if True sort in descending order
+            filter_text(str): only include rows that contain this text in any column
+
+        Returns:
+            tuple: the JSON compatible rows of the page and the number of rows matching the filter
+        """
+        with self.lock:
+            if sort_by:
+                positions = self.sort_order(sort_by, descending)
+            else:
+                positions = np.arange(len(self.df))
+            if filter_text:
+                positions = positions[self.filter_mask(str(filter_text))[positions]]
+            rows_number = len(positions)
+            if rows_per_page:
+                start = (max(page, 1) - 1) * rows_per_page
+                positions = positions[start : start + rows_per_page]
+            return FrameConverter.records(self.df.iloc[positions]), rows_number
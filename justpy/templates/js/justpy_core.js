@@ -144,6 +144,10 @@ class JustpyCore {
 		this.page_ready = page_ready;
 		this.result_ready = result_ready;
 		this.reload_interval_ms = reload_interval_ms;
+		// components_update messages received within this many milliseconds are applied together
+		this.components_delay = 16;
+		this.components_timer = null;
+		this.pending_components = [];
 		this.events = events;
 		this.staticResourcesUrl = staticResourcesUrl;
 		this.debug = debug;
@@ -184,7 +188,9 @@ class JustpyCore {
 				}
 			}
 		}
-		this.app1 = createApp(justpyComponents);
+		// the server rendered the html components into the container - hydrate instead of replacing them
+		const ssr = document.getElementById("components").hasAttribute("data-ssr");
+		this.app1 = createApp(justpyComponents, ssr);
 		register_html_component(this.app1);
 		if (quasar) {
 			this.app1.use(Quasar,{components:[QBtn,QIcon,QBanner]})
@@ -245,6 +251,10 @@ class JustpyCore {
 			console.log('Message received from server ', msg);
 			console.log(event);
 		}
+		if (msg.type !== 'components_update' && msg.type !== 'page_update') {
+			// the messages are applied in the order they were sent
+			this.flushComponents();
+		}
 		switch (msg.type) {
 			case 'page_update':
 				this.handlePageUpdateEvent(msg);
@@ -256,9 +266,15 @@ class JustpyCore {
 				this.handleWebsocketUpdateEvent(msg);
 				break;
 			case 'component_update':
-				// update just specific component on the page
-				this.updateEventHandler(msg.data)
-				comp_replace(msg.data, this.app1._instance.data.justpyComponents);
+				// update just specific components on the page - a single component or a list of components
+				const updated_components = Array.isArray(msg.data) ? msg.data : [msg.data];
+				this.updateEventHandler(updated_components);
+				for (const updated_component of updated_components) {
+					comp_replace(updated_component, this.app1._instance.data.justpyComponents);
+				}
+				break;
+			case 'components_update':
+				this.handleComponentsUpdateEvent(msg);
 				break;
 			case 'run_javascript':
 				this.handleRunJavascriptEvent(msg);
@@ -286,6 +302,21 @@ class JustpyCore {
 			case 'tooltip_update':
 				this.handleTooltipUpdate(msg);
 				break;
+			case 'chart_stream':
+				apply_chart_stream(msg.id, msg.data);
+				break;
+			case 'grid_rows':
+				grid_rows_received(msg.data);
+				break;
+			case 'grid_transaction':
+				apply_grid_transaction(msg.id, msg.data);
+				break;
+			case 'tree_children':
+				tree_children_received(msg.id, msg.data);
+				break;
+			case 'select_options':
+				select_options_received(msg.id, msg.data);
+				break;
 			default: {
 				if (this.debug) {
 					console.log("Message type " + msg.type + " has no registered event handler");
@@ -319,8 +350,72 @@ class JustpyCore {
 			}
 			document.getElementsByTagName('head')[0].appendChild(link);
 		}
+		// the page update is newer than any pending component updates
+		clearTimeout(this.components_timer);
+		this.components_timer = null;
+		this.pending_components = [];
 		this.updateEventHandler(msg.data)
 		this.app1._instance.data.justpyComponents = msg.data;
+		if (msg.payload_report) {
+			this.showPayloadReport(msg.payload_report);
+		}
+	}
+
+	/**
+	 * handles the components_update event - the components of all messages received
+	 * within components_delay milliseconds are replaced together
+	 *
+	 * a timer is used since animation frames are paused in background tabs
+	 */
+	handleComponentsUpdateEvent(msg) {
+		if (!this.pending_components) {
+			this.pending_components = [];
+		}
+		this.pending_components.push(...msg.data);
+		if (this.components_timer) {
+			return;
+		}
+		this.components_timer = setTimeout(() => this.flushComponents(), this.components_delay);
+	}
+
+	/**
+	 * replace the components of the pending components_update messages
+	 */
+	flushComponents() {
+		clearTimeout(this.components_timer);
+		this.components_timer = null;
+		const components = this.pending_components;
+		if (!components || !components.length) {
+			return;
+		}
+		this.pending_components = [];
+		this.updateEventHandler(components);
+		const justpyComponents = this.app1._instance.data.justpyComponents;
+		for (const component of components) {
+			comp_replace(component, justpyComponents);
+		}
+	}
+
+	/**
+	 * show the payload size analytics of the last page update in an overlay
+	 * @param report - total_bytes, unchanged_bytes and the components with the most bytes
+	 */
+	showPayloadReport(report) {
+		let overlay = document.getElementById('jp_payload_overlay');
+		if (!overlay) {
+			overlay = document.createElement('div');
+			overlay.id = 'jp_payload_overlay';
+			overlay.style.cssText = 'position:fixed;right:0.5rem;bottom:0.5rem;z-index:99999;' +
+				'padding:0.5rem;font:12px monospace;color:#fff;background:rgba(0,0,0,0.75);' +
+				'border-radius:0.25rem;pointer-events:none;white-space:pre';
+			document.body.appendChild(overlay);
+		}
+		const kb = (bytes) => (bytes / 1024).toFixed(1) + ' kB';
+		let lines = ['page_update ' + kb(report.total_bytes) + ', unchanged ' + kb(report.unchanged_bytes)];
+		for (const c of report.components) {
+			lines.push((c.share * 100).toFixed(1).padStart(5) + '% ' + kb(c.bytes).padStart(9) + ' ' + c.class + ' ' + c.key);
+		}
+		overlay.textContent = lines.join('\n');
 	}
 
 	/**
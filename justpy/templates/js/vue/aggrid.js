@@ -1,6 +1,136 @@
 // {* raw *}
 
 var cached_grid_def = {};
+// pending row block requests of grids with the infinite or serverSide row model
+var grid_row_requests = {};
+var grid_row_request_id = 0;
+
+/**
+ * request a block of rows from the datasource of the grid on the server
+ * @param jp_props - the properties of the grid component
+ * @param request - startRow, endRow, sortModel and filterModel of the block
+ * @param success - callback with the rows and the number of rows
+ * @param fail - callback if the request could not be sent
+ */
+function request_grid_rows(jp_props, request, success, fail) {
+    if (!core.use_websockets) {
+        fail();
+        return;
+    }
+    grid_row_request_id += 1;
+    grid_row_requests[grid_row_request_id] = {'success': success, 'fail': fail};
+    let e = {
+        'event_type': 'getRows',
+        'id': jp_props.id,
+        'vue_type': jp_props.vue_type,
+        'page_id': core.page_id,
+        'websocket_id': core.websocket_id,
+        'request_id': grid_row_request_id,
+        'startRow': request.startRow,
+        'endRow': request.endRow,
+        'sortModel': request.sortModel,
+        'filterModel': request.filterModel
+    };
+    core.eventHandler.send_to_server(e, 'event', jp_props.debug);
+}
+
+/**
+ * handle a block of rows sent by the server
+ * @param data - request_id, rows and last_row of the block or failed if the rows could not be read
+ */
+function grid_rows_received(data) {
+    const request = grid_row_requests[data.request_id];
+    if (request) {
+        delete grid_row_requests[data.request_id];
+        if (data.failed) {
+            request.fail();
+        } else {
+            request.success(data.rows, data.last_row);
+        }
+    }
+}
+
+// version of the rows shown by grids with a row_id_field
+var grid_row_versions = {};
+// grids waiting for all rows after a missed version
+var grid_resync_requests = {};
+
+/**
+ * get the key to detect changes of the grid definition - the rows of
+ * grids with a row_id_field are updated without recreating the grid
+ * @param jp_props - the properties of the grid component
+ */
+function grid_def_key(jp_props) {
+    let key = JSON.stringify(jp_props.def);
+    if (jp_props.row_id_field) {
+        let def = Object.assign({}, jp_props.def);
+        delete def.rowData;
+        key = JSON.stringify(def);
+    }
+    if (jp_props.row_columns) {
+        key += '/' + jp_props.row_columns_version;
+    }
+    return key;
+}
+
+/**
+ * ask the server for all rows of the grid e.g. after a missed row transaction
+ * @param {number} jp_component_id - the id of the grid component
+ */
+function request_grid_resync(jp_component_id) {
+    if (grid_resync_requests[jp_component_id] || !core.use_websockets) {
+        return;
+    }
+    grid_resync_requests[jp_component_id] = true;
+    let e = {
+        'event_type': 'resyncRows',
+        'id': jp_component_id,
+        'vue_type': 'grid',
+        'page_id': core.page_id,
+        'websocket_id': core.websocket_id
+    };
+    core.eventHandler.send_to_server(e, 'event', false);
+}
+
+/**
+ * set all rows of the grid
+ * @param {number} jp_component_id - the id of the grid component
+ * @param rows - the rowData
+ * @param {number} version - the version of the rows
+ */
+function set_grid_rows(jp_component_id, rows, version) {
+    const api = cached_grid_def['g' + jp_component_id].api;
+    if (api.setRowData) {
+        api.setRowData(rows);
+    } else {
+        api.setGridOption('rowData', rows);
+    }
+    grid_row_versions[jp_component_id] = version;
+}
+
+/**
+ * apply the given row transaction to the grid if it follows the version shown - transactions that
+ * have been applied already are ignored, if a version was missed all rows are requested
+ * @param {number} jp_component_id - the id of the grid component
+ * @param row_transaction - version and add/update/remove transaction or all rows
+ */
+function apply_grid_transaction(jp_component_id, row_transaction) {
+    if (!cached_grid_def['g' + jp_component_id]) {
+        return;
+    }
+    if (row_transaction.rows) {
+        delete grid_resync_requests[jp_component_id];
+        set_grid_rows(jp_component_id, row_transaction.rows, row_transaction.version);
+        return;
+    }
+    const version = grid_row_versions[jp_component_id] || 0;
+    if (row_transaction.version === version + 1) {
+        cached_grid_def['g' + jp_component_id].api.applyTransaction(row_transaction.transaction);
+        grid_row_versions[jp_component_id] = row_transaction.version;
+    } else if (row_transaction.version > version) {
+        request_grid_resync(jp_component_id);
+    }
+}
 
 Vue.component('grid', {
     template:
@@ -26,6 +156,9 @@ Vue.component('grid', {
             let jp_grid_id = 'g' + jp_component_id
             let j = JSON.stringify(jp_props.def);
             let grid_def = JSON.parse(j);  // Deep copy the grid definition
+            if (jp_props.row_columns) {
+                grid_def.rowData = columnar_to_rows(jp_props.row_columns);
+            }
             // Define a default cell renderer if none is defined
             for (const column of jp_props.html_columns) {
                 if (grid_def.columnDefs[column].cellRenderer === undefined){
@@ -35,7 +168,27 @@ Vue.component('grid', {
                 }
 
             }
-            cached_grid_def[jp_component_id] = j;
+            cached_grid_def[jp_component_id] = grid_def_key(jp_props);
+            if (jp_props.row_id_field) {
+                grid_def.getRowId = function (params) {
+                    return String(params.data[jp_props.row_id_field]);
+                };
+            }
+            if (grid_def.rowModelType === 'infinite') {
+                grid_def.datasource = {
+                    getRows: function (params) {
+                        request_grid_rows(jp_props, params, params.successCallback, params.failCallback);
+                    }
+                };
+            } else if (grid_def.rowModelType === 'serverSide') {
+                grid_def.serverSideDatasource = {
+                    getRows: function (params) {
+                        request_grid_rows(jp_props, params.request, function (rows, last_row) {
+                            params.success({'rowData': rows, 'rowCount': last_row});
+                        }, params.fail);
+                    }
+                };
+            }
             grid_def.onGridReady = grid_ready;
             grid_def.popupParent = document.querySelector('body');
             // @FIXME causes https://github.com/justpy-org/justpy/issues/467
@@ -80,6 +233,16 @@ Vue.component('grid', {
             let jp_component_element = document.getElementById(jp_component_id.toString())
             new agGrid.Grid(jp_component_element, grid_def);  // the api calls are added to grid_def
             cached_grid_def[jp_grid_id] = grid_def;
+            if (jp_props.row_id_field && !grid_def.rowModelType) {
+                if (grid_def.rowData) {
+                    grid_row_versions[jp_component_id] = jp_props.row_version;
+                } else {
+                    // recreated from an update without the rows
+                    grid_row_versions[jp_component_id] = 0;
+                    delete grid_resync_requests[jp_component_id];
+                    request_grid_resync(jp_component_id);
+                }
+            }
 
             function grid_ready(event) {
 				// handle the grid_ready event
@@ -157,10 +320,18 @@ Vue.component('grid', {
         this.grid_change();
     },
     updated() {
-        if (JSON.stringify(this.$props.jp_props.def) !== cached_grid_def[this.$props.jp_props.id]) {
-            let grid_to_destroy = cached_grid_def['g' + this.$props.jp_props.id];
+        const jp_props = this.$props.jp_props;
+        if (grid_def_key(jp_props) !== cached_grid_def[jp_props.id]) {
+            let grid_to_destroy = cached_grid_def['g' + jp_props.id];
             grid_to_destroy.api.destroy();
             this.grid_change(); // Explore option to check difference and update with api instead of destroying and creating new grid
+        } else if (jp_props.row_id_field) {
+            if (jp_props.row_transaction) {
+                apply_grid_transaction(jp_props.id, jp_props.row_transaction);
+            } else if (jp_props.def.rowData && jp_props.row_version !== grid_row_versions[jp_props.id]) {
+                // all rows - they are matched by their id
+                set_grid_rows(jp_props.id, jp_props.def.rowData, jp_props.row_version);
+            }
         }
     },
     props: {
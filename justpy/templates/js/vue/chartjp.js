@@ -3,6 +3,36 @@
 
 var cached_graph_def = {};
 var tooltip_timeout = null;
+
+/**
+ * add the points streamed by the server to the series of a chart and redraw it once
+ * @param id - the id of the chart
+ * @param data - the points of each series, the stream count after the points and the window size
+ */
+function apply_chart_stream(id, data) {
+    const chart = cached_graph_def['chart' + id];
+    if (chart === undefined) return;
+    const counts = chart.jp_stream_counts || (chart.jp_stream_counts = {});
+    for (const s of data.series) {
+        const series = chart.series[s.index];
+        if (series === undefined) continue;
+        let points = s.points;
+        const start = s.end - points.length;
+        // skip points the chart already got with an update of the whole chart
+        const known = counts[s.index];
+        if (known !== undefined && known > start) points = points.slice(known - start);
+        counts[s.index] = s.end;
+        if (s.window && points.length >= s.window) {
+            series.setData(points.slice(points.length - s.window), false);
+            continue;
+        }
+        for (const point of points) {
+            const shift = s.window ? series.xData.length >= s.window : false;
+            series.addPoint(point, false, shift, false);
+        }
+    }
+    chart.redraw(data.animation);
+}
 // var tooltip_timeout_period = 100;
 Vue.component('chart', {
 
@@ -46,6 +76,7 @@ Vue.component('chart', {
             var tooltip_timeout_period = jpProps.tooltip_debounce;
 
             cached_graph_def['chart' + container] = c;
+            c.jp_stream_counts = Object.assign({}, jpProps.stream_counts);
             var update_dict = {};
             if (jpProps.events.indexOf('tooltip') >= 0) {
                 var point_array = [];
@@ -355,6 +386,7 @@ Vue.component('chart', {
                   this.graph_change();
             } else {
                 chart.update(chartDefinition, true, true, jpProps.update_animation);
+                chart.jp_stream_counts = Object.assign({}, jpProps.stream_counts);
             }
         }
     },
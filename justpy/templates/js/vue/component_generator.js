@@ -1,6 +1,11 @@
 export {createApp};
 import * as Vue from "https://unpkg.com/vue@3/dist/vue.esm-browser.js";
-function    createApp(justpyComponents) {
+/**
+ * create the Vue app for the given components
+ * @param justpyComponents - the component dicts of the page
+ * @param {boolean} ssr - if true the app hydrates the server side rendered html of the container it is mounted on
+ */
+function    createApp(justpyComponents, ssr=false) {
 //         var app1 = new Vue({
 //             el: '#components',
 //             data: {
@@ -21,7 +26,8 @@ function    createApp(justpyComponents) {
 //             }
 //         });
 //   return app1;
-        var app1 = Vue.createApp({
+        var create = ssr ? Vue.createSSRApp : Vue.createApp;
+        var app1 = create({
             data: function(){
                 return{justpyComponents: justpyComponents};
             },
@@ -1,6 +1,104 @@
 // {% raw %}
 var storage_dict = {};
 let comp_dict = {};
+// rows rebuilt from columnar payloads - keyed by the payload object
+let columnar_rows = new WeakMap();
+
+/**
+ * rebuild the list of row objects from a columnar payload
+ * @param columnar - columns, values (one array per column) and length
+ */
+function columnar_to_rows(columnar) {
+    let rows = columnar_rows.get(columnar);
+    if (rows === undefined) {
+        const columns = columnar.columns;
+        const values = columnar.values;
+        rows = new Array(columnar.length);
+        for (let i = 0; i < columnar.length; i++) {
+            const row = {};
+            for (let j = 0; j < columns.length; j++) {
+                row[columns[j]] = values[j][i];
+            }
+            rows[i] = row;
+        }
+        columnar_rows.set(columnar, rows);
+    }
+    return rows;
+}
+// also used by the grid component
+window.columnar_to_rows = columnar_to_rows;
+// lazy loaded tree nodes waiting for their children - keyed by tree id and node key
+let tree_lazy_nodes = {};
+// keys of the nodes expanded in the same tick - keyed by tree id
+let tree_lazy_batches = {};
+
+/**
+ * pass the children of lazy loaded nodes sent by the server to the tree
+ * @param id - the id of the tree
+ * @param data - the children by node key, whether they are appended to children loaded before,
+ * the keys of the nodes whose children are complete and the failed keys
+ */
+function tree_children_received(id, data) {
+    for (const item of data.children) {
+        const lazy_node = tree_lazy_nodes[id + ':' + item.key];
+        if (lazy_node === undefined) continue;
+        if (data.append) {
+            // further batches of an async generator provider
+            lazy_node.node.children = (lazy_node.node.children || []).concat(item.children);
+            lazy_node.vm.$forceUpdate();
+        } else {
+            lazy_node.done(item.children);
+        }
+    }
+    for (const key of data.finished || []) {
+        delete tree_lazy_nodes[id + ':' + key];
+    }
+    for (const key of data.failed) {
+        const lazy_node = tree_lazy_nodes[id + ':' + key];
+        if (lazy_node === undefined) continue;
+        delete tree_lazy_nodes[id + ':' + key];
+        lazy_node.fail();
+    }
+}
+window.tree_children_received = tree_children_received;
+
+/**
+ * forget the lazy loaded nodes of a tree that has been removed
+ * @param id - the id of the tree
+ */
+function tree_removed(id) {
+    const prefix = id + ':';
+    for (const key of Object.keys(tree_lazy_nodes)) {
+        if (key.startsWith(prefix)) delete tree_lazy_nodes[key];
+    }
+    delete tree_lazy_batches[id];
+}
+// q-select components filtering their options on the server - keyed by id
+let select_components = {};
+
+/**
+ * show the options a q-select in server filtering mode received from the server
+ * @param id - the id of the select
+ * @param data - the filter text, the offset and the options of the page and whether there are more options
+ */
+function select_options_received(id, data) {
+    const vm = select_components[id];
+    // ignore the results of outdated filter texts
+    if (vm === undefined || data.filter !== vm.select_filter) return;
+    const options = data.offset === 0 ? data.options : (vm.server_options || []).concat(data.options);
+    vm.select_more = data.more;
+    vm.select_loading = false;
+    const update = vm.select_update;
+    vm.select_update = null;
+    if (update) {
+        update(function () {
+            vm.server_options = options;
+        });
+    } else {
+        vm.server_options = options;
+    }
+}
+window.select_options_received = select_options_received;
 export {register_quasar_component};
 import * as Vue from "vue";
 function register_quasar_component(app) {
@@ -56,6 +154,15 @@ app.component('quasar_component', {
             description_object['class'] = this.jp_props.classes;
         }
 
+        // attributes sent in the columnar format e.g. the data of a table
+        for (const attr in this.jp_props.columnar_attrs) {
+            description_object.attrs[attr] = columnar_to_rows(this.jp_props.columnar_attrs[attr]);
+        }
+        // options found by the server for the current filter text of a q-select
+        if (this.jp_props.server_options && this.server_options !== null) {
+            description_object.attrs.options = this.server_options;
+        }
+
         var event_description = {};
         var fn;
         for (i = 0; i < this.jp_props.events.length; i++) {
@@ -80,6 +187,9 @@ app.component('quasar_component', {
                 case 'update:ticked':
                     fn = this.treeTickedEvent;
                     break;
+                case 'lazy-load':
+                    fn = this.treeLazyLoadEvent;
+                    break;
                 // For QSlideItem
                 case 'left':
                     fn = this.leftEvent;
@@ -128,6 +238,9 @@ app.component('quasar_component', {
                 case 'filter':
                 fn = this.filterEvent;
                 break;
+                case 'virtual-scroll':
+                fn = this.selectVirtualScrollEvent;
+                break;
 
                 default:
                     fn = this.defaultEvent;
@@ -174,7 +287,13 @@ app.component('quasar_component', {
     },
     data: function () {
         return {
-            previous_display: 'none'
+            previous_display: 'none',
+            // state of a q-select filtering its options on the server
+            server_options: null,
+            select_filter: null,
+            select_update: null,
+            select_loading: false,
+            select_more: false
         }
     },
     methods: {
@@ -217,6 +336,21 @@ app.component('quasar_component', {
         treeTickedEvent: (function (event) {
             this.eventFunction(event, 'update:ticked');
         }),
+        treeLazyLoadEvent: (function (details) {
+            const id = this.$props.jp_props.id;
+            tree_lazy_nodes[id + ':' + details.key] = {node: details.node, done: details.done, fail: details.fail, vm: this};
+            // nodes expanded in the same tick are requested with a single event
+            let batch = tree_lazy_batches[id];
+            if (batch === undefined) {
+                batch = tree_lazy_batches[id] = [];
+                const self = this;
+                setTimeout(function () {
+                    delete tree_lazy_batches[id];
+                    self.eventFunction({node_keys: batch}, 'lazy-load');
+                }, 0);
+            }
+            batch.push(details.key);
+        }),
         tablePaginationEvent: (function (event) {
             this.eventFunction(event, 'update:pagination');
         }),
@@ -254,9 +388,23 @@ app.component('quasar_component', {
         resizeEvent: (function (event) {
             this.eventFunction(event, 'resize');
         }),
-        filterEvent: (function (event) {
+        filterEvent: (function (event, update, abort) {
+            if (this.$props.jp_props.server_options) {
+                // update is called when the options arrive
+                select_components[this.$props.jp_props.id] = this;
+                this.select_filter = event;
+                this.select_update = update;
+                this.select_loading = true;
+            }
             this.eventFunction(event, 'filter');
         }),
+        selectVirtualScrollEvent: (function (details) {
+            // request the next page of options when the end of the list is reached
+            if (!this.select_more || this.select_loading || this.server_options === null) return;
+            if (details.to < this.server_options.length - 1) return;
+            this.select_loading = true;
+            this.eventFunction({filter: this.select_filter, offset: this.server_options.length}, 'virtual-scroll');
+        }),
         submitEvent: (function (event) {
             var form_elements_list = [];
             var props = this.$props;
@@ -468,6 +616,11 @@ app.component('quasar_component', {
             this.$nextTick(() => this.$refs['r' + props.id].focus())
         }
     },
+    unmounted() {
+        if (this.$props.jp_props.html_tag === 'q-tree') {
+            tree_removed(this.$props.jp_props.id);
+        }
+    },
     beforeUpdate() {
         if (this.$props.jp_props.id && this.$props.jp_props.transition) {
             let el = this.$refs['r' + this.$props.jp_props.id];
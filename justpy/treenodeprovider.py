@@ -0,0 +1,129 @@
+'''
+Created on 2026-10-19
+
+lazy loading of tree nodes from a server side provider
+'''
+import asyncio
+import collections
+import inspect
+import typing
+
+
+class TreeNodeProvider:
+    """
+    provide the children of tree nodes on demand and keep the children of the
+    most recently loaded nodes in an LRU cache - may be shared by several trees
+
+    the provider is called as provider(key, node) and returns a list of child nodes,
+    an awaitable of such a list or an async generator yielding batches of child nodes -
+    with batched=True it is called once per batch as provider(keys, nodes) and returns
+    (an awaitable of) a dict of children by key
+    """
+
+    def __init__(self, provider: typing.Callable, max_nodes: int = 1000, batched: bool = False):
+        """
+        constructor
+
+        Args:
+            provider(Callable): the function that loads the children of nodes
+            max_nodes(int): the number of nodes whose children are cached
+            batched(bool): if True call the provider once for all nodes of a lazy load request
+        """
+        self.provider = provider
+        self.max_nodes = max_nodes
+        self.batched = batched
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_get(self, key):
+        children = self.cache.get(key)
+        if children is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+        return children
+
+    def cache_put(self, key, children: list):
+        self.cache[key] = children
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_nodes:
+            self.cache.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        clear the cached children of the given node or of all nodes
+        """
+        if key is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(key, None)
+
+    async def remaining_batches(self, key, first_batch: list, batches):
+        """
+        yield the remaining batches of an async generator and cache all children when done
+        """
+        children = list(first_batch)
+        async for batch in batches:
+            batch = list(batch)
+            children.extend(batch)
+            yield batch
+        self.cache_put(key, children)
+
+    async def load_node(self, key, node):
+        """
+        load the children of a single node
+
+        Returns:
+            tuple: the first batch of children and an async generator of the remaining batches or None
+        """
+        result = self.provider(key, node)
+        if inspect.isasyncgen(result):
+            try:
+                first_batch = list(await result.__anext__())
+            except StopAsyncIteration:
+                first_batch = []
+            return first_batch, self.remaining_batches(key, first_batch, result)
+        if inspect.isawaitable(result):
+            result = await result
+        children = list(result or [])
+        self.cache_put(key, children)
+        return children, None
+
+    async def load(self, keys: list, nodes: dict) -> typing.Tuple[dict, dict]:
+        """
+        load the children of the given nodes
+
+        Args:
+            keys(list): the keys of the nodes to load the children of
+            nodes(dict): the known nodes by key
+
+        Returns:
+            tuple: the (first batch of) children by key and the async generators
+            of the remaining batches by key
+        """
+        children = {}
+        pending = {}
+        missing = []
+        for key in keys:
+            cached = self.cache_get(key)
+            if cached is None:
+                missing.append(key)
+            else:
+                children[key] = cached
+        if not missing:
+            return children, pending
+        self.misses += len(missing)
+        if self.batched:
+            result = self.provider(missing, {key: nodes.get(key) for key in missing})
+            if inspect.isawaitable(result):
+                result = await result
+            for key in missing:
+                children[key] = list(result.get(key) or [])
+                self.cache_put(key, children[key])
+        else:
+            results = await asyncio.gather(*[self.load_node(key, nodes.get(key)) for key in missing])
+            for key, (first_batch, batches) in zip(missing, results):
+                children[key] = first_batch
+                if batches is not None:
+                    pending[key] = batches
+        return children, pending
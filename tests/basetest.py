@@ -5,6 +5,7 @@ Created on 2021-08-19
 """
 
 import getpass
+import json
 from unittest import TestCase
 import time
 import os
@@ -44,6 +45,22 @@ class Basetest(TestCase):
         return getpass.getuser() == name
 
 
+class MockWebSocket:
+    """
+    websocket replacement that records the messages sent
+    """
+
+    def __init__(self, socket_id: int):
+        self.id = socket_id
+        self.messages = []
+
+    async def send_json(self, d: dict):
+        self.messages.append(d)
+
+    async def send_text(self, text: str):
+        self.messages.append(json.loads(text))
+
+
 class Profiler:
     """
     simple profiler
@@ -0,0 +1,92 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+import os
+import pstats
+import tempfile
+import time
+
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+import justpy as jp
+from jpcore.admin import JustpyAdmin
+from jpcore.profiler import SamplingProfiler
+from tests.basetest import Basetest
+
+
+class TestAdminProfile(Basetest):
+    """
+    test the sampling profiler admin route
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.app = FastAPI()
+        JustpyAdmin("secret").add_routes(self.app)
+        self.headers = {"X-Justpy-Admin-Token": "secret"}
+
+    def test_forbidden(self):
+        """
+        test that the admin route needs the token
+        """
+        with TestClient(self.app) as client:
+            for headers in [{}, {"X-Justpy-Admin-Token": "wrong"}, {"Authorization": "Bearer wrong"}]:
+                response = client.get("/zzz_justpy_admin/profile?seconds=0", headers=headers)
+                self.assertEqual(403, response.status_code)
+
+    def test_profile_formats(self):
+        """
+        test the collapsed, json and pstats formats
+        """
+        with TestClient(self.app) as client:
+            response = client.get("/zzz_justpy_admin/profile?seconds=0.2", headers=self.headers)
+            self.assertEqual(200, response.status_code)
+            lines = response.text.strip().split("\n")
+            for line in lines:
+                stack, count = line.rsplit(" ", 1)
+                self.assertTrue(stack.startswith("justpy:"))
+                self.assertTrue(int(count) > 0)
+            response = client.get("/zzz_justpy_admin/profile?seconds=0.2&format=json", headers={"Authorization": "Bearer secret"})
+            summary = response.json()
+            self.assertGreater(summary["samples"], 0)
+            response = client.get("/zzz_justpy_admin/profile?seconds=0.2&format=pstats", headers=self.headers)
+            self.assertEqual(200, response.status_code)
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "profile.pstats")
+                with open(path, "wb") as f:
+                    f.write(response.content)
+                stats = pstats.Stats(path)
+                self.assertGreater(stats.total_calls, 0)
+            response = client.get("/zzz_justpy_admin/profile?seconds=0&format=svg", headers=self.headers)
+            self.assertEqual(400, response.status_code)
+
+    def test_stage_attribution(self):
+        """
+        test that samples taken during page builds are attributed to the build stage
+        """
+        wp = jp.WebPage()
+        for i in range(200):
+            d = jp.Div(a=wp)
+            for j in range(10):
+                jp.Span(text=f"{i}:{j}", a=d)
+
+        async def build(seconds):
+            end = time.time() + seconds
+            while time.time() < end:
+                wp.build_list()
+                await asyncio.sleep(0)
+
+        async def run():
+            profile_task = asyncio.create_task(SamplingProfiler.profile(0.3, interval_ms=2))
+            await build(0.3)
+            return await profile_task
+
+        profiler = asyncio.run(run())
+        summary = profiler.as_summary()
+        if self.debug:
+            print(summary)
+        self.assertGreater(summary["stages"].get("build", 0), 0)
+        self.assertIn("justpy:build;", profiler.as_collapsed())
@@ -0,0 +1,121 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestAgGridDatasource(Basetest):
+    """
+    test the server side row model of AgGrid
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.df = pd.DataFrame(
+            {
+                "name": [f"name {i:04d}" for i in range(1000)],
+                "age": [i % 90 for i in range(1000)],
+                "score": [np.nan if i % 10 == 0 else i / 2 for i in range(1000)],
+                "joined": pd.date_range("2020-01-01", periods=1000, freq="D"),
+            }
+        )
+        self.lod = self.df.astype(object).where(pd.notnull(self.df), None).to_dict("records")
+
+    def test_datasource(self):
+        """
+        test sorting, filtering and block caching for frames and lists of dicts
+        """
+        sort_model = [{"colId": "age", "sort": "desc"}, {"colId": "name", "sort": "asc"}]
+        filter_model = {
+            "name": {"filterType": "text", "type": "contains", "filter": "NAME 00"},
+            "age": {
+                "filterType": "number",
+                "operator": "OR",
+                "condition1": {"filterType": "number", "type": "lessThan", "filter": 10},
+                "condition2": {"filterType": "number", "type": "greaterThanOrEqual", "filter": 80},
+            },
+        }
+        expected = sorted(
+            [r for r in self.lod if r["name"].startswith("name 00") and (r["age"] < 10 or r["age"] >= 80)],
+            key=lambda r: (-r["age"], r["name"]),
+        )
+        for data in [self.df, self.lod]:
+            datasource = jp.GridDatasource(data, max_blocks=2)
+            rows, last_row = datasource.get_rows(0, 10, sort_model, filter_model)
+            self.assertEqual(len(expected), last_row)
+            self.assertEqual([r["name"] for r in expected[:10]], [r["name"] for r in rows])
+            # cache hit
+            self.assertIs(rows, datasource.get_rows(0, 10, sort_model, filter_model)[0])
+            self.assertEqual(1, datasource.hits)
+            self.assertIsNone(datasource.get_rows(0, 10)[0][0]["score"])
+            self.assertEqual("2020-01-01 00:00:00", str(datasource.get_rows(0, 1)[0][0]["joined"]))
+            # LRU eviction of the first block
+            self.assertEqual(2, len(datasource.blocks))
+            self.assertEqual(2, len(datasource.views))
+            datasource.get_rows(0, 10, sort_model, filter_model)
+            self.assertEqual(1, datasource.hits)
+            self.assertEqual(4, datasource.misses)
+        date_filter = {"joined": {"filterType": "date", "type": "inRange", "dateFrom": "2020-01-01 00:00:00", "dateTo": "2020-01-05 00:00:00"}}
+        rows, last_row = jp.GridDatasource(self.df).get_rows(0, 10, None, date_filter)
+        self.assertEqual(3, last_row)
+        # unknown operators do not filter
+        unknown_filter = {"name": {"filterType": "text", "type": "empty"}, "age": {"filterType": "number", "type": "empty"}}
+        for data in [self.df, self.lod]:
+            self.assertEqual(1000, jp.GridDatasource(data).get_rows(0, 10, None, unknown_filter)[1])
+
+    def test_get_rows_event(self):
+        """
+        test serving a block of rows via the websocket without rowData in the page
+        """
+        wp = jp.WebPage()
+        grid = jp.AgGrid(a=wp, row_model="infinite", block_size=50)
+        grid.load_pandas_frame(self.df)
+        d = grid.convert_object_to_dict()
+        self.assertNotIn("rowData", d["def"])
+        self.assertEqual("infinite", d["def"]["rowModelType"])
+        self.assertEqual(50, d["def"]["cacheBlockSize"])
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        data_dict = {
+            "type": "event",
+            "event_data": {
+                "event_type": "getRows",
+                "id": grid.id,
+                "page_id": wp.page_id,
+                "websocket_id": websocket.id,
+                "request_id": 1,
+                "startRow": 50,
+                "endRow": 100,
+                "sortModel": [{"colId": "score", "sort": "desc"}],
+                "filterModel": {},
+            },
+        }
+        try:
+            asyncio.run(handle_event(data_dict))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual(1, len(websocket.messages))
+        msg = websocket.messages[0]
+        self.assertEqual("grid_rows", msg["type"])
+        self.assertEqual(1, msg["data"]["request_id"])
+        self.assertEqual(1000, msg["data"]["last_row"])
+        self.assertEqual(50, len(msg["data"]["rows"]))
+        scores = sorted(self.df["score"].dropna(), reverse=True)
+        self.assertEqual(scores[50:100], [row["score"] for row in msg["data"]["rows"]])
+        # a failed request is answered so that the browser does not wait for the rows
+        data_dict["event_data"]["request_id"] = 2
+        data_dict["event_data"]["sortModel"] = [{"colId": "missing", "sort": "asc"}]
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        try:
+            asyncio.run(handle_event(data_dict))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual({"request_id": 2, "failed": True}, websocket.messages[1]["data"])
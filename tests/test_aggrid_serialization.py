@@ -0,0 +1,56 @@
+"""
+Created on 2026-10-19
+
+"""
+import pandas as pd
+
+import justpy as jp
+from tests.basetest import Basetest
+
+
+class TestAgGridSerialization(Basetest):
+    """
+    test the cached row conversion of AgGrid
+    """
+
+    def test_row_cache(self):
+        """
+        test that rows are only converted again after they have been modified
+        """
+        lod = [{"name": f"name {i}", "age": i} for i in range(100)]
+        grid = jp.AgGrid()
+        grid.load_lod(lod)
+        grid.row_data_converter = lambda row_idx, col_idx, col_key, val: val * 2 if col_key == "age" else val
+        rows = grid.convert_object_to_dict()["def"]["rowData"]
+        self.assertEqual(100, grid.row_cache.conversions)
+        self.assertEqual(20, rows[10]["age"])
+        # the source rows are not modified
+        self.assertEqual(10, lod[10]["age"])
+        grid.convert_object_to_dict()
+        self.assertEqual(100, grid.row_cache.conversions)
+        # in place modifications and appended rows are detected
+        grid.options["rowData"][1]["age"] += 1
+        lod.append({"name": "new", "age": 1000})
+        rows = grid.convert_object_to_dict()["def"]["rowData"]
+        self.assertEqual(102, grid.row_cache.conversions)
+        self.assertEqual(4, rows[1]["age"])
+        self.assertEqual(2000, rows[100]["age"])
+        # a new converter converts all rows again
+        grid.row_data_converter = None
+        rows = grid.convert_object_to_dict()["def"]["rowData"]
+        self.assertEqual(203, grid.row_cache.conversions)
+        self.assertIs(lod[5], rows[5])
+
+    def test_timestamps_converted_at_load(self):
+        """
+        test that timestamps of a frame are converted once at load time
+        """
+        df = pd.DataFrame(
+            {"name": ["Bob", "Alice"], "birthdate": pd.to_datetime(["2000-01-01 00:00", "2022-01-01 12:30"])}
+        )
+        grid = jp.AgGrid()
+        grid.load_pandas_frame(df)
+        self.assertEqual("2000-01-01 00:00:00", grid.options.rowData[0]["birthdate"])
+        rows = grid.convert_object_to_dict()["def"]["rowData"]
+        self.assertEqual("2022-01-01 12:30:00", rows[1]["birthdate"])
+        self.assertIs(grid.options.rowData[1], rows[1])
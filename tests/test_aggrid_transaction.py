@@ -0,0 +1,109 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestAgGridTransaction(Basetest):
+    """
+    test sending AgGrid row changes as transactions
+    """
+
+    def test_row_transaction(self):
+        """
+        test that page updates only carry the changed rows
+        """
+        wp = jp.WebPage()
+        lod = [{"id": i, "symbol": f"S{i}", "price": 100.0 + i} for i in range(1000)]
+        grid = jp.AgGrid(a=wp, row_id_field="id")
+        grid.load_lod(lod)
+        # the initial build sends all rows
+        d = wp.build_list()[0]
+        self.assertEqual(1000, len(d["def"]["rowData"]))
+        self.assertEqual("id", d["row_id_field"])
+        self.assertEqual(1, d["row_version"])
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        try:
+            lod[5]["price"] = 42.0
+            lod.append({"id": 1000, "symbol": "NEW", "price": 1.0})
+            del lod[0]
+            asyncio.run(wp.update())
+            d = websocket.messages[-1]["data"][0]
+            self.assertNotIn("rowData", d["def"])
+            self.assertEqual(2, d["row_transaction"]["version"])
+            transaction = d["row_transaction"]["transaction"]
+            self.assertEqual([5], [row["id"] for row in transaction["update"]])
+            self.assertEqual([1000], [row["id"] for row in transaction["add"]])
+            self.assertEqual([{"id": 0}], transaction["remove"])
+            # transaction message without the grid definition
+            lod[10]["price"] += 1
+            asyncio.run(grid.update_rows(wp))
+            msg = websocket.messages[-1]
+            self.assertEqual("grid_transaction", msg["type"])
+            self.assertEqual(grid.id, msg["id"])
+            self.assertEqual({"update": [lod[10]]}, msg["data"]["transaction"])
+            # nothing changed - nothing sent
+            asyncio.run(grid.update_rows(wp))
+            self.assertEqual(2, len(websocket.messages))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        # builds for a new page load send all rows again without changing the version
+        d = wp.build_list()[0]
+        self.assertEqual(1000, len(d["def"]["rowData"]))
+        self.assertNotIn("row_transaction", d)
+        self.assertEqual(3, d["row_version"])
+        # conversions outside of a page build keep no rows
+        self.assertEqual(len(lod), len(grid.convert_object_to_dict()["def"]["rowData"]))
+        wp.to_html()
+        self.assertEqual([wp.page_id], list(grid.sent_rows))
+
+    def test_shared_baseline(self):
+        """
+        test that builds for a single websocket keep the rows the other websockets of the page have
+        and that a websocket that missed a version gets all rows
+        """
+        wp = jp.WebPage()
+        lod = [{"id": i, "value": i} for i in range(10)]
+        grid = jp.AgGrid(a=wp, row_id_field="id")
+        grid.load_lod(lod)
+        other_page = jp.WebPage()
+        other_page.add(grid)
+        self.assertEqual(1, wp.build_list()[0]["row_version"])
+        self.assertEqual(1, other_page.build_list()[0]["row_version"])
+        viewer, new_viewer = MockWebSocket(1), MockWebSocket(2)
+        jp.WebPage.sockets[wp.page_id] = {viewer.id: viewer, new_viewer.id: new_viewer}
+        try:
+            # unchanged rows for a new viewer
+            asyncio.run(wp.update_components([grid], websocket=new_viewer))
+            d = new_viewer.messages[-1]["data"][0]
+            self.assertEqual((10, 1), (len(d["def"]["rowData"]), d["row_version"]))
+            # changed rows for a new viewer advance the version the other viewers are behind of
+            lod[1]["value"] = 100
+            asyncio.run(wp.update_components([grid], websocket=new_viewer))
+            d = new_viewer.messages[-1]["data"][0]
+            self.assertEqual((100, 2), (d["def"]["rowData"][1]["value"], d["row_version"]))
+            lod[2]["value"] = 200
+            asyncio.run(grid.update(socket=None))
+            for websocket in [viewer, new_viewer]:
+                d = websocket.messages[-1]["data"]
+                self.assertEqual({"version": 3, "transaction": {"update": [lod[2]]}}, d["row_transaction"])
+            # the viewer at version 1 misses version 2 and asks for all rows
+            data_dict = {
+                "type": "event",
+                "event_data": {"event_type": "resyncRows", "id": grid.id, "page_id": wp.page_id, "websocket_id": viewer.id},
+            }
+            asyncio.run(handle_event(data_dict))
+            msg = viewer.messages[-1]
+            self.assertEqual("grid_transaction", msg["type"])
+            self.assertEqual((3, lod), (msg["data"]["version"], msg["data"]["rows"]))
+            self.assertEqual(3, len(new_viewer.messages))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        # the baseline is kept per page
+        self.assertEqual({wp.page_id: 3, other_page.page_id: 1}, grid.row_versions)
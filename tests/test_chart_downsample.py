@@ -0,0 +1,100 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from justpy.downsample import Downsampler
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestChartDownsample(Basetest):
+    """
+    test downsampling large HighCharts series
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        x = np.arange(100_000, dtype=float)
+        self.y = np.sin(x / 500) * 10
+        # a spike that must survive downsampling
+        self.y[54_321] = 100.0
+
+    def test_algorithms(self):
+        """
+        test that LTTB and min/max keep the ends, the size and the peaks
+        """
+        downsampler = Downsampler.from_series(self.y.tolist(), point_start=10, point_interval=2)
+        for method in Downsampler.methods:
+            points = downsampler.points(500, method)
+            self.assertLessEqual(len(points), 500)
+            self.assertGreaterEqual(len(points), 490)
+            self.assertIn([10 + 2 * 54_321, 100.0], points)
+            x_values = [point[0] for point in points]
+            self.assertEqual(sorted(x_values), x_values)
+        points = downsampler.points(500, "lttb")
+        self.assertEqual([10.0, 0.0], points[0])
+        self.assertEqual(10 + 2 * 99_999, points[-1][0])
+        # nulls are kept as gaps by min/max
+        pairs = [[i, None if i % 3 == 0 else i] for i in range(1000)]
+        points = Downsampler.from_series(pairs).points(100, "minmax")
+        json.dumps(points, allow_nan=False)
+        self.assertIsNone(Downsampler.from_series([{"x": 1, "y": 2}]))
+        self.assertIsNone(Downsampler.from_series([["a", 1]]))
+
+    def test_chart(self):
+        """
+        test the downsampled chart options and zooming into the full resolution data
+        """
+        wp = jp.WebPage()
+        chart = jp.HighCharts(a=wp, downsample="minmax", options={"chart": {"width": 400}, "series": [{"data": self.y.tolist()}, {"data": [1, 2, 3]}]})
+        self.assertIn("zoom_x", chart.events)
+        d = chart.convert_object_to_dict()
+        series = d["def"]["series"]
+        self.assertEqual(400, len(series[0]["data"]))
+        self.assertEqual([1, 2, 3], series[1]["data"])
+        self.assertEqual(100_000, len(chart.options.series[0].data))
+        # the downsampler is cached
+        downsampler = chart.downsampler(0)
+        chart.convert_object_to_dict()
+        self.assertIs(downsampler, chart.downsampler(0))
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        data_dict = {
+            "type": "event",
+            "event_data": {
+                "event_type": "zoom_x",
+                "id": chart.id,
+                "page_id": wp.page_id,
+                "websocket_id": websocket.id,
+                "min": 54_000,
+                "max": 54_300,
+            },
+        }
+        try:
+            asyncio.run(handle_event(data_dict))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        msg = websocket.messages[0]
+        self.assertEqual("chart_update", msg["type"])
+        data, other = msg["data"]["series"]
+        self.assertEqual({}, other)
+        # full resolution of the visible range plus a point on either side
+        self.assertEqual(list(range(53_999, 54_302)), [point[0] for point in data["data"]])
+        self.assertEqual((54_000, 54_300), chart.visible_range)
+
+    def test_plot(self):
+        """
+        test downsampling a frame plot with datetime x values
+        """
+        df = pd.DataFrame({"time": pd.date_range("2020-01-01", periods=5000, freq="s"), "value": np.arange(5000)})
+        chart = df.jp.plot("time", ["value"], kind="line", downsample="lttb")
+        self.assertEqual("datetime", chart.options.xAxis.type)
+        self.assertEqual(1577836800000, chart.options.series[0].data[0][0])
+        self.assertEqual(600, len(chart.convert_object_to_dict()["def"]["series"][0]["data"]))
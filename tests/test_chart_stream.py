@@ -0,0 +1,60 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestChartStream(Basetest):
+    """
+    test streaming points to a HighCharts chart
+    """
+
+    def test_stream(self):
+        """
+        test ring buffers, batched flushes and the stream counts
+        """
+        wp = jp.WebPage()
+        chart = jp.HighCharts(a=wp, options={"series": [{"data": [1, 2, 3]}, {"data": []}]})
+        self.assertIn(wp.page_id, chart.get_pages())
+        chart.window(5)
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+
+        async def stream():
+            chart.stream_interval = 0.01
+            chart.append(0, [4, 5])
+            chart.append(0, [6])
+            chart.append(1, [[0, 1]])
+            # one flush for all appends
+            await asyncio.sleep(0.05)
+            chart.append(1, list(range(10)))
+            await chart.flush()
+
+        try:
+            asyncio.run(stream())
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual(2, len(websocket.messages))
+        first, second = [msg["data"]["series"] for msg in websocket.messages]
+        self.assertEqual("chart_stream", websocket.messages[0]["type"])
+        self.assertEqual({"index": 0, "points": [4, 5, 6], "end": 6, "window": 5}, first[0])
+        self.assertEqual({"index": 1, "points": [[0, 1]], "end": 1, "window": 5}, first[1])
+        # only the last window points are sent
+        self.assertEqual({"index": 1, "points": [5, 6, 7, 8, 9], "end": 11, "window": 5}, second[0])
+        d = chart.convert_object_to_dict()
+        self.assertEqual([2, 3, 4, 5, 6], d["def"]["series"][0]["data"])
+        # the options are not copied on each flush
+        self.assertEqual([1, 2, 3], chart.options.series[0].data)
+        self.assertEqual({0: 6, 1: 11}, d["stream_counts"])
+        self.assertEqual([5, 6, 7, 8, 9], d["def"]["series"][1]["data"])
+        # the ring buffers are bounded without window
+        chart = jp.HighCharts(options={"series": [{"data": []}]})
+        chart.stream_window = 100
+        chart.append(0, list(range(1000)))
+        self.assertEqual(100, len(chart.stream_pending[0]))
+        asyncio.run(chart.flush())
+        self.assertEqual(list(range(900, 1000)), list(chart.stream_buffers[0]))
@@ -0,0 +1,66 @@
+"""
+Created on 2026-10-19
+
+"""
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+import justpy as jp
+from justpy.columnar import Columnar
+from tests.basetest import Basetest
+
+
+class TestColumnar(Basetest):
+    """
+    test the columnar row payload
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.df = pd.DataFrame(
+            {
+                "name": ["Bob", None, "Carol"],
+                "age": [42, 24, 33],
+                "score": [1.5, np.nan, np.inf],
+                "birthdate": pd.to_datetime(["2000-01-01 00:00", None, "2022-01-01 12:30"]),
+            }
+        )
+
+    def test_from_frame(self):
+        """
+        test encoding a frame with NaN, inf and timestamps
+        """
+        columnar = Columnar.from_frame(self.df)
+        self.assertEqual(["name", "age", "score", "birthdate"], columnar["columns"])
+        self.assertEqual(["object", "integer", "number", "datetime"], columnar["dtypes"])
+        self.assertEqual(3, columnar["length"])
+        records = Columnar.to_records(columnar)
+        self.assertEqual(
+            {"name": None, "age": 24, "score": None, "birthdate": None}, records[1]
+        )
+        self.assertEqual(sys.float_info.max, records[2]["score"])
+        self.assertEqual("2022-01-01 12:30:00", records[2]["birthdate"])
+        # valid JSON
+        json.loads(json.dumps(columnar, allow_nan=False))
+
+    def test_grid_and_table(self):
+        """
+        test loading frames columnar into AgGrid and QTable
+        """
+        grid = self.df.jp.ag_grid(columnar=True)
+        d = grid.convert_object_to_dict()
+        self.assertNotIn("rowData", d["def"])
+        self.assertEqual(4, len(d["def"]["columnDefs"]))
+        self.assertEqual(Columnar.from_frame(self.df), d["row_columns"])
+        grid.load_lod([{"a": 1}])
+        d = grid.convert_object_to_dict()
+        self.assertNotIn("row_columns", d)
+        self.assertEqual([{"a": 1}], d["def"]["rowData"])
+        table = jp.QTable()
+        table.load_pandas_frame(self.df, columnar=True)
+        d = table.convert_object_to_dict()
+        self.assertNotIn("data", d["attrs"])
+        self.assertEqual(3, d["columnar_attrs"]["data"]["length"])
@@ -0,0 +1,86 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestComponentPages(Basetest):
+    """
+    test the automatic membership of components in pages
+    """
+
+    def test_membership(self):
+        """
+        test that nested components know the pages they are on
+        """
+        wp = jp.WebPage()
+        other = jp.WebPage()
+        outer = jp.Div(a=wp)
+        inner = jp.Div(a=outer)
+        span = jp.Span(text="nested", a=inner)
+        self.assertEqual({wp.page_id: wp}, span.get_pages())
+        other.add(outer)
+        self.assertEqual({wp.page_id, other.page_id}, set(span.get_pages()))
+        wp.remove(outer)
+        self.assertEqual([other.page_id], list(span.get_pages()))
+        outer.remove_component(inner)
+        self.assertEqual({}, span.get_pages())
+        outer.add(inner)
+        other.delete_components()
+        self.assertEqual({}, span.get_pages())
+        html = jp.parse_html("<div><ul><li><b>parsed</b></li></ul></div>", a=wp)
+        bold = html.components[0].components[0].components[0]
+        self.assertEqual({wp.page_id: wp}, bold.get_pages())
+        # containers cleared without remove_component are no longer followed
+        ul = html.components[0]
+        html.components = []
+        self.assertEqual({}, bold.get_pages())
+        self.assertEqual({}, ul.parents)
+        wp.components.clear()
+        self.assertEqual({}, html.get_pages())
+
+    def test_membership_ids(self):
+        """
+        test that the ids of the components of a container follow removing and adding components
+        """
+        wp = jp.WebPage()
+        div = jp.Div(a=wp)
+        spans = [jp.Span(text=str(i), a=div) for i in range(1000)]
+        self.assertEqual([wp.page_id], list(spans[500].get_pages()))
+        # replacing a component keeps the length of the components
+        div.remove_component(spans[500])
+        replacement = jp.Span(text="new", a=div)
+        self.assertEqual({}, spans[500].get_pages())
+        self.assertEqual([wp.page_id], list(replacement.get_pages()))
+        # components added twice stay until removed twice
+        div.add(spans[0])
+        div.remove_component(spans[0])
+        self.assertEqual([wp.page_id], list(spans[0].get_pages()))
+        div.remove_component(spans[0])
+        self.assertEqual({}, spans[0].get_pages())
+        # changes without add_component are seen
+        div.components[1:] = []
+        self.assertEqual({}, spans[2].get_pages())
+        self.assertEqual([wp.page_id], list(spans[1].get_pages()))
+
+    def test_update(self):
+        """
+        test that a component update reaches the page without add_page
+        """
+        wp = jp.WebPage()
+        span = jp.Span(text="before", a=jp.Div(a=jp.Div(a=wp)), temp=False)
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        span.text = "after"
+        try:
+            asyncio.run(span.update())
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual(1, len(websocket.messages))
+        msg = websocket.messages[0]
+        self.assertEqual("component_update", msg["type"])
+        self.assertEqual("after", msg["data"]["text"])
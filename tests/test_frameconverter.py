@@ -0,0 +1,76 @@
+"""
+Created on 2026-10-19
+
+"""
+import datetime
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+import justpy as jp
+from justpy.frameconverter import FrameConverter
+from tests.basetest import Basetest
+
+
+class TestFrameConverter(Basetest):
+    """
+    test the vectorized DataFrame conversion
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.df = pd.DataFrame(
+            {
+                "float": [1.5, np.nan, np.inf, -np.inf],
+                "int": [1, 2, 3, 4],
+                "nullable": pd.array([1, None, 3, 4], dtype="Int64"),
+                "category": pd.Categorical(["a", None, "b", "a"]),
+                "datetime": pd.to_datetime(["2020-01-01", None, "2020-01-03", "2020-01-04"]),
+                "tz": pd.to_datetime(["2020-01-01"] * 4).tz_localize("UTC"),
+                "object": [pd.Timestamp("2020-01-01"), np.float64(np.inf), None, datetime.date(2020, 1, 2)],
+                "text": ["x", None, "z", np.nan],
+            }
+        )
+
+    def test_column_values(self):
+        """
+        test the conversion of each dtype
+        """
+        max_float = sys.float_info.max
+        expected = {
+            "float": [1.5, None, max_float, -max_float],
+            "int": [1, 2, 3, 4],
+            "nullable": [1, None, 3, 4],
+            "category": ["a", None, "b", "a"],
+            "datetime": ["2020-01-01 00:00:00", None, "2020-01-03 00:00:00", "2020-01-04 00:00:00"],
+            "tz": ["2020-01-01 00:00:00+00:00"] * 4,
+            "object": ["2020-01-01 00:00:00", max_float, None, "2020-01-02"],
+            "text": ["x", None, "z", None],
+        }
+        for col, values in expected.items():
+            self.assertEqual(values, FrameConverter.column_values(self.df[col]), col)
+        records = FrameConverter.records(self.df)
+        self.assertEqual(4, len(records))
+        self.assertEqual(FrameConverter.rows(self.df)[1], list(records[1].values()))
+        json.dumps(records, allow_nan=False)
+
+    def test_pandas_integrations(self):
+        """
+        test that the pandas integrations produce JSON compatible values
+        """
+        df = self.df[["float", "int", "datetime"]]
+        chart = df.jp.plot(0, [1, 0])
+        self.assertEqual([1.5, None, sys.float_info.max, -sys.float_info.max], chart.options.xAxis.categories)
+        self.assertEqual(None, chart.options.series[1].data[1])
+        grid = df.jp.ag_grid()
+        self.assertEqual(FrameConverter.records(df), grid.options.rowData)
+        table = jp.QTable()
+        table.load_pandas_frame(df)
+        self.assertEqual(FrameConverter.records(df), table.data)
+        auto_table = df.jp.table()
+        self.assertEqual(["float", "int", "datetime"], auto_table.values[0])
+        self.assertEqual([None, 2, None], auto_table.values[2])
+        for d in [grid.convert_object_to_dict(), table.convert_object_to_dict()]:
+            json.dumps(d, allow_nan=False, default=str)
@@ -0,0 +1,52 @@
+"""
+Created on 2026-10-19
+
+"""
+import os
+import tempfile
+
+import justpy as jp
+from justpy.hjsoncache import HjsonCache
+from tests.basetest import Basetest
+
+
+class TestHjsonCache(Basetest):
+    """
+    test the parsed hjson template cache
+    """
+
+    def test_templates(self):
+        """
+        test that templates are parsed once and each component gets its own copy
+        """
+        HjsonCache.clear()
+        misses = HjsonCache.misses
+        charts = [jp.Histogram([1, 2, 3]) for _ in range(3)]
+        self.assertEqual(misses + 1, HjsonCache.misses)
+        charts[0].options.series[0].name = "changed"
+        charts[0].options.xAxis[0].title.text = "changed"
+        self.assertEqual("Histogram", charts[1].options.series[0].name)
+        self.assertEqual("Data", charts[2].options.xAxis[0].title.text)
+        self.assertEqual("Histogram", HjsonCache.get(jp.Histogram._options)["series"][0]["name"])
+        select = jp.QSelect()
+        select.options = "[{label: 'a', value: 1}]"
+        select.options[0]["label"] = "b"
+        self.assertEqual([{"label": "a", "value": 1}], HjsonCache.loads("[{label: 'a', value: 1}]"))
+
+    def test_file(self):
+        """
+        test that a file is parsed again after it has been modified
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            file_name = os.path.join(tmp, "options.hjson")
+            with open(file_name, "w") as f:
+                f.write("{title: {text: 'first'}}")
+            chart = jp.HighCharts()
+            chart.load_json_from_file(file_name)
+            self.assertEqual("first", chart.options.title.text)
+            self.assertIs(HjsonCache.get_file(file_name), HjsonCache.get_file(file_name))
+            with open(file_name, "w") as f:
+                f.write("{title: {text: 'second one'}}")
+            grid = jp.AgGrid()
+            grid.load_json_from_file(file_name)
+            self.assertEqual("second one", grid.options.title.text)
@@ -0,0 +1,83 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from jpcore.memory import MemoryAccounting
+from tests.basetest import Basetest
+
+
+class TestMemory(Basetest):
+    """
+    test the memory accounting
+    """
+
+    def create_page(self, session_id: str = None) -> jp.WebPage:
+        wp = jp.WebPage()
+        wp.session_id = session_id
+        for i in range(3):
+            d = jp.Div(a=wp, click=lambda self, msg: None)
+            for j in range(4):
+                jp.Span(text=f"{i}:{j}", a=d)
+        return wp
+
+    def test_page_report(self):
+        """
+        test the report of a single page
+        """
+        wp = self.create_page("session-a")
+        page_report = MemoryAccounting.page_report(wp)
+        self.assertEqual(15, page_report["components"])
+        self.assertGreater(page_report["approximate_bytes"], 0)
+        self.assertGreaterEqual(page_report["age_seconds"], 0)
+        report = MemoryAccounting.report()
+        page_ids = [r["page_id"] for r in report["page_reports"]]
+        self.assertIn(wp.page_id, page_ids)
+        self.assertGreaterEqual(report["sessions"]["session-a"], 1)
+        classes = {c["class"]: c["instances"] for c in report["top_component_classes"]}
+        self.assertGreaterEqual(classes["Span"], 12)
+        if self.debug:
+            print(MemoryAccounting.summary())
+
+    def test_leak_detection(self):
+        """
+        test finding components that are registered but not reachable from a live page
+        """
+        wp = self.create_page()
+        removed = wp.components[1]
+        wp.remove_component(removed)
+        leaked = [c for c in MemoryAccounting.find_leaked_components() if c is removed]
+        self.assertEqual([removed], leaked)
+        leaked_ids = [c["id"] for c in MemoryAccounting.report()["leaked_components"]]
+        self.assertIn(removed.id, leaked_ids)
+        # deleting the component and the page leaves nothing behind
+        removed.delete()
+        remaining = [c for c in wp.components]
+        asyncio.run(wp.on_disconnect())
+        leaked = [
+            c for c in MemoryAccounting.find_leaked_components()
+            if c is removed or c in remaining
+        ]
+        self.assertEqual([], leaked)
+
+    def test_admin_endpoint(self):
+        """
+        test the memory admin endpoint
+        """
+        from fastapi import FastAPI
+        from starlette.testclient import TestClient
+        from jpcore.admin import JustpyAdmin
+
+        app = FastAPI()
+        JustpyAdmin("secret").add_routes(app)
+        self.create_page()
+        with TestClient(app) as client:
+            response = client.get("/zzz_justpy_admin/memory?top=3&pages=0", headers={"X-Justpy-Admin-Token": "secret"})
+            self.assertEqual(200, response.status_code)
+            report = response.json()
+            self.assertNotIn("page_reports", report)
+            self.assertLessEqual(len(report["top_component_classes"]), 3)
+            response = client.get("/zzz_justpy_admin/memory")
+            self.assertEqual(403, response.status_code)
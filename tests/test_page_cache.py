@@ -0,0 +1,188 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+from starlette.requests import Request
+from starlette.responses import HTMLResponse
+from starlette.testclient import TestClient
+
+import justpy as jp
+from jpcore.metrics import Metrics
+from jpcore.pagecache import PageCache
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestPageCache(Basetest):
+    """
+    test the route level page cache
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.builds = 0
+
+    def report(self, request):
+        self.builds += 1
+        wp = jp.WebPage()
+        for i in range(50):
+            jp.Div(text=f"row {i} of {request.query_params.get('year', 'all')}", a=wp)
+        return wp
+
+    def test_cache(self):
+        """
+        test that pages are built once per path and query parameters
+        """
+        cache = PageCache(ttl=60, max_entries=2)
+        jp.app.add_jproute("/page_cache_report", self.report, name="page_cache_report", cache=cache)
+        self.assertIs(cache, jp.app.page_caches["page_cache_report"])
+        with TestClient(jp.app) as client:
+            first = client.get("/page_cache_report?year=2020")
+            second = client.get("/page_cache_report?year=2020")
+            self.assertEqual(1, self.builds)
+            self.assertEqual(first.text, second.text)
+            self.assertIn("row 49 of 2020", second.text)
+            client.get("/page_cache_report?year=2021")
+            self.assertEqual(2, self.builds)
+            page = cache.entries[("/page_cache_report", (("year", "2021"),), None)].page
+            self.assertFalse(page.delete_flag)
+            # the least recently used page is dropped and deleted
+            client.get("/page_cache_report?year=2022")
+            self.assertEqual(2, len(cache.entries))
+            client.get("/page_cache_report?year=2020")
+            self.assertEqual(4, self.builds)
+            self.assertNotIn(page.page_id, jp.WebPage.instances)
+            self.assertEqual(1, jp.app.invalidate_page_cache("page_cache_report", query_params={"year": "2022"}))
+            client.get("/page_cache_report?year=2022")
+            self.assertEqual(5, self.builds)
+            self.assertEqual(2, jp.app.invalidate_page_cache(path="/page_cache_report"))
+            self.assertEqual(0, len(cache.entries))
+
+    def test_ttl(self):
+        """
+        test that pages expire after the time to live
+        """
+        cache = PageCache(ttl=0.05)
+        jp.app.add_jproute("/page_cache_ttl", self.report, cache=cache)
+        with TestClient(jp.app) as client:
+            client.get("/page_cache_ttl")
+            client.get("/page_cache_ttl")
+            self.assertEqual(1, self.builds)
+            time.sleep(0.1)
+            client.get("/page_cache_ttl")
+            self.assertEqual(2, self.builds)
+            self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+    def test_route_label(self):
+        """
+        test that the metrics of routes with path parameters are labeled with the route template
+        """
+        cache = PageCache()
+        jp.app.add_jproute("/page_cache_item/{item_id}", self.report, cache=cache)
+        with TestClient(jp.app) as client:
+            for item_id in [1, 2, 1]:
+                client.get(f"/page_cache_item/{item_id}")
+        route = "/page_cache_item/{item_id}"
+        self.assertEqual(2, Metrics.get_counter("page_cache_misses", route=route))
+        self.assertEqual(1, Metrics.get_counter("page_cache_hits", route=route))
+        self.assertEqual(0, Metrics.get_counter("page_cache_misses", route="/page_cache_item/1"))
+        page = cache.entries[("/page_cache_item/2", (), None)].page
+        self.assertEqual(("/page_cache_item/2", route), (page.route_path, page.route))
+        cache.invalidate()
+
+    def test_concurrent(self):
+        """
+        test that concurrent requests for the same page share a single build
+        """
+        cache = PageCache()
+
+        async def create_response():
+            self.builds += 1
+            await asyncio.sleep(0.01)
+            return jp.WebPage(), HTMLResponse("<p>report</p>")
+
+        def render_response(_page):
+            return HTMLResponse("<p>report</p>")
+
+        async def get_all():
+            request = Request({"type": "http", "path": "/concurrent", "query_string": b"a=1", "headers": []})
+            return await asyncio.gather(*[cache.response(request, create_response, render_response) for _ in range(5)])
+
+        results = asyncio.run(get_all())
+        self.assertEqual(1, self.builds)
+        self.assertEqual(1, len({id(page) for page, _response in results}))
+        self.assertEqual({b"<p>report</p>"}, {response.body for _page, response in results})
+        cache.invalidate()
+
+    def test_live_page(self):
+        """
+        test that the rendered html is reused until the page changes
+        """
+        cache = PageCache()
+        jp.app.add_jproute("/page_cache_live", self.report, cache=cache)
+        with TestClient(jp.app) as client, patch.object(
+            jp.app, "get_response_for_load_page", wraps=jp.app.get_response_for_load_page
+        ) as render:
+            client.get("/page_cache_live")
+            client.get("/page_cache_live")
+            self.assertEqual(1, render.call_count)
+            page = cache.entries[("/page_cache_live", (), None)].page
+            page.components[0].text = "changed by an event"
+            asyncio.run(page.update())
+            self.assertIn("changed by an event", client.get("/page_cache_live").text)
+            client.get("/page_cache_live")
+            self.assertEqual(2, render.call_count)
+            self.assertEqual(1, self.builds)
+        cache.invalidate()
+
+    def test_cancelled_build(self):
+        """
+        test that the waiters of a cancelled build build the page themselves
+        """
+        cache = PageCache()
+
+        async def create_response():
+            self.builds += 1
+            if self.builds == 1:
+                await asyncio.sleep(10)
+            return jp.WebPage(), HTMLResponse("<p>report</p>")
+
+        async def get_all():
+            request = Request({"type": "http", "path": "/cancelled", "query_string": b"", "headers": []})
+            first = asyncio.create_task(cache.response(request, create_response, None))
+            await asyncio.sleep(0)
+            waiters = [asyncio.create_task(cache.response(request, create_response, None)) for _ in range(2)]
+            await asyncio.sleep(0)
+            first.cancel()
+            return await asyncio.wait_for(asyncio.gather(*waiters), 1)
+
+        results = asyncio.run(get_all())
+        # one of the waiters built the page for both
+        self.assertEqual(2, self.builds)
+        self.assertEqual(1, len({id(page) for page, _response in results}))
+        cache.invalidate()
+
+    def test_disconnect(self):
+        """
+        test that a dropped page with open websockets is deleted when the last one disconnects
+        """
+        cache = PageCache()
+        wp = jp.WebPage()
+        cache.put(("/page_cache_disconnect", (), None), wp, HTMLResponse("<p>report</p>"))
+        websockets = [MockWebSocket(socket_id) for socket_id in range(2)]
+        for websocket in websockets:
+            websocket.page_id = wp.page_id
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket for websocket in websockets}
+        cache.invalidate()
+        self.assertIn(wp.page_id, jp.WebPage.instances)
+        endpoint = jp.JustpyEvents({"type": "websocket"}, None, None)
+        asyncio.run(endpoint.on_disconnect(websockets[0], 1000))
+        self.assertIn(wp.page_id, jp.WebPage.instances)
+        asyncio.run(endpoint.on_disconnect(websockets[1], 1000))
+        self.assertNotIn(wp.page_id, jp.WebPage.instances)
+        self.assertNotIn(wp.page_id, jp.WebPage.sockets)
+        # a late disconnect of a deleted page is ignored
+        asyncio.run(endpoint.on_disconnect(websockets[1], 1000))
@@ -0,0 +1,173 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import justpy as jp
+from tests.basetest import Basetest
+
+
+def greet(self, msg):
+    self.text = "hello"
+
+
+class TestParseHtmlCache(Basetest):
+    """
+    test the compiled html templates of parse_html
+    """
+
+    html = """
+    <div class="m-2">
+      <p name="p" @click="greet">A</p>
+      <p name="p" :value="[1, 2]" @click="self.text = 'clicked'">B</p>
+      <input disabled>
+      <span id="s1">C</span>
+    </div>
+    """
+
+    def test_template(self):
+        """
+        test that the html is compiled once and each call gets fresh components
+        """
+        jp.HtmlTemplate.clear()
+        misses = jp.HtmlTemplate.misses
+        first = jp.parse_html(self.html)
+        second = jp.parse_html(self.html)
+        self.assertEqual(misses + 1, jp.HtmlTemplate.misses)
+        self.assertEqual("m-2", first.classes)
+        self.assertEqual(2, len(first.name_dict.p))
+        self.assertIsNot(first.components[0], second.components[0])
+        self.assertEqual([1, 2], second.components[1].value)
+        self.assertIsNot(first.components[1].value, second.components[1].value)
+        self.assertTrue(first.components[2].disabled)
+        self.assertEqual("s1", first.components[3].id)
+        self.assertEqual("C", first.components[3].text)
+        self.assertEqual("", first.commands)
+        # handlers are looked up in the caller's frame or compiled as oneliners
+        def local_greet(self, msg):
+            pass
+
+        p = jp.parse_html('<p @click="local_greet">x</p>')
+        self.assertIs(local_greet, p.on_click.__func__)
+        p = jp.parse_html('<p @click="greet">x</p>')
+        self.assertIs(greet, p.on_click.__func__)
+        second.components[1].on_click(None)
+        self.assertEqual("clicked", second.components[1].text)
+        # the compiled oneliners are bounded
+        with patch.object(jp.HtmlTemplate, "max_templates", 2):
+            for i in range(3):
+                jp.parse_html(f"<p @click=\"self.text = '{i}'\">x</p>")
+            self.assertEqual(["self.text = '1'", "self.text = '2'"], list(jp.HtmlTemplate.oneliners))
+
+    def test_commands(self):
+        """
+        test that the commands are only created on request
+        """
+        c = jp.parse_html(self.html, create_commands=True)
+        self.assertEqual("root = jp.Div()", c.commands[0])
+        self.assertIn("c3 = jp.P(name='p', value=[1, 2], a=c1, text='B')", c.commands)
+
+    def test_file(self):
+        """
+        test that a file is compiled again after it has been modified
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            file_name = os.path.join(tmp, "page.html")
+            with open(file_name, "w") as f:
+                f.write("<p>first</p>")
+            self.assertEqual("first", jp.parse_html_file(file_name).text)
+            self.assertIs(jp.HtmlTemplate.get_file(file_name), jp.HtmlTemplate.get_file(file_name))
+            time.sleep(0.01)
+            with open(file_name, "w") as f:
+                f.write("<p>second one</p>")
+            # the modification time is only checked after the check interval
+            self.assertEqual("first", jp.parse_html_file(file_name).text)
+            jp.HtmlTemplate.invalidate(file_name)
+            self.assertEqual("second one", jp.parse_html_file(file_name).text)
+            with patch.object(jp.HtmlTemplate, "check_interval", 0):
+                time.sleep(0.01)
+                with open(file_name, "w") as f:
+                    f.write("<p>third</p>")
+                self.assertEqual("third", jp.parse_html_file(file_name).text)
+
+    def test_file_async(self):
+        """
+        test that concurrent async loads of a file share a single read
+        """
+
+        async def load(file_name, count):
+            return await asyncio.gather(*[jp.parse_html_file_async(file_name) for _ in range(count)])
+
+        async def load_with_handler(file_name):
+            # handlers are looked up in the frame awaiting parse_html_file_async
+            def local_greet(self, msg):
+                pass
+
+            div = await jp.parse_html_file_async(file_name)
+            return div, local_greet
+
+        with tempfile.TemporaryDirectory() as tmp, patch.object(jp.HtmlTemplate, "check_interval", 0):
+            file_name = os.path.join(tmp, "page.html")
+            with open(file_name, "w") as f:
+                f.write('<div><p @click="greet">first</p><p @click="local_greet">x</p></div>')
+            misses = jp.HtmlTemplate.misses
+            divs = asyncio.run(load(file_name, 5))
+            self.assertEqual(misses + 1, jp.HtmlTemplate.misses)
+            self.assertEqual(5, len({id(div) for div in divs}))
+            div, local_greet = asyncio.run(load_with_handler(file_name))
+            self.assertIs(greet, div.components[0].on_click.__func__)
+            self.assertIs(local_greet, div.components[1].on_click.__func__)
+            time.sleep(0.01)
+            with open(file_name, "w") as f:
+                f.write("<div><p>second one</p></div>")
+            div = asyncio.run(load(file_name, 1))[0]
+            self.assertEqual("second one", div.components[0].text)
+            with self.assertRaises(FileNotFoundError):
+                asyncio.run(load(os.path.join(tmp, "missing.html"), 2))
+
+    def test_file_async_cancelled(self):
+        """
+        test that concurrent loads do not hang when the loading task is cancelled
+        """
+
+        async def slow_stat(_file_name):
+            await asyncio.sleep(10)
+
+        async def load(file_name):
+            first = asyncio.create_task(jp.HtmlTemplate.get_file_async(file_name))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(jp.HtmlTemplate.get_file_async(file_name))
+            await asyncio.sleep(0)
+            first.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await asyncio.wait_for(second, 1)
+            self.assertEqual({}, jp.HtmlTemplate.loading)
+
+        with tempfile.TemporaryDirectory() as tmp, patch("aiofiles.os.stat", slow_stat):
+            asyncio.run(load(os.path.join(tmp, "page.html")))
+
+    def test_file_async_waiter_cancelled(self):
+        """
+        test that cancelling a waiter does not cancel the load shared with the other waiters
+        """
+
+        async def load(file_name):
+            loads = [asyncio.create_task(jp.HtmlTemplate.get_file_async(file_name)) for _ in range(3)]
+            await asyncio.sleep(0)
+            loads[1].cancel()
+            results = await asyncio.gather(*loads, return_exceptions=True)
+            self.assertIsInstance(results[1], asyncio.CancelledError)
+            self.assertIs(results[0], results[2])
+            self.assertIsInstance(results[0], jp.HtmlTemplate)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            file_name = os.path.join(tmp, "page.html")
+            with open(file_name, "w") as f:
+                f.write("<p>shared</p>")
+            jp.HtmlTemplate.invalidate(file_name)
+            asyncio.run(load(file_name))
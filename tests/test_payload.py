@@ -0,0 +1,72 @@
+"""
+Created on 2026-10-19
+
+"""
+import json
+
+import justpy as jp
+from jpcore.payload import PayloadAnalyzer
+from tests.basetest import Basetest
+
+
+class TestPayload(Basetest):
+    """
+    test the payload size analytics
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        PayloadAnalyzer.enabled = True
+
+    def tearDown(self):
+        PayloadAnalyzer.enabled = False
+        Basetest.tearDown(self)
+
+    def test_attribution(self):
+        """
+        test attributing the bytes to components
+        """
+        wp = jp.WebPage()
+        container = jp.Div(a=wp, temp=False)
+        big = jp.Pre(text="x" * 10000, a=container, temp=False)
+        for i in range(5):
+            jp.Span(text=f"small {i}", a=container)
+        build_list = wp.build_list()
+        report = PayloadAnalyzer.reports[wp.page_id]
+        if self.debug:
+            print(json.dumps(report, indent=2))
+        sent_bytes = len(json.dumps(build_list, separators=(",", ":")))
+        # only the separators between the components are not attributed
+        self.assertAlmostEqual(sent_bytes, report["total_bytes"], delta=sent_bytes * 0.01)
+        top = report["components"][0]
+        self.assertEqual(big.id, top["id"])
+        self.assertEqual("Pre", top["class"])
+        self.assertGreater(top["share"], 0.5)
+        self.assertEqual(0, report["unchanged_bytes"])
+        classes = {c["class"]: c for c in report["classes"]}
+        self.assertEqual(5, classes["Span"]["count"])
+
+    def test_unchanged_subtrees(self):
+        """
+        test flagging subtrees that are sent again unchanged
+        """
+        wp = jp.WebPage()
+        container = jp.Div(a=wp, temp=False)
+        unchanged = jp.Div(a=container, temp=False)
+        for i in range(3):
+            jp.Span(text=f"static {i}", a=unchanged)
+        changing = jp.Span(text="0", a=container, temp=False)
+        wp.build_list()
+        wp.build_list()
+        report = PayloadAnalyzer.reports[wp.page_id]
+        self.assertEqual(report["total_bytes"], report["unchanged_bytes"])
+        self.assertEqual([str(container.id)], [u["key"] for u in report["unchanged"]])
+        changing.text = "1"
+        wp.build_list()
+        report = PayloadAnalyzer.reports[wp.page_id]
+        self.assertEqual(3, report["builds"])
+        self.assertEqual([str(unchanged.id)], [u["key"] for u in report["unchanged"]])
+        overlay_report = PayloadAnalyzer.overlay_report(wp.page_id)
+        self.assertEqual(report["total_bytes"], overlay_report["total_bytes"])
+        wp.remove_page()
+        self.assertNotIn(wp.page_id, PayloadAnalyzer.reports)
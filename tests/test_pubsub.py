@@ -0,0 +1,112 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestPubSub(Basetest):
+    """
+    test publishing topics to the subscribed components of all pages
+    """
+
+    def test_publish(self):
+        """
+        test that published changes are batched into one component_update per page
+        """
+        pages = [jp.WebPage() for _ in range(2)]
+        prices = [jp.Div(text="-", a=wp) for wp in pages]
+        volume = jp.Div(text="-", a=pages[0])
+        websockets = [MockWebSocket(i) for i in range(3)]
+        jp.WebPage.sockets[pages[0].page_id] = {0: websockets[0], 1: websockets[1]}
+        jp.WebPage.sockets[pages[1].page_id] = {2: websockets[2]}
+
+        def show(component, payload):
+            component.text = f"{payload:.2f}"
+
+        def ignore_small(component, payload):
+            if payload < 1000:
+                return True
+            component.text = str(payload)
+
+        for wp, price in zip(pages, prices):
+            price.subscribe("price", show, page=wp)
+        volume.subscribe("volume", ignore_small, page=pages[0])
+
+        async def publish():
+            self.assertEqual(2, await jp.WebPage.publish("price", 42))
+            await jp.WebPage.publish("volume", 5000)
+            await jp.WebPage.publish("volume", 10)
+            self.assertEqual(0, await jp.WebPage.publish("unknown", 1))
+            await jp.WebPage.publish_task
+
+        try:
+            asyncio.run(publish())
+        finally:
+            for wp in pages:
+                jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual("42.00", prices[1].text)
+        self.assertEqual("5000", volume.text)
+        for websocket in websockets:
+            self.assertEqual(1, len(websocket.messages))
+            self.assertEqual("components_update", websocket.messages[0]["type"])
+        data = websockets[0].messages[0]["data"]
+        self.assertEqual([prices[0].id, volume.id], [d["id"] for d in data])
+        self.assertEqual(websockets[0].messages, websockets[1].messages)
+        self.assertEqual("42.00", websockets[2].messages[0]["data"][0]["text"])
+        # deleting a page removes its subscriptions
+        pages[0].remove_page()
+        self.assertNotIn("volume", jp.WebPage.topic_pages)
+        self.assertEqual({pages[1].page_id}, jp.WebPage.topic_pages["price"])
+        pages[1].remove_page()
+        self.assertNotIn("price", jp.WebPage.topic_pages)
+
+    def test_publish_per_page(self):
+        """
+        test that components on several pages are serialized for each page
+        and that components removed from a page are unsubscribed
+        """
+        pages = [jp.WebPage() for _ in range(2)]
+        lod = [{"id": i, "value": i} for i in range(10)]
+        grid = jp.AgGrid(row_id_field="id")
+        grid.load_lod(lod)
+        for wp in pages:
+            wp.add(grid)
+            grid.subscribe("values", page=wp)
+        for wp in pages:
+            wp.build_list()
+        # the second page has not been sent the change of row 1 yet
+        lod[1]["value"] = 11
+        pages[0].build_list()
+        websockets = [MockWebSocket(i) for i in range(2)]
+        for wp, websocket in zip(pages, websockets):
+            jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+
+        async def publish():
+            lod[3]["value"] = 42
+            self.assertEqual(2, await jp.WebPage.publish("values"))
+            await jp.WebPage.publish_task
+
+        try:
+            asyncio.run(publish())
+        finally:
+            for wp in pages:
+                jp.WebPage.sockets.pop(wp.page_id)
+        updates = []
+        for websocket in websockets:
+            transaction = websocket.messages[0]["data"][0]["row_transaction"]["transaction"]
+            updates.append([row["id"] for row in transaction["update"]])
+        self.assertEqual([[3], [1, 3]], updates)
+        # removing the grid from a page unsubscribes it there only
+        pages[0].remove_component(grid)
+        self.assertEqual({pages[1].page_id}, jp.WebPage.topic_pages["values"])
+        # also for components nested in removed containers
+        div = jp.Div(a=pages[1])
+        text = jp.Span(text="-", a=div)
+        text.subscribe("values", page=pages[1])
+        pages[1].delete_components()
+        self.assertEqual({}, pages[1].subscriptions)
+        self.assertNotIn("values", jp.WebPage.topic_pages)
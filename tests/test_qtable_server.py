@@ -0,0 +1,104 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import numpy as np
+import pandas as pd
+from addict import Dict
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestQTableServer(Basetest):
+    """
+    test the server side mode of QTable
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.df = pd.DataFrame(
+            {
+                "name": [f"name {i}" for i in range(25)],
+                "value": [np.nan if i % 10 == 0 else float(i % 7) for i in range(25)],
+            }
+        )
+
+    def request(self, table, filter_text="", **pagination):
+        msg = Dict({"event_type": "request", "value": {"pagination": pagination, "filter": filter_text}})
+        asyncio.run(table.handle_request(msg))
+
+    def test_server_side(self):
+        """
+        test sorting, filtering and paginating a frame on the server
+        """
+        table = jp.QTable(server_side=True, rows_per_page=5)
+        table.load_pandas_frame(self.df)
+        self.assertIn("request", table.events)
+        self.assertEqual(25, table.pagination["rowsNumber"])
+        self.assertEqual(["name 0", "name 1", "name 2", "name 3", "name 4"], [row["name"] for row in table.data])
+        self.request(table, page=2, rowsPerPage=10, sortBy="value", descending=True)
+        self.assertEqual(10, len(table.data))
+        values = [row["value"] for row in table.data]
+        self.assertEqual(sorted(values, reverse=True), values)
+        self.request(table, page=1, rowsPerPage=0, sortBy="value", descending=True)
+        # nulls are last in both directions
+        self.assertEqual([None, None, None], [row["value"] for row in table.data[-3:]])
+        self.request(table, "NAME 1", page=3, rowsPerPage=5, sortBy="name", descending=False)
+        # name 1, name 10 ... name 19 - the page is moved back to the last one
+        self.assertEqual(11, table.pagination["rowsNumber"])
+        self.assertEqual(3, table.pagination["page"])
+        self.assertEqual(["name 19"], [row["name"] for row in table.data])
+        self.assertEqual("NAME 1", table.filter)
+        # the sort order of the column is cached
+        datasource = table.datasource
+        self.assertEqual(["value", "name"], list(datasource.sort_orders))
+        self.request(table, "name 12", page=1, rowsPerPage=5)
+        self.assertEqual(["name 1", "name 12"], list(datasource.filter_masks))
+        self.assertEqual(["name 12"], [row["name"] for row in table.data])
+        d = table.convert_object_to_dict()
+        self.assertEqual(1, len(d["attrs"]["data"]))
+
+    def test_lod(self):
+        """
+        test a list of dicts as backing data
+        """
+        lod = [{"a": i, "b": str(-i)} for i in range(12)]
+        table = jp.QTable(server_side=True)
+        table.load_server_data(lod)
+        self.assertEqual(["a", "b"], [col["name"] for col in table.columns])
+        self.request(table, page=2, rowsPerPage=10, sortBy="a", descending=True)
+        self.assertEqual([{"a": 1, "b": "-1"}, {"a": 0, "b": "0"}], table.data)
+
+    def test_request_event(self):
+        """
+        test that a request event only sends the table to the websocket of the request
+        """
+        wp = jp.QuasarPage()
+        jp.Div(text="other", a=wp)
+        table = jp.QTable(server_side=True, rows_per_page=5, a=wp)
+        table.load_pandas_frame(self.df)
+        websocket, other = MockWebSocket(4711), MockWebSocket(4712)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket, other.id: other}
+        data_dict = {
+            "type": "event",
+            "event_data": {
+                "event_type": "request",
+                "id": table.id,
+                "page_id": wp.page_id,
+                "websocket_id": websocket.id,
+                "value": {"pagination": {"page": 2, "rowsPerPage": 5}, "filter": ""},
+            },
+        }
+        try:
+            asyncio.run(handle_event(data_dict))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual(1, len(websocket.messages))
+        msg = websocket.messages[0]
+        self.assertEqual("component_update", msg["type"])
+        self.assertEqual(["name 5", "name 6", "name 7", "name 8", "name 9"], [row["name"] for row in msg["data"]["attrs"]["data"]])
+        self.assertEqual([], other.messages)
@@ -0,0 +1,115 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from justpy.treenodeprovider import TreeNodeProvider
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestQTreeLazy(Basetest):
+    """
+    test lazy loading the nodes of a QTree
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.calls = []
+
+    def children(self, key, node):
+        self.calls.append(key)
+        return [{"label": f"{key}.{i}", "lazy": True} for i in range(3)]
+
+    def lazy_load(self, wp, tree, keys: list) -> list:
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        data_dict = {
+            "type": "event",
+            "event_data": {
+                "event_type": "lazy-load",
+                "id": tree.id,
+                "page_id": wp.page_id,
+                "websocket_id": websocket.id,
+                "value": {"node_keys": keys},
+            },
+        }
+        try:
+            asyncio.run(handle_event(data_dict))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        return websocket.messages
+
+    def test_lazy_load(self):
+        """
+        test loading the children of several nodes with one event and the cache
+        """
+        wp = jp.QuasarPage()
+        tree = jp.QTree(a=wp, node_key="label")
+        provider = TreeNodeProvider(self.children, max_nodes=2)
+        tree.load_lazy(provider, [{"label": "a", "lazy": True}, {"label": "b", "lazy": True}])
+        self.assertIn("lazy-load", tree.events)
+        messages = self.lazy_load(wp, tree, ["a", "b"])
+        self.assertEqual(1, len(messages))
+        msg = messages[0]
+        self.assertEqual("tree_children", msg["type"])
+        self.assertEqual(["a", "b"], msg["data"]["finished"])
+        self.assertEqual(tree.id, msg["id"])
+        self.assertEqual(["a", "b"], [item["key"] for item in msg["data"]["children"]])
+        self.assertEqual(["a.0", "a.1", "a.2"], [node["label"] for node in msg["data"]["children"][0]["children"]])
+        # the children are not added to the nodes of the tree but the loaded nodes are known
+        self.assertNotIn("children", tree.nodes[0])
+        self.assertEqual(["a.0", "a.1", "a.2", "b.0", "b.1", "b.2"], list(tree.loaded_nodes))
+        messages = self.lazy_load(wp, tree, ["a.1"])
+        self.assertEqual(["a.1.0", "a.1.1", "a.1.2"], [node["label"] for node in messages[0]["data"]["children"][0]["children"]])
+        # a second tree with the same provider gets b from the cache - a has been evicted
+        other = jp.QTree(a=wp, node_key="label")
+        other.load_lazy(provider, [{"label": "a", "lazy": True}, {"label": "b", "lazy": True}])
+        self.lazy_load(wp, other, ["a", "b"])
+        self.assertEqual(["a", "b", "a.1", "a"], self.calls)
+        self.assertEqual(1, provider.hits)
+        # the number of loaded nodes is bounded
+        self.assertEqual(9, len(tree.loaded_nodes))
+        tree.max_loaded_nodes = 4
+        self.lazy_load(wp, tree, ["b.1"])
+        self.assertEqual(["a.1.2", "b.1.0", "b.1.1", "b.1.2"], list(tree.loaded_nodes))
+
+    def test_async_generator(self):
+        """
+        test a provider that yields the children in batches and a failing provider
+        """
+
+        async def children(key, node):
+            for batch in range(3):
+                await asyncio.sleep(0)
+                yield [{"label": f"{key}.{batch}.{i}"} for i in range(2)]
+
+        wp = jp.QuasarPage()
+        tree = jp.QTree(a=wp)
+        tree.load_lazy(children, [{"label": "root", "lazy": True}])
+        messages = self.lazy_load(wp, tree, ["root"])
+        self.assertEqual([False, True, True, True], [msg["data"]["append"] for msg in messages])
+        # the last message ends the loading of the node
+        self.assertEqual([[], [], [], ["root"]], [msg["data"]["finished"] for msg in messages])
+        self.assertEqual(6, len(tree.loaded_nodes))
+        self.assertEqual(6, len(tree.node_provider.cache["root"]))
+
+        async def broken(key, node):
+            yield [{"label": f"{key}.0"}]
+            raise ValueError("connection lost")
+
+        tree.load_lazy(broken, [{"label": "root", "lazy": True}])
+        messages = self.lazy_load(wp, tree, ["root"])
+        self.assertEqual(2, len(messages))
+        self.assertEqual([{"key": "root", "children": []}], messages[-1]["data"]["children"])
+        self.assertEqual(["root"], messages[-1]["data"]["finished"])
+        self.assertNotIn("root", tree.node_provider.cache)
+
+        def failing(key, node):
+            raise ValueError("no connection")
+
+        tree.load_lazy(failing, [{"label": "root", "lazy": True}])
+        messages = self.lazy_load(wp, tree, ["root"])
+        self.assertEqual(["root"], messages[0]["data"]["failed"])
@@ -0,0 +1,88 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from justpy.optionindex import OptionIndex
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestSelectServer(Basetest):
+    """
+    test filtering the options of a QSelect on the server
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.options = [{"label": f"Option {i}", "value": i} for i in range(5000)]
+        self.options.append({"label": "Seventy", "value": -1})
+
+    def test_option_index(self):
+        """
+        test prefix ranking, refining and sharing of the index
+        """
+        index = OptionIndex.for_options(self.options)
+        self.assertIs(index, OptionIndex.for_options(self.options))
+        matches = index.search("7")
+        expected = [i for i, option in enumerate(self.options) if "7" in option["label"].lower()]
+        self.assertEqual(sorted(expected), sorted(matches))
+        matches = index.search("SEV")
+        self.assertEqual([5000], matches)
+        # the matches of "7" are refined
+        self.assertEqual([7] + list(range(70, 80)) + list(range(700, 800)), index.search("ion 7"))
+        self.assertEqual(["7", "sev", "ion 7"], list(index.results))
+        self.assertEqual(["Option 0", "Option 1"], [option["label"] for option in index.page("", 0, 2)[0]])
+        options, more = index.page("option 499", 5, 5)
+        self.assertEqual(["Option 4994", "Option 4995", "Option 4996", "Option 4997", "Option 4998"], [option["label"] for option in options])
+        self.assertTrue(more)
+        self.assertFalse(index.page("option 499", 10, 5)[1])
+        prefix_first = OptionIndex(["big apple", "apple pie", "pineapple"]).search("apple")
+        self.assertEqual([1, 0, 2], prefix_first)
+        OptionIndex.release(self.options)
+        self.assertIsNot(index, OptionIndex.for_options(self.options))
+        # the number of shared indexes is bounded
+        for i in range(OptionIndex.max_indexes + 1):
+            OptionIndex.for_options([f"option {i}"])
+        self.assertEqual(OptionIndex.max_indexes, len(OptionIndex.indexes))
+        self.assertFalse(any(index.options is self.options for index in OptionIndex.indexes.values()))
+
+    def test_filter_events(self):
+        """
+        test the filter and virtual-scroll events
+        """
+        wp = jp.QuasarPage()
+        select = jp.QSelect(a=wp, options_page_size=20)
+        select.load_server_options(self.options)
+        self.assertEqual(20, len(select.options))
+        d = select.convert_object_to_dict()
+        self.assertTrue(d["server_options"])
+        self.assertIn("filter", d["events"])
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        try:
+            for event_type, value in [("filter", "Option 1"), ("virtual-scroll", {"filter": "Option 1", "offset": 20})]:
+                data_dict = {
+                    "type": "event",
+                    "event_data": {
+                        "event_type": event_type,
+                        "id": select.id,
+                        "page_id": wp.page_id,
+                        "websocket_id": websocket.id,
+                        "value": value,
+                    },
+                }
+                asyncio.run(handle_event(data_dict))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual(2, len(websocket.messages))
+        first, second = [msg["data"] for msg in websocket.messages]
+        self.assertEqual("select_options", websocket.messages[0]["type"])
+        self.assertEqual(["Option 1", "Option 10", "Option 11"], [option["label"] for option in first["options"][:3]])
+        self.assertEqual(20, len(first["options"]))
+        self.assertTrue(first["more"])
+        self.assertEqual(20, second["offset"])
+        self.assertEqual("Option 1", second["filter"])
+        self.assertEqual("Option 109", second["options"][0]["label"])
@@ -0,0 +1,96 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+from starlette.testclient import TestClient
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestSharedPage(Basetest):
+    """
+    test serving a single page to all viewers of a route
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.builds = 0
+
+    def dashboard(self):
+        self.builds += 1
+        wp = jp.WebPage()
+        self.status = jp.Div(text="status ok", a=wp)
+        self.button = jp.Button(text="refresh", a=wp)
+        self.input = jp.Input(a=wp)
+
+        def refresh(button, msg):
+            self.status.text = "refreshed"
+
+        def change(field, msg):
+            self.status.text = "changed by a viewer"
+
+        self.button.on("click", refresh)
+        self.input.on("change", change)
+        return wp
+
+    def test_shared_page(self):
+        """
+        test that all sessions get the same page in its current state
+        """
+        shared = jp.SharedPage(allowed_events=["click"])
+        jp.app.add_jproute("/shared_dashboard", self.dashboard, cache=shared)
+        with TestClient(jp.app) as client:
+            first = client.get("/shared_dashboard")
+            self.assertIn("status ok", first.text)
+            self.status.text = "status degraded"
+            asyncio.run(shared.entries[("/shared_dashboard", (), None)].page.update())
+            second = client.get("/shared_dashboard?viewer=2")
+            self.assertEqual(1, self.builds)
+            self.assertIn("status degraded", second.text)
+        wp = shared.entries[("/shared_dashboard", (), None)].page
+        self.assertIs(shared, wp.event_policy)
+        self.assertFalse(wp.delete_flag)
+        self.assertIsNone(wp.session_id)
+        # the data requests of components are handled on read only pages
+        read_only = jp.SharedPage()
+        for event_type in ["getRows", "resyncRows", "filter", "virtual-scroll"]:
+            self.assertTrue(read_only.allows({"event_type": event_type}))
+        # events that change the shared component need to be allowed explicitly
+        for event_type in ["request", "lazy-load", "zoom_x"]:
+            self.assertFalse(read_only.allows({"event_type": event_type}))
+            self.assertTrue(jp.SharedPage(allowed_events=[event_type]).allows({"event_type": event_type}))
+        self.assertFalse(read_only.allows({"event_type": "click"}))
+        self.assertFalse(shared.allows({"event_type": "change"}))
+        websockets = [MockWebSocket(socket_id) for socket_id in range(3)]
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket for websocket in websockets}
+
+        def event(component, event_type):
+            return {
+                "type": "event",
+                "event_data": {
+                    "event_type": event_type,
+                    "id": component.id,
+                    "page_id": wp.page_id,
+                    "websocket_id": 0,
+                    "value": "x",
+                },
+            }
+
+        try:
+            asyncio.run(handle_event(event(self.input, "change")))
+            self.assertEqual("status degraded", self.status.text)
+            self.assertEqual([], websockets[1].messages)
+            asyncio.run(handle_event(event(self.button, "click")))
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+            shared.invalidate()
+        self.assertEqual("refreshed", self.status.text)
+        for websocket in websockets:
+            self.assertEqual(1, len(websocket.messages))
+            self.assertEqual("page_update", websocket.messages[0]["type"])
+        self.assertEqual(websockets[0].messages, websockets[2].messages)
+        self.assertNotIn(wp.page_id, jp.WebPage.instances)
@@ -0,0 +1,80 @@
+"""
+Created on 2026-10-19
+
+"""
+from starlette.testclient import TestClient
+
+import justpy as jp
+from jpcore.htmlrenderer import HtmlRenderer
+from tests.basetest import Basetest
+
+
+class TestServerSideRendering(Basetest):
+    """
+    test server side rendering of the initial page html
+    """
+
+    def test_render_page(self):
+        """
+        test rendering the built dicts of a page
+        """
+        wp = jp.WebPage()
+        d = jp.Div(classes="m-2", style="color: red", a=wp)
+        jp.P(text="<b>1 & 2</b>", a=d)
+        jp.Input(value='say "hi"', disabled=True, a=d)
+        jp.Div(text="hidden", show=False, a=d)
+        jp.Div(inner_html="<i>raw</i>", a=wp)
+        jp.QBtn(label="Quasar", a=wp)
+        html = HtmlRenderer().render_page(wp.build_list())
+        self.assertTrue(html.startswith('<div><div class="m-2" style="color: red"><p>'))
+        self.assertIn("&lt;b&gt;1 &amp; 2&lt;/b&gt;</p>", html)
+        self.assertIn(' value="say &quot;hi&quot;"', html)
+        self.assertIn(" disabled", html)
+        self.assertNotIn("checked", html)
+        self.assertNotIn("</input>", html)
+        self.assertNotIn("hidden", html)
+        self.assertIn("><i>raw</i></div>", html)
+        self.assertIn('<div data-vue-type="quasar_component"></div></div>', html)
+
+    def test_deep_tree(self):
+        """
+        test that deep trees are rendered without recursion
+        """
+        wp = jp.WebPage()
+        c = wp
+        for _ in range(100):
+            c = jp.Div(a=c)
+        page_dict = wp.build_list()
+        # nest the dicts deeper than the recursion limit
+        d = page_dict[0]
+        for _ in range(5000):
+            d = {"vue_type": "html_component", "html_tag": "span", "object_props": [d]}
+        html = HtmlRenderer().render_page([d])
+        self.assertEqual(5000, html.count("</span>"))
+        self.assertEqual(101, html.count("</div>"))
+
+    def test_ssr_response(self):
+        """
+        test that pages with ssr set contain the rendered components
+        """
+
+        def ssr_page():
+            wp = jp.WebPage()
+            wp.ssr = True
+            jp.Div(text="rendered on the server", classes="text-xl", a=wp)
+            return wp
+
+        def client_page():
+            wp = jp.WebPage()
+            jp.Div(text="rendered in the browser", a=wp)
+            return wp
+
+        jp.app.add_jproute("/ssr_page", ssr_page)
+        jp.app.add_jproute("/ssr_client_page", client_page)
+        with TestClient(jp.app) as client:
+            text = client.get("/ssr_page").text
+            self.assertIn('<div id="components" data-ssr><div><div class="text-xl">rendered on the server</div></div></div>', text)
+            # the component dicts are still sent for the hydration
+            self.assertIn("justpyComponents", text)
+            text = client.get("/ssr_client_page").text
+            self.assertNotIn("data-ssr", text)
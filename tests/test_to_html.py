@@ -0,0 +1,103 @@
+"""
+Created on 2026-10-19
+
+"""
+import tracemalloc
+from unittest.mock import patch
+
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import justpy as jp
+from tests.basetest import Basetest
+
+
+class TestToHtml(Basetest):
+    """
+    test rendering components to html
+    """
+
+    def test_to_html(self):
+        """
+        test the html of components and pages
+        """
+        wp = jp.WebPage()
+        d = jp.Div(classes="m-2", style="color: red", a=wp)
+        jp.P(text="a < b", title='say "hi"', a=d)
+        jp.Img(src="logo.png", a=d)
+        jp.Span(text="&#x25CF;", html_entity=True, a=d)
+        self.assertEqual(
+            '<div class="m-2" style="color: red"><p title="say &quot;hi&quot;">a &lt; b</p>'
+            '<img src="logo.png"><span>&#x25CF;</span></div>',
+            d.to_html(format=False),
+        )
+        html = wp.to_html(indent_step=2)
+        self.assertTrue(html.startswith('<div>\n  <div class="m-2" style="color: red">\n    <p'))
+        self.assertTrue(html.endswith("  </div>\n</div>\n"))
+        self.assertEqual(html, "".join(wp.iter_html(indent_step=2, chunk_size=8)))
+
+    def test_quasar(self):
+        """
+        test that components that are not html components are rendered with their tag and children
+        """
+        wp = jp.QuasarPage()
+        d = jp.QDiv(classes="q-pa-md", a=wp)
+        jp.QBtn(label="Go", color="primary", a=d)
+        field = jp.QInput(label="Name", value="x", a=d)
+        card = jp.QCard(a=d)
+        jp.QCardSection(text="inside", a=card)
+        self.assertEqual(
+            '<div class="q-pa-md"><q-btn label="Go" color="primary"></q-btn>'
+            f'<q-input id="{field.id}" label="Name" value="x" type="text" debounce="200"></q-input>'
+            "<q-card><q-card-section>inside</q-card-section></q-card></div>",
+            d.to_html(format=False),
+        )
+        self.assertIn("<q-card-section>inside</q-card-section>", "".join(wp.iter_html(format=False)))
+        # components without a tag of their own are placeholders
+        jp.AgGrid(a=wp)
+        self.assertIn('<div data-vue-type="grid"></div>', wp.to_html(format=False))
+
+    def test_linear(self):
+        """
+        test that each component is converted once
+        """
+        wp = jp.WebPage()
+        c = wp
+        for _ in range(50):
+            c = jp.Div(text="level", a=c)
+        with patch.object(jp.Div, "convert_object_to_dict", autospec=True, side_effect=jp.Div.convert_object_to_dict) as convert:
+            html = wp.to_html(format=False)
+        self.assertEqual(50, convert.call_count)
+        self.assertEqual(51, html.count("</div>"))
+
+    def test_streaming(self):
+        """
+        test streaming a large page in chunks with constant memory
+        """
+        wp = jp.WebPage()
+        for i in range(200):
+            row = jp.Div(classes="flex", a=wp)
+            for j in range(50):
+                jp.Span(text=f"cell {i} {j}", a=row)
+        tracemalloc.start()
+        try:
+            size = 0
+            for chunk in wp.iter_html(format=False, chunk_size=4096):
+                size += len(chunk)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(wp.to_html(format=False)), size)
+        # the html is not held in memory at once
+        self.assertLess(peak, size / 4)
+
+        def report(_request):
+            return StreamingResponse(wp.iter_html(format=False), media_type="text/html")
+
+        app = Starlette(routes=[Route("/report", report)])
+        with TestClient(app) as client:
+            response = client.get("/report")
+            self.assertEqual(size, len(response.text))
+            self.assertIn("<span>cell 199 49</span></div></div>", response.text)
@@ -0,0 +1,100 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+import justpy as jp
+from jpcore.justpy_app import handle_event
+from jpcore.tracing import InMemoryExporter, JsonLinesExporter, RecordingTracer, Tracing
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestTracing(Basetest):
+    """
+    test the tracing hooks
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.exporter = InMemoryExporter()
+        self.previous_tracer = Tracing.set_tracer(RecordingTracer(self.exporter))
+
+    def tearDown(self):
+        Tracing.set_tracer(self.previous_tracer)
+        Basetest.tearDown(self)
+
+    def test_noop_default(self):
+        """
+        test that the default tracer does not record anything
+        """
+        Tracing.set_tracer(None)
+        with Tracing.span("noop", key="value") as span:
+            span.set_attribute("other", 1)
+        self.assertIsNone(Tracing.current_span())
+        self.assertEqual(0, len(self.exporter.spans))
+
+    def test_event_trace(self):
+        """
+        test that a click is broken down into handler, build and socket send spans
+        of the same trace
+        """
+        wp = jp.WebPage()
+
+        def click(self, _msg):
+            self.text = "clicked"
+
+        d = jp.Div(text="click me", a=wp, click=click)
+        websocket = MockWebSocket(4711)
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket}
+        data_dict = {
+            "type": "event",
+            "event_data": {
+                "event_type": "click",
+                "id": d.id,
+                "page_id": wp.page_id,
+                "websocket_id": websocket.id,
+            },
+        }
+
+        async def receive():
+            with Tracing.span("websocket.receive", websocket_id=websocket.id):
+                await asyncio.get_event_loop().create_task(handle_event(data_dict))
+
+        try:
+            asyncio.run(receive())
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        names = [span.name for span in self.exporter.spans]
+        for name in ["event.handler", "component.serialize", "page.build", "socket.send", "page.update", "event", "websocket.receive"]:
+            self.assertIn(name, names)
+        root = self.exporter.spans[-1]
+        self.assertEqual("websocket.receive", root.name)
+        self.assertIsNone(root.parent_id)
+        for span in self.exporter.spans:
+            self.assertEqual(root.trace_id, span.trace_id)
+        spans_by_name = {span.name: span for span in self.exporter.spans}
+        self.assertEqual(root.span_id, spans_by_name["event"].parent_id)
+        self.assertEqual("Div", spans_by_name["event.handler"].attributes["component_class"])
+        self.assertEqual(spans_by_name["page.update"].span_id, spans_by_name["socket.send"].parent_id)
+        self.assertEqual("clicked", websocket.messages[0]["data"][0]["text"])
+
+    def test_json_lines_exporter(self):
+        """
+        test writing spans as JSON lines
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trace_file = os.path.join(tmpdir, "trace.jsonl")
+            Tracing.set_tracer(RecordingTracer(JsonLinesExporter(trace_file)))
+            with Tracing.span("outer", page_id=1):
+                with Tracing.span("inner"):
+                    pass
+            Tracing.tracer.close()
+            with open(trace_file) as f:
+                spans = [json.loads(line) for line in f]
+        self.assertEqual(["inner", "outer"], [span["name"] for span in spans])
+        self.assertEqual(spans[1]["span_id"], spans[0]["parent_id"])
+        self.assertEqual(1, spans[1]["attributes"]["page_id"])
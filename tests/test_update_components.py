@@ -0,0 +1,47 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+
+import justpy as jp
+from tests.basetest import Basetest, MockWebSocket
+
+
+class TestUpdateComponents(Basetest):
+    """
+    test updating several components of a page with one message
+    """
+
+    def test_update_components(self):
+        """
+        test that the given subtrees are sent in a single components_update message
+        """
+        wp = jp.WebPage()
+        grid = jp.Div(a=wp, temp=False)
+        cells = [jp.Div(text=str(i), a=grid, temp=False) for i in range(40)]
+        untracked = jp.Span(text="no id", a=wp)
+        websockets = [MockWebSocket(i) for i in range(2)]
+        jp.WebPage.sockets[wp.page_id] = {websocket.id: websocket for websocket in websockets}
+        for cell in cells:
+            cell.text = "changed"
+
+        async def update():
+            await wp.update_components(cells[::4] + [untracked])
+            # the cells are sent as part of the grid
+            await wp.update_components(cells + [grid])
+            await wp.update_components(cells[:2], websocket=websockets[1])
+
+        try:
+            asyncio.run(update())
+        finally:
+            jp.WebPage.sockets.pop(wp.page_id)
+        self.assertEqual(2, len(websockets[0].messages))
+        first, second = websockets[0].messages
+        self.assertEqual("components_update", first["type"])
+        self.assertEqual([cell.id for cell in cells[::4]], [d["id"] for d in first["data"]])
+        self.assertEqual({"changed"}, {d["text"] for d in first["data"]})
+        self.assertEqual([grid.id], [d["id"] for d in second["data"]])
+        self.assertEqual(40, len(second["data"][0]["object_props"]))
+        self.assertEqual(3, len(websockets[1].messages))
+        self.assertEqual(2, len(websockets[1].messages[2]["data"]))
@@ -0,0 +1,76 @@
+"""
+Created on 2026-10-19
+
+"""
+import asyncio
+import time
+
+import justpy as jp
+from jpcore.metrics import Metrics
+from jpcore.watchdog import Watchdog
+from tests.basetest import Basetest
+
+
+class TestWatchdog(Basetest):
+    """
+    test the event loop lag monitor and slow handler watchdog
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        Metrics.reset()
+
+    def test_slow_handler(self):
+        """
+        test that a blocking handler is reported with the stack of the blocking code
+        """
+        wp = jp.WebPage()
+        wp.route_path = "/slow/1"
+        wp.route = "/slow/{item_id}"
+
+        def blocking_click(self, _msg):
+            time.sleep(0.4)
+
+        d = jp.Div(text="block", a=wp, click=blocking_click)
+
+        async def run():
+            watchdog = Watchdog.start(asyncio.get_running_loop(), threshold_ms=100, interval_ms=20)
+            try:
+                await asyncio.sleep(0.05)
+                await d.run_event_function("click", {"page": wp})
+                await asyncio.sleep(0.05)
+            finally:
+                watchdog.stop()
+            return watchdog
+
+        watchdog = asyncio.run(run())
+        self.assertIsNone(Watchdog.instance)
+        self.assertEqual(1, len(watchdog.slow_calls))
+        record = watchdog.slow_calls[0]
+        if self.debug:
+            print(record)
+        self.assertEqual("Div", record["component_class"])
+        self.assertEqual("click", record["event_type"])
+        self.assertEqual("/slow/{item_id}", record["route"])
+        self.assertGreaterEqual(record["duration_ms"], 400)
+        self.assertIn("blocking_click", record["stack"])
+        self.assertIn("time.sleep", record["stack"])
+        self.assertEqual(1, Metrics.get_counter("slow_handlers", kind="event", component_class="Div", event_type="click", route="/slow/{item_id}"))
+        self.assertGreater(Metrics.get_observation("loop_lag_ms").max, 100)
+
+    def test_fast_handler(self):
+        """
+        test that fast handlers are only measured
+        """
+        wp = jp.WebPage()
+        d = jp.Div(text="fast", a=wp, click=lambda self, msg: None)
+
+        async def run():
+            watchdog = Watchdog.start(asyncio.get_running_loop(), threshold_ms=100, interval_ms=20)
+            await d.run_event_function("click", {"page": wp})
+            watchdog.stop()
+            return watchdog
+
+        watchdog = asyncio.run(run())
+        self.assertEqual(0, len(watchdog.slow_calls))
+        self.assertEqual(1, Metrics.get_observation("handler_duration_ms", kind="event").count)